@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Incremental Portfolio Index
+
+Parses the header fields of the project proposals in projects/*.md (the
+same fields project_server.js extracts in parseProjectFile) into a SQLite
+index on disk. A refresh only re-reads files whose size or mtime changed,
+and only re-parses those whose content hash changed too, so listing and
+filtering thousands of proposals does not touch the markdown files at all.
+
+Usage:
+    python portfolio_index.py [options]
+
+Options:
+    --projects-dir PATH   Proposal directory (default: projects/ next to this script)
+    --db PATH             Index file (default: <projects-dir>/.portfolio_index.sqlite)
+    --priority N [N ...]  Only list these priority levels
+    --department NAME     Only list this department
+    --min-score X         Only list projects with final score >= X
+    --limit N             List at most N projects
+    --json                Print JSON instead of a table
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+INDEX_VERSION = 1
+
+COLUMNS = (
+    'id', 'file_name', 'name', 'submitter', 'date', 'department',
+    'final_score', 'priority', 'recommendation', 'risk_score', 'value_score',
+    'category', 'strategy', 'description'
+)
+
+ORDERINGS = {
+    'date': 'date DESC, id',
+    'final_score': 'final_score DESC, id',
+    'priority': 'priority, final_score DESC, id',
+    'name': 'name, id'
+}
+
+_HEADER_FIELDS = {
+    '**Project Name**:': 'name',
+    '**Submitter**:': 'submitter',
+    '**Date**:': 'date',
+    '**Department/Team**:': 'department',
+    '**Recommendation**:': 'recommendation',
+    '**Implementation Strategy**:': 'strategy'
+}
+_FINAL_SCORE = re.compile(r'^\*\*Final Score\*\*:\s*(-?[\d.]+)')
+_PRIORITY = re.compile(r'Priority (\d+)')
+_RISK_SCORE = re.compile(r'\*\*Risk Score\*\*:\s*([\d.]+)')
+_VALUE_SCORE = re.compile(r'\*\*Value Score\*\*:\s*([\d.]+)')
+
+
+def _to_float(text: str) -> Optional[float]:
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def parse_project_markdown(project_id: str, content: str) -> Dict:
+    """Extract header fields from one proposal, like parseProjectFile does."""
+    project = {'id': project_id, 'file_name': f"{project_id}.md"}
+    description = []
+    section = ''
+
+    for raw_line in content.split('\n'):
+        line = raw_line.strip()
+
+        for prefix, key in _HEADER_FIELDS.items():
+            if line.startswith(prefix):
+                project[key] = line[len(prefix):].strip()
+                break
+        else:
+            if line.startswith('**Final Score**:'):
+                match = _FINAL_SCORE.match(line)
+                project['final_score'] = _to_float(match.group(1)) if match else None
+            elif line.startswith('**Priority Level**:'):
+                match = _PRIORITY.search(line)
+                project['priority'] = int(match.group(1)) if match else None
+
+        # Executive summary paragraphs become the description
+        if line == '### Executive Summary':
+            section = 'summary'
+            continue
+        elif section == 'summary' and line.startswith('##'):
+            section = ''
+        elif section == 'summary' and line and not line.startswith('#'):
+            description.append(line)
+
+        # First plain line under "### Solution Type" is the category
+        if line.startswith('### Solution Type'):
+            section = 'solution_type'
+            continue
+        elif (section == 'solution_type' and line and not line.startswith('#')
+              and not line.startswith('**')):
+            project['category'] = line
+            section = ''
+
+        if '**Risk Score**:' in line:
+            match = _RISK_SCORE.search(line)
+            project['risk_score'] = _to_float(match.group(1)) if match else None
+        elif '**Value Score**:' in line:
+            match = _VALUE_SCORE.search(line)
+            project['value_score'] = _to_float(match.group(1)) if match else None
+
+    # Same defaults as the dashboard server
+    project['description'] = ' '.join(description)
+    project['name'] = project.get('name') or project_id
+    project['submitter'] = project.get('submitter') or 'Unknown'
+    project['department'] = project.get('department') or 'Unknown'
+    project['date'] = project.get('date') or '2025-01-01'
+    project['final_score'] = project.get('final_score') or 0
+    project['priority'] = project.get('priority') or 4
+    project['risk_score'] = project.get('risk_score') or 2.5
+    project['value_score'] = project.get('value_score') or 2.5
+    project['category'] = project.get('category') or 'Unknown'
+    project['strategy'] = project.get('strategy') or 'Unknown'
+    project['description'] = project['description'] or 'No description available'
+    project['recommendation'] = project.get('recommendation')
+    return project
+
+
+class PortfolioIndex:
+    """Persistent, incrementally refreshed index of projects/*.md."""
+
+    def __init__(self, projects_dir: str = None, db_path: str = None):
+        self.projects_dir = Path(projects_dir or Path(__file__).parent / "projects").resolve()
+        self.db_path = Path(db_path) if db_path else self.projects_dir / ".portfolio_index.sqlite"
+        self.connection = sqlite3.connect(str(self.db_path))
+        self.connection.row_factory = sqlite3.Row
+        self._create_schema()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Close the index database."""
+        self.connection.close()
+
+    def _create_schema(self):
+        """Create (or rebuild after a format change) the index tables."""
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        with self.connection:
+            if version != INDEX_VERSION:
+                self.connection.execute("DROP TABLE IF EXISTS projects")
+                self.connection.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS projects (
+                    id TEXT PRIMARY KEY,
+                    file_name TEXT NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    name TEXT,
+                    submitter TEXT,
+                    date TEXT,
+                    department TEXT,
+                    final_score REAL,
+                    priority INTEGER,
+                    recommendation TEXT,
+                    risk_score REAL,
+                    value_score REAL,
+                    category TEXT,
+                    strategy TEXT,
+                    description TEXT
+                )
+            """)
+            for column in ('priority', 'department', 'final_score', 'date'):
+                self.connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS projects_{column} ON projects ({column})"
+                )
+
+    def refresh(self) -> Dict[str, int]:
+        """Bring the index in line with the directory; return change counts."""
+        known = {
+            row['id']: (row['mtime_ns'], row['size'], row['sha256'])
+            for row in self.connection.execute("SELECT id, mtime_ns, size, sha256 FROM projects")
+        }
+        stats = {'scanned': 0, 'parsed': 0, 'touched': 0, 'unchanged': 0, 'removed': 0}
+        upserts = []
+        touches = []
+        seen = set()
+
+        for path in self.projects_dir.glob("*.md"):
+            stat = path.stat()
+            project_id = path.stem
+            seen.add(project_id)
+            stats['scanned'] += 1
+
+            previous = known.get(project_id)
+            if previous and previous[:2] == (stat.st_mtime_ns, stat.st_size):
+                stats['unchanged'] += 1
+                continue
+
+            data = path.read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+            if previous and previous[2] == digest:
+                # Touched but not edited: remember the new stat, skip the parse
+                touches.append((stat.st_mtime_ns, stat.st_size, project_id))
+                stats['touched'] += 1
+                continue
+
+            project = parse_project_markdown(project_id, data.decode('utf-8', errors='replace'))
+            upserts.append((stat.st_mtime_ns, stat.st_size, digest)
+                           + tuple(project[column] for column in COLUMNS))
+            stats['parsed'] += 1
+
+        removed = [(project_id,) for project_id in known.keys() - seen]
+        stats['removed'] = len(removed)
+
+        placeholders = ', '.join('?' * (len(COLUMNS) + 3))
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO projects (mtime_ns, size, sha256, {', '.join(COLUMNS)}) "
+                f"VALUES ({placeholders})",
+                upserts
+            )
+            self.connection.executemany(
+                "UPDATE projects SET mtime_ns = ?, size = ? WHERE id = ?", touches
+            )
+            self.connection.executemany("DELETE FROM projects WHERE id = ?", removed)
+        return stats
+
+    def list_projects(self, priorities: Iterable[int] = None, department: str = None,
+                      min_score: float = None, max_score: float = None,
+                      order_by: str = 'date', limit: int = None) -> List[Dict]:
+        """Filter and sort the indexed projects without reading any files."""
+        if order_by not in ORDERINGS:
+            raise ValueError(f"order_by must be one of {sorted(ORDERINGS)}")
+
+        clauses = []
+        params = []
+        if priorities:
+            priorities = list(priorities)
+            clauses.append(f"priority IN ({', '.join('?' * len(priorities))})")
+            params.extend(priorities)
+        if department is not None:
+            clauses.append("department = ?")
+            params.append(department)
+        if min_score is not None:
+            clauses.append("final_score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            clauses.append("final_score <= ?")
+            params.append(max_score)
+
+        query = f"SELECT {', '.join(COLUMNS)} FROM projects"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += f" ORDER BY {ORDERINGS[order_by]}"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self.connection.execute(query, params)]
+
+    def get_project(self, project_id: str) -> Optional[Dict]:
+        """Return one indexed project by id (file name without .md)."""
+        row = self.connection.execute(
+            f"SELECT {', '.join(COLUMNS)} FROM projects WHERE id = ?", (project_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+
+def main():
+    """Refresh the index and list the matching projects."""
+    parser = argparse.ArgumentParser(description="Index and list project proposals")
+    parser.add_argument("--projects-dir", help="Proposal directory (default: ./projects)")
+    parser.add_argument("--db", help="Index file (default: <projects-dir>/.portfolio_index.sqlite)")
+    parser.add_argument("--priority", type=int, nargs="+", help="Only these priority levels")
+    parser.add_argument("--department", help="Only this department")
+    parser.add_argument("--min-score", type=float, help="Minimum final score")
+    parser.add_argument("--order-by", choices=sorted(ORDERINGS), default="date",
+                        help="Sort order (default: date)")
+    parser.add_argument("--limit", type=int, help="List at most this many projects")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    try:
+        with PortfolioIndex(args.projects_dir, args.db) as index:
+            start = time.perf_counter()
+            stats = index.refresh()
+            projects = index.list_projects(args.priority, args.department, args.min_score,
+                                           order_by=args.order_by, limit=args.limit)
+            elapsed = time.perf_counter() - start
+    except (OSError, sqlite3.Error) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(projects, indent=2))
+    else:
+        for project in projects:
+            print(f"P{project['priority']}  {project['final_score']:>6.2f}  {project['date']:10}  "
+                  f"{project['department'][:30]:30}  {project['name']}")
+
+    print(f"📊 {stats['scanned']} files: {stats['parsed']} parsed, {stats['touched']} touched, "
+          f"{stats['unchanged']} unchanged, {stats['removed']} removed; "
+          f"{len(projects)} listed in {elapsed * 1000:.1f}ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Portfolio Rollups
+
+Keeps precomputed portfolio analytics over ProjectEvaluator results, per
+department, per LLM solution category and per priority bucket, plus one
+rollup of the whole portfolio. Each rollup holds a project count, the mean
+risk, value, final and dimension scores, a histogram of each dimension
+score and the risk/value quadrant matrix.
+
+Rollups are additive: a SQLite store keeps every project's last
+contribution next to the running totals of each group. Adding or
+re-scoring a project subtracts its old contribution from the groups it was
+in and adds the new one, so an update costs time per changed project,
+never per portfolio. Score sums are kept in integer hundredths, so the
+totals do not drift however often projects are re-scored.
+
+After each update the summaries of all groups are written to a small JSON
+snapshot, which project_server.js serves at /api/rollups and
+/api/rollups/{kind}/{key}. The dashboard reads those instead of fetching
+and scanning every project.
+
+Usage:
+    python scoring_calculator.py criteria.jsonl | python portfolio_rollup.py -
+    python portfolio_rollup.py rescored.jsonl --show department
+    python portfolio_rollup.py --remove 20250117_exotic_trades_pipeline_v2
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from scoring_calculator import DIMENSIONS, ProjectEvaluator
+from scoring_stream import read_jsonl
+
+STORE_VERSION = 1
+SNAPSHOT_VERSION = 1
+
+KINDS = ('portfolio', 'department', 'category', 'priority')
+
+# The value and risk lines classify_priority() draws
+HIGH_VALUE = 3.0
+LOW_RISK = 2.5
+QUADRANTS = ('high_value_low_risk', 'high_value_high_risk', 'low_value_low_risk',
+             'low_value_high_risk')
+
+SCORE_LEVELS = 5
+_TOTALS = ('risk_score', 'value_score', 'final_score')
+
+
+def quadrant(value_score: float, risk_score: float) -> str:
+    """Risk/value quadrant of a project, split where classify_priority splits."""
+    value = 'high_value' if value_score >= HIGH_VALUE else 'low_value'
+    risk = 'low_risk' if risk_score <= LOW_RISK else 'high_risk'
+    return f"{value}_{risk}"
+
+
+class Aggregate:
+    """Running totals of one group; add() with sign -1 takes a project back out."""
+
+    __slots__ = ('count', 'totals', 'dimension_totals', 'histograms', 'priorities', 'quadrants')
+
+    def __init__(self, state: Optional[Dict] = None):
+        state = state or {}
+        self.count = state.get('count', 0)
+        self.totals = state.get('totals') or [0] * len(_TOTALS)
+        self.dimension_totals = state.get('dimension_totals') or [0] * len(DIMENSIONS)
+        self.histograms = state.get('histograms') or [[0] * SCORE_LEVELS for _ in DIMENSIONS]
+        self.priorities = state.get('priorities') or {}
+        self.quadrants = state.get('quadrants') or {}
+
+    def add(self, entry: List, sign: int = 1):
+        """Add (or with sign=-1 remove) one project entry, see _entry()."""
+        priority, project_quadrant, scores, totals = entry
+        self.count += sign
+        for index, total in enumerate(totals):
+            self.totals[index] += sign * total
+        for index, score in enumerate(scores):
+            self.dimension_totals[index] += sign * score
+            self.histograms[index][min(max(score, 1), SCORE_LEVELS) - 1] += sign
+        self.priorities[priority] = self.priorities.get(priority, 0) + sign
+        self.quadrants[project_quadrant] = self.quadrants.get(project_quadrant, 0) + sign
+
+    def state(self) -> Dict:
+        return {
+            'count': self.count,
+            'totals': self.totals,
+            'dimension_totals': self.dimension_totals,
+            'histograms': self.histograms,
+            'priorities': {label: n for label, n in self.priorities.items() if n},
+            'quadrants': {name: n for name, n in self.quadrants.items() if n}
+        }
+
+    def summary(self) -> Dict:
+        """Counts, means, histograms and the quadrant matrix of the group."""
+        count = self.count or 1
+        return {
+            'count': self.count,
+            'mean': {
+                **{name: round(total / 100 / count, 3) for name, total in zip(_TOTALS, self.totals)},
+                'dimension_scores': {
+                    dimension: round(total / count, 3)
+                    for dimension, total in zip(DIMENSIONS, self.dimension_totals)
+                }
+            },
+            'histograms': {
+                dimension: {str(level + 1): n for level, n in enumerate(histogram)}
+                for dimension, histogram in zip(DIMENSIONS, self.histograms)
+            },
+            'priorities': dict(sorted((label, n) for label, n in self.priorities.items() if n)),
+            'quadrants': {name: self.quadrants.get(name, 0) for name in QUADRANTS}
+        }
+
+
+class PortfolioRollup:
+    """Incrementally maintained rollups of scored projects."""
+
+    def __init__(self, db_path: str = None, snapshot_path: str = None,
+                 evaluator: Optional[ProjectEvaluator] = None):
+        projects_dir = Path(__file__).parent / "projects"
+        self.db_path = Path(db_path) if db_path else projects_dir / ".portfolio_rollups.sqlite"
+        self.snapshot_path = Path(snapshot_path) if snapshot_path \
+            else self.db_path.with_suffix('.json')
+        self.evaluator = evaluator
+        self.connection = sqlite3.connect(str(self.db_path))
+        self._create_schema()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Close the rollup store."""
+        self.connection.close()
+
+    def _create_schema(self):
+        """Create (or rebuild after a format change) the store tables."""
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        with self.connection:
+            if version != STORE_VERSION:
+                self.connection.execute("DROP TABLE IF EXISTS projects")
+                self.connection.execute("DROP TABLE IF EXISTS rollups")
+                self.connection.execute(f"PRAGMA user_version = {STORE_VERSION}")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS projects (
+                    id TEXT PRIMARY KEY,
+                    department TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    entry TEXT NOT NULL
+                )
+            """)
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS rollups (
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    PRIMARY KEY (kind, key)
+                )
+            """)
+
+    def _entry(self, record: Dict) -> List:
+        """A project's contribution: priority, quadrant, dimension scores, totals in hundredths.
+
+        Built from lists only, so it compares equal to its own JSON round trip.
+        """
+        if 'dimension_scores' not in record:
+            self.evaluator = self.evaluator or ProjectEvaluator()
+            record = self.evaluator.evaluate_project(record)
+        scores = record['dimension_scores']
+        return [
+            record['priority'],
+            quadrant(record['value_score'], record['risk_score']),
+            [int(scores[dimension]) for dimension in DIMENSIONS],
+            [round(record[name] * 100) for name in _TOTALS]
+        ]
+
+    def update(self, records: Iterable[Dict], id_key: str = 'id',
+               department_key: str = 'department', category_key: str = 'category') -> Dict[str, int]:
+        """Add or re-score projects; return counts of added, rescored and unchanged."""
+        stats = {'added': 0, 'rescored': 0, 'unchanged': 0}
+        groups: Dict[Tuple[str, str], Aggregate] = {}
+        # Written at the end; also answers for a project seen twice in one update
+        writes: Dict[str, Tuple] = {}
+
+        for record in records:
+            project_id = record.get(id_key)
+            if not project_id:
+                raise ValueError(f"record without an {id_key!r} field")
+            department = record.get(department_key) or 'Unknown'
+            category = record.get(category_key) or 'Unknown'
+            entry = self._entry(record)
+
+            previous = writes.get(project_id) or self._stored(project_id)
+            if previous:
+                if previous == (department, category, entry):
+                    stats['unchanged'] += 1
+                    continue
+                self._apply(groups, *previous, -1)
+                stats['rescored'] += 1
+            else:
+                stats['added'] += 1
+            self._apply(groups, department, category, entry, 1)
+            writes[project_id] = (department, category, entry)
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO projects (id, department, category, entry) VALUES (?, ?, ?, ?)",
+                [(project_id, department, category, json.dumps(entry))
+                 for project_id, (department, category, entry) in writes.items()]
+            )
+            self._save_groups(groups)
+        if writes:
+            self.write_snapshot()
+        return stats
+
+    def remove(self, project_ids: Iterable[str]) -> int:
+        """Take projects out of every rollup; return how many were known."""
+        groups: Dict[Tuple[str, str], Aggregate] = {}
+        removed = []
+        for project_id in dict.fromkeys(project_ids):
+            previous = self._stored(project_id)
+            if previous:
+                self._apply(groups, *previous, -1)
+                removed.append((project_id,))
+        with self.connection:
+            self.connection.executemany("DELETE FROM projects WHERE id = ?", removed)
+            self._save_groups(groups)
+        if removed:
+            self.write_snapshot()
+        return len(removed)
+
+    def _stored(self, project_id: str) -> Optional[Tuple]:
+        """(department, category, entry) of a stored project, or None."""
+        row = self.connection.execute(
+            "SELECT department, category, entry FROM projects WHERE id = ?", (project_id,)
+        ).fetchone()
+        return (row[0], row[1], json.loads(row[2])) if row else None
+
+    def _apply(self, groups: Dict, department: str, category: str, entry, sign: int):
+        for key in (('portfolio', 'all'), ('department', department), ('category', category),
+                    ('priority', entry[0])):
+            aggregate = groups.get(key)
+            if aggregate is None:
+                row = self.connection.execute(
+                    "SELECT state FROM rollups WHERE kind = ? AND key = ?", key
+                ).fetchone()
+                aggregate = groups[key] = Aggregate(json.loads(row[0]) if row else None)
+            aggregate.add(entry, sign)
+
+    def _save_groups(self, groups: Dict[Tuple[str, str], Aggregate]):
+        """Write touched groups back; a group with no projects left is dropped."""
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO rollups (kind, key, state) VALUES (?, ?, ?)",
+            [(kind, key, json.dumps(aggregate.state()))
+             for (kind, key), aggregate in groups.items() if aggregate.count]
+        )
+        self.connection.executemany(
+            "DELETE FROM rollups WHERE kind = ? AND key = ?",
+            [key for key, aggregate in groups.items() if not aggregate.count]
+        )
+
+    def summary(self, kind: str, key: str) -> Optional[Dict]:
+        """One group's summary, from its stored totals alone."""
+        row = self.connection.execute(
+            "SELECT state FROM rollups WHERE kind = ? AND key = ?", (kind, key)
+        ).fetchone()
+        return Aggregate(json.loads(row[0])).summary() if row else None
+
+    def summaries(self) -> Dict[str, Dict[str, Dict]]:
+        """Every group's summary, by kind and key."""
+        summaries = {kind: {} for kind in KINDS}
+        for kind, key, state in self.connection.execute(
+                "SELECT kind, key, state FROM rollups ORDER BY kind, key"):
+            summaries[kind][key] = Aggregate(json.loads(state)).summary()
+        return summaries
+
+    def write_snapshot(self):
+        """Write all summaries to the JSON snapshot the dashboard server reads."""
+        snapshot = {
+            'version': SNAPSHOT_VERSION,
+            'updated': datetime.now().isoformat(timespec='seconds'),
+            'thresholds': {'high_value': HIGH_VALUE, 'low_risk': LOW_RISK},
+            'rollups': self.summaries()
+        }
+        temporary = self.snapshot_path.with_name(f"{self.snapshot_path.name}.tmp")
+        temporary.write_text(json.dumps(snapshot, separators=(',', ':')), encoding='utf-8')
+        temporary.replace(self.snapshot_path)
+
+
+def _print_summaries(summaries: Dict[str, Dict], kind: str):
+    """A table of count, mean scores and quadrant counts per group."""
+    print(f"{kind:30} {'count':>6} {'risk':>6} {'value':>6} {'final':>6}   HV/LR HV/HR LV/LR LV/HR")
+    for key, summary in summaries.get(kind, {}).items():
+        mean = summary['mean']
+        quadrants = ' '.join(f"{summary['quadrants'][name]:5}" for name in QUADRANTS)
+        print(f"{key[:30]:30} {summary['count']:6} {mean['risk_score']:6.2f} "
+              f"{mean['value_score']:6.2f} {mean['final_score']:6.2f}   {quadrants}")
+
+
+def main():
+    """Fold results into the rollups and optionally print one kind of them."""
+    parser = argparse.ArgumentParser(description="Incremental portfolio rollups of scored projects")
+    parser.add_argument("input", nargs="?",
+                        help="JSON Lines results (or criteria) to add or re-score, - for stdin")
+    parser.add_argument("--db", help="Rollup store (default: projects/.portfolio_rollups.sqlite)")
+    parser.add_argument("--snapshot", help="Summary JSON for the server (default: next to --db)")
+    parser.add_argument("--id-key", default="id", help="Record field holding the project id")
+    parser.add_argument("--department-key", default="department",
+                        help="Record field holding the department (default: department)")
+    parser.add_argument("--category-key", default="category",
+                        help="Record field holding the LLM solution category (default: category)")
+    parser.add_argument("--remove", nargs="+", metavar="ID", help="Take these projects out")
+    parser.add_argument("--show", choices=KINDS, help="Print the rollups of this kind")
+    parser.add_argument("--json", action="store_true", help="Print all summaries as JSON")
+    args = parser.parse_args()
+
+    try:
+        with PortfolioRollup(args.db, args.snapshot) as rollup:
+            start = time.perf_counter()
+            if args.input:
+                source = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8')
+                with source:
+                    stats = rollup.update(read_jsonl(source), args.id_key,
+                                          args.department_key, args.category_key)
+                print(f"📊 {stats['added']} added, {stats['rescored']} re-scored, "
+                      f"{stats['unchanged']} unchanged in {time.perf_counter() - start:.2f}s",
+                      file=sys.stderr)
+            if args.remove:
+                removed = rollup.remove(args.remove)
+                print(f"🗑️  {removed} removed", file=sys.stderr)
+            if args.json:
+                print(json.dumps(rollup.summaries(), indent=2))
+            elif args.show:
+                _print_summaries(rollup.summaries(), args.show)
+    except (OSError, ValueError, KeyError, sqlite3.Error) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
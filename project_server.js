@@ -15,6 +15,7 @@ const DEFAULT_PORT = 8100; // AI project eval base port
 const PORT_RANGE_START = 8100;
 const PORT_RANGE_END = 8199;
 const PROJECTS_DIR = path.join(__dirname, 'projects');
+const ROLLUPS_FILE = path.join(PROJECTS_DIR, '.portfolio_rollups.json');
 
 // CORS headers for local development
 const CORS_HEADERS = {
@@ -284,6 +285,22 @@ function getAllProjects() {
     }
 }
 
+/**
+ * Load the rollup snapshot written by portfolio_rollup.py, re-reading it only when it changes
+ */
+let rollupsCache = { mtimeMs: 0, data: null };
+
+function loadRollups() {
+    const stat = fs.statSync(ROLLUPS_FILE);
+    if (stat.mtimeMs !== rollupsCache.mtimeMs) {
+        rollupsCache = {
+            mtimeMs: stat.mtimeMs,
+            data: JSON.parse(fs.readFileSync(ROLLUPS_FILE, 'utf8'))
+        };
+    }
+    return rollupsCache.data;
+}
+
 /**
  * HTTP request handler
  */
@@ -389,6 +406,45 @@ function requestHandler(req, res) {
         return;
     }
     
+    // Precomputed portfolio rollups: /api/rollups[/{kind}[/{key}]]
+    if (pathname === '/api/rollups' || pathname.startsWith('/api/rollups/')) {
+        try {
+            const [kind, key] = pathname.replace(/^\/api\/rollups\/?/, '').split('/').map(decodeURIComponent);
+            const snapshot = loadRollups();
+            const has = (object, name) => Object.prototype.hasOwnProperty.call(object, name);
+            let body = { success: true, updated: snapshot.updated, thresholds: snapshot.thresholds };
+            if (!kind) {
+                body.rollups = snapshot.rollups;
+            } else if (!key && has(snapshot.rollups, kind)) {
+                body.kind = kind;
+                body.rollups = snapshot.rollups[kind];
+            } else if (key && has(snapshot.rollups, kind) && has(snapshot.rollups[kind], key)) {
+                body.kind = kind;
+                body.key = key;
+                body.summary = snapshot.rollups[kind][key];
+            } else {
+                body = null;
+            }
+            res.statusCode = body ? 200 : 404;
+            res.end(JSON.stringify(body || { success: false, error: 'Rollup not found' }));
+        } catch (error) {
+            if (error instanceof URIError) {
+                res.statusCode = 400;
+                res.end(JSON.stringify({
+                    success: false,
+                    error: 'Malformed rollup path'
+                }));
+            } else {
+                res.statusCode = error.code === 'ENOENT' ? 404 : 500;
+                res.end(JSON.stringify({
+                    success: false,
+                    error: error.code === 'ENOENT' ? 'No rollups yet - run portfolio_rollup.py' : error.message
+                }));
+            }
+        }
+        return;
+    }
+    
     // Health check
     if (pathname === '/api/health') {
         res.statusCode = 200;
@@ -426,6 +482,8 @@ function requestHandler(req, res) {
             '/api/health',
             '/api/projects',
             '/api/projects/{id}',
+            '/api/rollups',
+            '/api/rollups/{kind}/{key}',
             '/dashboard'
         ]
     }));
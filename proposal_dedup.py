@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Proposal Detection
+
+Finds clusters of near-identical proposals in projects/*.md before they are
+scored, without comparing every pair of files.
+
+Each proposal body is lower-cased and split into words. Every run of
+--shingle-size consecutive words is a shingle, and the proposal is
+summarised by a MinHash signature: for each of --num-perm hash functions,
+the smallest hash of any of its shingles. The fraction of positions where
+two signatures agree estimates the Jaccard similarity of the two shingle
+sets.
+
+Signatures are kept in a SQLite store next to each file's size, mtime and
+content hash. A run re-reads only files whose size or mtime changed, and
+re-hashes only those whose content changed too. Changing --num-perm,
+--shingle-size or --seed rebuilds the store.
+
+Candidate pairs come from LSH banding. The signature is cut into bands of
+rows, and proposals that agree on every row of any one band share a bucket.
+With b bands of r rows, a pair of similarity s becomes a candidate with
+probability 1 - (1 - s^r)^b. The banding is picked so that this curve
+rises well below --threshold. Candidates are checked against the full
+signatures and linked into clusters, so the work grows with the number of
+files and true near-duplicates, not with the number of pairs.
+
+Usage:
+    python proposal_dedup.py [options]
+
+Options:
+    --projects-dir PATH   Proposal directory (default: projects/ next to this script)
+    --db PATH             Signature store (default: <projects-dir>/.proposal_signatures.sqlite)
+    --threshold X         Minimum estimated similarity to report (default: 0.5)
+    --json                Print clusters as JSON
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+STORE_VERSION = 1
+
+# Mersenne prime for the universal hashes (a * x + b) mod PRIME: with a, x
+# below 2^31 the product fits in uint64, and the modulo is two shift-and-add
+# folds instead of a division. Folding can leave x + PRIME in place of x for
+# the smallest few x, which is harmless for MinHash: the hash is still the
+# same function for every proposal.
+PRIME = (1 << 31) - 1
+EMPTY = 0xFFFFFFFF
+
+# Shingles hashed per matrix block, to bound memory on very long files
+BLOCK_SHINGLES = 8192
+
+_WORD = re.compile(r'[a-z0-9]+')
+
+
+class MinHasher:
+    """Shingling and MinHash signatures for one set of parameters."""
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        if num_perm < 1 or shingle_size < 1:
+            raise ValueError("num_perm and shingle_size must be at least 1")
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, PRIME, num_perm, dtype=np.uint64)[:, None]
+        self.b = rng.integers(0, PRIME, num_perm, dtype=np.uint64)[:, None]
+        # Multipliers that fold a shingle's word hashes into one hash
+        self._fold = rng.integers(1, 1 << 32, shingle_size, dtype=np.uint64) | np.uint64(1)
+
+    @property
+    def params(self) -> str:
+        return f"{self.num_perm}/{self.shingle_size}/{self.seed}"
+
+    def shingles(self, text: str) -> np.ndarray:
+        """Distinct shingle hashes of a text, each below PRIME."""
+        words = _WORD.findall(text.lower())
+        if not words:
+            return np.empty(0, dtype=np.uint64)
+        hashes = np.fromiter((zlib.crc32(word.encode()) for word in words),
+                             dtype=np.uint64, count=len(words))
+        size = min(self.shingle_size, len(hashes))
+        count = len(hashes) - size + 1
+        folded = np.zeros(count, dtype=np.uint64)
+        for offset in range(size):
+            folded = folded * self._fold[offset] + hashes[offset:offset + count]  # wraps mod 2^64
+        return np.unique(folded % np.uint64(PRIME))
+
+    def signature(self, text: str) -> Tuple[np.ndarray, int]:
+        """(MinHash signature as uint32, number of shingles)."""
+        shingles = self.shingles(text)
+        signature = np.full(self.num_perm, EMPTY, dtype=np.uint64)
+        prime = np.uint64(PRIME)
+        shift = np.uint64(31)
+        for start in range(0, len(shingles), BLOCK_SHINGLES):
+            hashes = self.a * shingles[None, start:start + BLOCK_SHINGLES]
+            hashes += self.b
+            for _ in range(2):
+                high = hashes >> shift
+                hashes &= prime
+                hashes += high
+            np.minimum(signature, hashes.min(axis=1), out=signature)
+        return signature.astype(np.uint32), len(shingles)
+
+
+def lsh_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """(bands, rows) whose candidate curve rises at about 0.8 x threshold.
+
+    The steep part of 1 - (1 - s^r)^b sits near (1/b)^(1/r). Aiming it below
+    the reporting threshold trades a few more candidates to verify for not
+    missing pairs just above the threshold.
+    """
+    target = 0.8 * threshold
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= target:
+            best = (bands, rows)
+    return best
+
+
+def candidate_pairs(signatures: np.ndarray, bands: int, rows: int) -> np.ndarray:
+    """Index pairs (i < j) that share a bucket in at least one band."""
+    found = []
+    mix = np.random.default_rng(0).integers(1, 1 << 63, rows, dtype=np.uint64)
+    for band in range(bands):
+        # One 64-bit key per band row; a key collision only adds a candidate
+        keys = (signatures[:, band * rows:(band + 1) * rows].astype(np.uint64) * mix).sum(axis=1)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        boundaries = np.flatnonzero(np.diff(sorted_keys)) + 1
+        for bucket in np.split(order, boundaries):
+            if len(bucket) > 1:
+                members = np.sort(bucket)
+                left, right = np.triu_indices(len(members), 1)
+                found.append(np.stack([members[left], members[right]], axis=1))
+    if not found:
+        return np.empty((0, 2), dtype=np.int64)
+    return np.unique(np.concatenate(found), axis=0)
+
+
+def _clusters(ids: List[str], pairs: List[Tuple[int, int, float]]) -> List[Dict]:
+    """Connected components of the similar pairs, largest first."""
+    parent = list(range(len(ids)))
+
+    def find(node):
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for left, right, _ in pairs:
+        parent[find(left)] = find(right)
+
+    groups: Dict[int, Dict] = {}
+    for left, right, similarity in pairs:
+        group = groups.setdefault(find(left), {'members': set(), 'pairs': []})
+        group['members'].update((ids[left], ids[right]))
+        group['pairs'].append({'a': ids[left], 'b': ids[right], 'similarity': round(similarity, 3)})
+
+    clusters = []
+    for group in groups.values():
+        similarities = [pair['similarity'] for pair in group['pairs']]
+        clusters.append({
+            'members': sorted(group['members']),
+            'max_similarity': max(similarities),
+            'min_similarity': min(similarities),
+            'pairs': sorted(group['pairs'], key=lambda pair: (-pair['similarity'], pair['a'], pair['b']))
+        })
+    clusters.sort(key=lambda cluster: (-len(cluster['members']), -cluster['max_similarity'],
+                                       cluster['members']))
+    return clusters
+
+
+class ProposalDeduplicator:
+    """Persistent, incrementally refreshed MinHash signatures of projects/*.md."""
+
+    def __init__(self, projects_dir: str = None, db_path: str = None,
+                 hasher: Optional[MinHasher] = None):
+        self.projects_dir = Path(projects_dir or Path(__file__).parent / "projects").resolve()
+        self.db_path = Path(db_path) if db_path else self.projects_dir / ".proposal_signatures.sqlite"
+        self.hasher = hasher or MinHasher()
+        self.connection = sqlite3.connect(str(self.db_path))
+        self._create_schema()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Close the signature store."""
+        self.connection.close()
+
+    def _create_schema(self):
+        """Create the store, or rebuild it for a new format or new MinHash parameters."""
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        with self.connection:
+            if version == STORE_VERSION:
+                row = self.connection.execute(
+                    "SELECT value FROM meta WHERE key = 'params'").fetchone()
+                if row is None or row[0] != self.hasher.params:
+                    version = None
+            if version != STORE_VERSION:
+                self.connection.execute("DROP TABLE IF EXISTS signatures")
+                self.connection.execute("DROP TABLE IF EXISTS meta")
+                self.connection.execute(f"PRAGMA user_version = {STORE_VERSION}")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS signatures (
+                    id TEXT PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    shingles INTEGER NOT NULL,
+                    signature BLOB NOT NULL
+                )
+            """)
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self.connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('params', ?)", (self.hasher.params,))
+
+    def refresh(self) -> Dict[str, int]:
+        """Bring the signatures in line with the directory; return change counts."""
+        known = {
+            row[0]: row[1:]
+            for row in self.connection.execute("SELECT id, mtime_ns, size, sha256 FROM signatures")
+        }
+        stats = {'scanned': 0, 'hashed': 0, 'touched': 0, 'unchanged': 0, 'removed': 0}
+        upserts = []
+        touches = []
+        seen = set()
+
+        for path in self.projects_dir.glob("*.md"):
+            stat = path.stat()
+            project_id = path.stem
+            seen.add(project_id)
+            stats['scanned'] += 1
+
+            previous = known.get(project_id)
+            if previous and previous[:2] == (stat.st_mtime_ns, stat.st_size):
+                stats['unchanged'] += 1
+                continue
+
+            data = path.read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+            if previous and previous[2] == digest:
+                touches.append((stat.st_mtime_ns, stat.st_size, project_id))
+                stats['touched'] += 1
+                continue
+
+            signature, shingles = self.hasher.signature(data.decode('utf-8', errors='replace'))
+            upserts.append((project_id, stat.st_mtime_ns, stat.st_size, digest, shingles,
+                            signature.tobytes()))
+            stats['hashed'] += 1
+
+        removed = [(project_id,) for project_id in known.keys() - seen]
+        stats['removed'] = len(removed)
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO signatures (id, mtime_ns, size, sha256, shingles, signature) "
+                "VALUES (?, ?, ?, ?, ?, ?)", upserts
+            )
+            self.connection.executemany(
+                "UPDATE signatures SET mtime_ns = ?, size = ? WHERE id = ?", touches
+            )
+            self.connection.executemany("DELETE FROM signatures WHERE id = ?", removed)
+        return stats
+
+    def signatures(self) -> Tuple[List[str], np.ndarray]:
+        """Ids and signature matrix of every stored proposal that has shingles."""
+        ids = []
+        blobs = []
+        for project_id, blob in self.connection.execute(
+                "SELECT id, signature FROM signatures WHERE shingles > 0 ORDER BY id"):
+            ids.append(project_id)
+            blobs.append(blob)
+        matrix = np.frombuffer(b''.join(blobs), dtype=np.uint32).reshape(len(ids), self.hasher.num_perm)
+        return ids, matrix
+
+    def find_clusters(self, threshold: float = 0.5) -> Tuple[List[Dict], Dict[str, int]]:
+        """Clusters of proposals with estimated similarity >= threshold, and LSH counts."""
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        ids, matrix = self.signatures()
+        bands, rows = lsh_bands(self.hasher.num_perm, threshold)
+        candidates = candidate_pairs(matrix, bands, rows)
+        similarities = (matrix[candidates[:, 0]] == matrix[candidates[:, 1]]).mean(axis=1) \
+            if len(candidates) else np.empty(0)
+        keep = similarities >= threshold
+        pairs = [(int(left), int(right), float(similarity))
+                 for (left, right), similarity in zip(candidates[keep], similarities[keep])]
+        stats = {'proposals': len(ids), 'bands': bands, 'rows': rows,
+                 'candidates': len(candidates), 'pairs': len(pairs)}
+        return _clusters(ids, pairs), stats
+
+
+def main():
+    """Refresh the signatures and print near-duplicate clusters."""
+    parser = argparse.ArgumentParser(description="Find near-duplicate project proposals")
+    parser.add_argument("--projects-dir", help="Proposal directory (default: ./projects)")
+    parser.add_argument("--db", help="Signature store (default: <projects-dir>/.proposal_signatures.sqlite)")
+    parser.add_argument("--threshold", type=float, default=0.5,
+                        help="Minimum estimated Jaccard similarity (default: 0.5)")
+    parser.add_argument("--num-perm", type=int, default=128,
+                        help="MinHash signature length (default: 128)")
+    parser.add_argument("--shingle-size", type=int, default=3,
+                        help="Words per shingle (default: 3)")
+    parser.add_argument("--seed", type=int, default=1, help="Hash function seed (default: 1)")
+    parser.add_argument("--json", action="store_true", help="Print clusters as JSON")
+    args = parser.parse_args()
+
+    try:
+        hasher = MinHasher(args.num_perm, args.shingle_size, args.seed)
+        with ProposalDeduplicator(args.projects_dir, args.db, hasher) as dedup:
+            start = time.perf_counter()
+            stats = dedup.refresh()
+            clusters, lsh = dedup.find_clusters(args.threshold)
+            elapsed = time.perf_counter() - start
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(clusters, indent=2))
+    else:
+        for number, cluster in enumerate(clusters, 1):
+            print(f"🔁 Cluster {number}: {len(cluster['members'])} proposals, similarity "
+                  f"{cluster['min_similarity']:.2f}-{cluster['max_similarity']:.2f}")
+            for pair in cluster['pairs']:
+                print(f"   {pair['similarity']:.2f}  {pair['a']}  ↔  {pair['b']}")
+        if not clusters:
+            print(f"✅ No proposals at or above {args.threshold:.2f} similarity")
+
+    print(f"📊 {stats['scanned']} files: {stats['hashed']} hashed, {stats['touched']} touched, "
+          f"{stats['unchanged']} unchanged, {stats['removed']} removed; "
+          f"{lsh['bands']}x{lsh['rows']} bands, {lsh['candidates']} candidates, "
+          f"{len(clusters)} clusters in {elapsed * 1000:.1f}ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
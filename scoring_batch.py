@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Vectorized Batch Evaluation
+
+NumPy engine behind ProjectEvaluator.evaluate_batch(). Criteria are turned
+into one points column per rubric field, dimension scores are computed with
+array operations, and the weighted aggregation is resolved through lookup
+tables built by calling the evaluator's own aggregation methods, so every
+row is identical to what evaluate_project() returns for the same criteria.
+"""
+
+from collections.abc import Mapping
+from itertools import product, repeat
+from typing import Dict, List
+
+import numpy as np
+
+from scoring_calculator import DIMENSIONS, PRIORITY_LEVELS
+
+RISK_DIMENSIONS = DIMENSIONS[:3]
+VALUE_DIMENSIONS = DIMENSIONS[3:]
+
+_EMPTY = {}
+
+# Aggregation tables per (evaluator type, scoring model, weights snapshot)
+_TABLE_CACHE = {}
+_TABLE_CACHE_SIZE = 16
+
+
+class BatchResult:
+    """Columnar evaluation results for a batch of projects."""
+
+    def __init__(self, dimension_scores: Dict, weighted_scores: Dict,
+                 risk_score, value_score, final_score, priority_codes):
+        self.dimension_scores = dimension_scores
+        self.weighted_scores = weighted_scores
+        self.risk_score = risk_score
+        self.value_score = value_score
+        self.final_score = final_score
+        self.priority_codes = priority_codes
+
+    def __len__(self) -> int:
+        return len(self.priority_codes)
+
+    def __getitem__(self, index: int) -> Dict:
+        """Return one row in the evaluate_project() dict shape."""
+        return {
+            'dimension_scores': {
+                dim: int(self.dimension_scores[dim][index]) for dim in DIMENSIONS
+            },
+            'weighted_scores': {
+                dim: float(self.weighted_scores[dim][index]) for dim in DIMENSIONS
+            },
+            'risk_score': float(self.risk_score[index]),
+            'value_score': float(self.value_score[index]),
+            'final_score': float(self.final_score[index]),
+            'priority': PRIORITY_LEVELS[self.priority_codes[index]]
+        }
+
+    def __iter__(self):
+        return iter(self.to_dicts())
+
+    @property
+    def priority(self) -> List[str]:
+        """Priority labels, one per project."""
+        return [PRIORITY_LEVELS[code] for code in self.priority_codes.tolist()]
+
+    def to_dicts(self) -> List[Dict]:
+        """Convert every row to the evaluate_project() dict shape."""
+        dims = [self.dimension_scores[dim].tolist() for dim in DIMENSIONS]
+        weighted = [self.weighted_scores[dim].tolist() for dim in DIMENSIONS]
+        rows = zip(zip(*dims), zip(*weighted), self.risk_score.tolist(),
+                   self.value_score.tolist(), self.final_score.tolist(),
+                   self.priority)
+        return [
+            {
+                'dimension_scores': dict(zip(DIMENSIONS, scores)),
+                'weighted_scores': dict(zip(DIMENSIONS, weights)),
+                'risk_score': risk,
+                'value_score': value,
+                'final_score': final,
+                'priority': priority
+            }
+            for scores, weights, risk, value, final, priority in rows
+        ]
+
+
+def _categorical_points(field, values, count: int) -> np.ndarray:
+    """Score one categorical rubric field for every project."""
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'US':
+        points = np.full(count, field.fallback, dtype=np.int8)
+        for value, value_points in field.scores.items():
+            points[values == value] = value_points
+        return points
+    return np.fromiter(map(field.lookup, values, repeat(field.fallback)),
+                       dtype=np.int8, count=count)
+
+
+def _ladder_numbers(field, values) -> np.ndarray:
+    """Ladder values as floats, rejecting whatever evaluate_project() rejects.
+
+    A float64 conversion would turn None into NaN and "5" into 5.0. Columns
+    that are not plainly numeric are compared value by value against the
+    breakpoints instead, which raises the scalar path's TypeError.
+    """
+    if isinstance(values, np.ndarray):
+        array = values
+    else:
+        values = list(values)
+        try:
+            array = np.array(values)
+        except ValueError:
+            # Ragged nested sequences; the check below raises for them
+            array = np.empty(0, dtype=object)
+    if array.dtype.kind not in 'biuf' or array.ndim != 1:
+        for value in (values if isinstance(values, list) else array.tolist()):
+            field.search(field.breakpoints, value)
+        array = np.array(values, dtype=np.float64)
+    return array.astype(np.float64, copy=False)
+
+
+def _ladder_points(field, values) -> np.ndarray:
+    """Score one breakpoint-ladder rubric field for every project."""
+    return ladder_points(field, _ladder_numbers(field, values), np.int8)
+
+
+def ladder_points(field, numbers: np.ndarray, dtype=np.int16) -> np.ndarray:
+    """field.score() over a float array; NaN takes the fall-through points."""
+    index = np.searchsorted(np.asarray(field.breakpoints, dtype=np.float64),
+                            numbers, side=field.side)
+    points = np.asarray(field.points, dtype=dtype)[index]
+    unordered = np.isnan(numbers)
+    if unordered.any():
+        points[unordered] = field.unordered
+    return points
+
+
+def _dimension_totals_from_criteria(rubric, criteria: List[Dict]) -> Dict[str, np.ndarray]:
+    """Sum rubric points per dimension from a list of nested criteria dicts."""
+    count = len(criteria)
+    totals = {}
+    for dim, spec in rubric.items():
+        # map() over the unbound dict.get keeps the per-record work in C
+        sections = list(map(dict.get, criteria, repeat(spec.section), repeat(_EMPTY)))
+        total = np.ones(count, dtype=np.int16)
+        for field in spec.categorical:
+            values = map(dict.get, sections, repeat(field.name), repeat(field.default))
+            total += _categorical_points(field, values, count)
+        for field in spec.ladders:
+            values = map(dict.get, sections, repeat(field.name), repeat(field.default))
+            total += _ladder_points(field, values)
+        totals[dim] = total
+    return totals
+
+
+def _dimension_totals_from_columns(rubric, columns: Mapping) -> Dict[str, np.ndarray]:
+    """Sum rubric points per dimension from dotted-name columns."""
+    lengths = {len(column) for column in columns.values()}
+    if len(lengths) != 1:
+        raise ValueError("columnar input needs one or more columns of equal length")
+    count = lengths.pop()
+
+    def column(section, field):
+        # Plain sequences are scored as given: coercing them to one dtype
+        # would let strings pass as numbers and None as 'None'
+        values = columns.get(f"{section}.{field.name}")
+        if values is None:
+            return [field.default] * count
+        return values
+
+    totals = {}
+    for dim, spec in rubric.items():
+        total = np.ones(count, dtype=np.int16)
+        for field in spec.categorical:
+            total += _categorical_points(field, column(spec.section, field), count)
+        for field in spec.ladders:
+            total += _ladder_points(field, column(spec.section, field))
+        totals[dim] = total
+    return totals
+
+
+def _aggregation_tables(evaluator):
+    """Build (or reuse) lookup tables for the weighted aggregation.
+
+    Risk and value each depend on three scores in 1..5, i.e. 125 combinations;
+    final score and priority depend on the (risk, value) pair. Filling the
+    tables through the evaluator's own methods keeps float rounding identical.
+    """
+    key = (
+        type(evaluator),
+        getattr(evaluator, 'scoring_model', None),
+        tuple(evaluator.weights.items()),
+        tuple(evaluator.risk_weights.items()),
+        tuple(evaluator.value_weights.items())
+    )
+    tables = _TABLE_CACHE.get(key)
+    if tables is not None:
+        return tables
+
+    combos = list(product(range(1, 6), repeat=3))
+    raw_risk = [evaluator.calculate_risk_score(dict(zip(RISK_DIMENSIONS, combo)))
+                for combo in combos]
+    raw_value = [evaluator.calculate_value_score(dict(zip(VALUE_DIMENSIONS, combo)))
+                 for combo in combos]
+
+    final = []
+    priority = []
+    for risk in raw_risk:
+        for value in raw_value:
+            final.append(round(evaluator.calculate_final_score(value, risk), 2))
+            priority.append(PRIORITY_LEVELS.index(evaluator.classify_priority(value, risk)))
+
+    tables = (
+        np.array([round(risk, 2) for risk in raw_risk]),
+        np.array([round(value, 2) for value in raw_value]),
+        np.array(final),
+        np.array(priority, dtype=np.uint8)
+    )
+    if len(_TABLE_CACHE) >= _TABLE_CACHE_SIZE:
+        _TABLE_CACHE.clear()
+    _TABLE_CACHE[key] = tables
+    return tables
+
+
+def evaluate_batch(evaluator, criteria) -> BatchResult:
+    """Evaluate a batch of projects with array operations.
+
+    criteria is either a sequence of nested criteria dicts, as accepted by
+    evaluate_project(), a mapping of dotted field names to equal-length
+    arrays, or a scoring_store criteria store (or block of one), which
+    supplies its own dimension totals. Fields are scored with the
+    evaluator's compiled rubric; missing fields take the rubric default.
+    """
+    dimension_totals = getattr(criteria, 'dimension_totals', None)
+    if dimension_totals is not None:
+        totals = dimension_totals(evaluator.rubric)
+    elif isinstance(criteria, Mapping):
+        totals = _dimension_totals_from_columns(evaluator.rubric, criteria)
+    else:
+        if not isinstance(criteria, list):
+            criteria = list(criteria)
+        totals = _dimension_totals_from_criteria(evaluator.rubric, criteria)
+    return evaluate_totals(evaluator, totals)
+
+
+def evaluate_totals(evaluator, totals: Dict[str, np.ndarray]) -> BatchResult:
+    """Finish an evaluation from raw per-dimension point totals.
+
+    totals maps each dimension to an integer array holding the base of 1
+    plus the points of its fields, before the // 3 and 1..5 clamp.
+    """
+    dimension_scores = {
+        dim: np.clip(total // 3, 1, 5).astype(np.int8) for dim, total in totals.items()
+    }
+    weighted_scores = {
+        dim: dimension_scores[dim] * evaluator.weights[dim] for dim in DIMENSIONS
+    }
+
+    def combo_index(dims):
+        index = np.zeros(len(dimension_scores[dims[0]]), dtype=np.intp)
+        for dim in dims:
+            index = index * 5 + (dimension_scores[dim] - 1)
+        return index
+
+    risk_table, value_table, final_table, priority_table = _aggregation_tables(evaluator)
+    risk_index = combo_index(RISK_DIMENSIONS)
+    value_index = combo_index(VALUE_DIMENSIONS)
+    pair_index = risk_index * 125 + value_index
+
+    return BatchResult(
+        dimension_scores,
+        weighted_scores,
+        risk_table[risk_index],
+        value_table[value_index],
+        final_table[pair_index],
+        priority_table[pair_index]
+    )
@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+Scoring Benchmarks
+
+By default, times the per-call cost of each score_* method and of
+evaluate_project() on synthetic criteria that cover every category and
+ladder rung in RUBRIC. Pass --ref to time the scoring_calculator.py from
+another git revision in the same process, e.g. to compare against the code
+before a change:
+
+    python scoring_benchmark.py --ref HEAD~1
+
+With --suite, runs the end-to-end suite instead: evaluate_project, the
+batch and streaming paths, projects/*.md parsing and JSON serialization,
+each on synthetic portfolios of 1k/100k/1M records and each in a fresh
+process so its peak RSS can be reported. The report is JSON; save one as a
+baseline and later runs are compared against it:
+
+    python scoring_benchmark.py --suite --save-baseline bench_baseline.json
+    python scoring_benchmark.py --suite --baseline bench_baseline.json
+
+With --startup, times cold starts instead: a fresh interpreter running
+the scoring_calculator.py CLI on one record, and the same call through
+scoring_client.py and a warm scoring_daemon.py. With --ref, the CLI from
+that revision is timed too, for a before/after comparison:
+
+    python scoring_benchmark.py --startup --ref HEAD~1
+"""
+
+import argparse
+import io
+import json
+import multiprocessing
+import platform
+import random
+import resource
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+import types
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import cycle, islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import scoring_calculator
+from scoring_calculator import RUBRIC
+
+SUITE_SIZES = {'1k': 1_000, '100k': 100_000, '1m': 1_000_000}
+SUITE_CASES = ('evaluate_project', 'evaluate_batch', 'stream_jsonl',
+               'parse_markdown', 'serialize_json')
+
+# Suite portfolios cycle through this many distinct records, so a 1M run
+# does not hold 1M criteria dicts in memory
+POOL_SIZE = 10_000
+BATCH_CHUNK = 10_000
+
+STARTUP_RUNS = 20
+
+SCORERS = {
+    'technical_complexity': 'score_technical_complexity',
+    'resource_requirements': 'score_resource_requirements',
+    'implementation_risk': 'score_implementation_risk',
+    'business_impact': 'score_business_impact',
+    'scalability_potential': 'score_scalability_potential',
+    'implementation_timeline': 'score_implementation_timeline'
+}
+
+
+def _field_values(rule: Dict) -> List:
+    """Every interesting value for one rubric field."""
+    if 'scores' in rule:
+        return list(rule['scores'])
+    breakpoints = [point for point in rule['breakpoints'] if point == int(point)]
+    values = set()
+    for point in breakpoints:
+        values.update((int(point) - 1, int(point), int(point) + 1))
+    return sorted(value for value in values if value >= 0)
+
+
+def iter_criteria(count: int, seed: int = 42) -> Iterator[Dict]:
+    """Yield deterministic criteria dicts covering the whole rubric."""
+    rng = random.Random(seed)
+    choices = {
+        (spec['section'], field): _field_values(rule)
+        for spec in RUBRIC.values()
+        for field, rule in spec['fields'].items()
+    }
+    for _ in range(count):
+        project = {}
+        for (section, field), values in choices.items():
+            project.setdefault(section, {})[field] = rng.choice(values)
+        yield project
+
+
+def generate_criteria(count: int, seed: int = 42) -> List[Dict]:
+    """Build deterministic criteria dicts covering the whole rubric."""
+    return list(iter_criteria(count, seed))
+
+
+def load_revision(ref: str):
+    """Import scoring_calculator.py as it was at a git revision."""
+    root = Path(__file__).parent
+    source = subprocess.run(
+        ["git", "show", f"{ref}:scoring_calculator.py"],
+        cwd=root, capture_output=True, text=True, check=True
+    ).stdout
+    module = types.ModuleType(f"scoring_calculator@{ref}")
+    exec(compile(source, f"scoring_calculator.py@{ref}", "exec"), module.__dict__)
+    return module
+
+
+def benchmark(modules: Dict, criteria: List[Dict], repeat: int) -> Dict[str, Dict]:
+    """Time every scorer and evaluate_project() for each module version.
+
+    Versions are timed alternately within each repeat so that machine noise
+    affects them equally; the best time per call is kept, in nanoseconds.
+    """
+    cases = {}
+    for name, module in modules.items():
+        evaluator = module.ProjectEvaluator()
+        cases[name] = {
+            method: (getattr(evaluator, method),
+                     [project[RUBRIC[dimension]['section']] for project in criteria])
+            for dimension, method in SCORERS.items()
+        }
+        cases[name]['evaluate_project'] = (evaluator.evaluate_project, criteria)
+
+    timings = {name: {method: float('inf') for method in methods}
+               for name, methods in cases.items()}
+    for _ in range(repeat):
+        for name, methods in cases.items():
+            for method, (func, args) in methods.items():
+                start = time.perf_counter()
+                for arg in args:
+                    func(arg)
+                elapsed = (time.perf_counter() - start) / len(args) * 1e9
+                timings[name][method] = min(timings[name][method], elapsed)
+    return timings
+
+
+class _TimingSink:
+    """Write target that discards output and times the gap between writes."""
+
+    def __init__(self):
+        self.timings = array('d')
+        self.bytes = 0
+        self._last = time.perf_counter()
+
+    def write(self, text: str):
+        now = time.perf_counter()
+        self.timings.append(now - self._last)
+        self._last = now
+        self.bytes += len(text)
+
+    def flush(self):
+        pass
+
+
+def _latency(timings: array, unit: str) -> Dict:
+    """Percentiles of per-unit timings, in microseconds."""
+    ordered = sorted(timings)
+    if not ordered:
+        return {'unit': unit}
+
+    def at(fraction):
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1e6, 2)
+
+    return {'unit': unit, 'p50_us': at(0.50), 'p90_us': at(0.90), 'p99_us': at(0.99),
+            'max_us': round(ordered[-1] * 1e6, 2)}
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return round(peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+def _markdown_pool() -> List:
+    projects_dir = Path(__file__).parent / "projects"
+    return [(path.stem, path.read_text(encoding='utf-8'))
+            for path in sorted(projects_dir.glob("*.md"))]
+
+
+def _run_case(case: str, count: int, seed: int) -> Dict:
+    """Run one suite case; executed in a fresh process per case and size."""
+    evaluator = scoring_calculator.ProjectEvaluator()
+    pool = generate_criteria(min(count, POOL_SIZE), seed)
+    records = islice(cycle(pool), count)
+    timings = array('d')
+    clock = time.perf_counter
+    unit = 'record'
+
+    start = clock()
+    if case == 'evaluate_project':
+        evaluate = evaluator.evaluate_project
+        for criteria in records:
+            begin = clock()
+            evaluate(criteria)
+            timings.append(clock() - begin)
+    elif case == 'evaluate_batch':
+        unit = f'{BATCH_CHUNK} record chunk'
+        chunks = [list(islice(records, BATCH_CHUNK))
+                  for _ in range(-(-count // BATCH_CHUNK))]
+        # Build the aggregation tables outside the timed region
+        evaluator.evaluate_batch(pool[:1])
+        start = clock()
+        for chunk in chunks:
+            begin = clock()
+            evaluator.evaluate_batch(chunk)
+            timings.append(clock() - begin)
+    elif case == 'stream_jsonl':
+        import scoring_stream
+        unit = '1000 record chunk'
+        lines = [json.dumps(criteria) + '\n' for criteria in pool]
+        sink = _TimingSink()
+        start = sink._last = clock()
+        scoring_stream.score_stream(evaluator, islice(cycle(lines), count), sink, 'jsonl', 1000)
+        timings = sink.timings
+    elif case == 'parse_markdown':
+        from portfolio_index import parse_project_markdown
+        documents = _markdown_pool()
+        start = clock()
+        for project_id, content in islice(cycle(documents), count):
+            begin = clock()
+            parse_project_markdown(project_id, content)
+            timings.append(clock() - begin)
+    elif case == 'serialize_json':
+        results = [evaluator.evaluate_project(criteria) for criteria in pool]
+        dumps = json.dumps
+        start = clock()
+        for result in islice(cycle(results), count):
+            begin = clock()
+            dumps(result)
+            timings.append(clock() - begin)
+    else:
+        raise ValueError(f"unknown case {case!r}")
+    seconds = clock() - start
+
+    return {
+        'records': count,
+        'seconds': round(seconds, 4),
+        'records_per_sec': round(count / seconds, 1),
+        'latency': _latency(timings, unit),
+        'peak_rss_mb': _peak_rss_mb()
+    }
+
+
+def run_suite(sizes: List[str], cases: List[str], seed: int = 42) -> Dict:
+    """Run every case at every size, each in its own process; return the report."""
+    context = multiprocessing.get_context('spawn')
+    results = {}
+    for case in cases:
+        for size in sizes:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                result = pool.submit(_run_case, case, SUITE_SIZES[size], seed).result()
+            results.setdefault(case, {})[size] = result
+            print(f"  {case:18} {size:>5}  {result['records_per_sec']:>12,.0f} records/sec  "
+                  f"peak {result['peak_rss_mb']} MB", file=sys.stderr)
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': seed,
+        'results': results
+    }
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float) -> List[Dict]:
+    """Cases whose throughput fell more than tolerance below the baseline."""
+    regressions = []
+    for case, sizes in report['results'].items():
+        for size, result in sizes.items():
+            before = baseline.get('results', {}).get(case, {}).get(size)
+            if not before:
+                continue
+            ratio = result['records_per_sec'] / before['records_per_sec']
+            result['vs_baseline'] = round(ratio, 3)
+            if ratio < 1 - tolerance:
+                regressions.append({'case': case, 'size': size, 'ratio': round(ratio, 3)})
+    return regressions
+
+
+def suite_main(args):
+    """Run the end-to-end suite, print the JSON report, compare to a baseline."""
+    sizes = args.sizes.split(',')
+    cases = args.cases.split(',') if args.cases else list(SUITE_CASES)
+    unknown = [size for size in sizes if size not in SUITE_SIZES] + \
+              [case for case in cases if case not in SUITE_CASES]
+    if unknown:
+        print(f"❌ Unknown size or case: {', '.join(unknown)}", file=sys.stderr)
+        sys.exit(1)
+
+    baseline = None
+    if args.baseline:
+        try:
+            baseline = json.loads(Path(args.baseline).read_text())
+        except (OSError, ValueError) as e:
+            print(f"❌ Could not read baseline: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    print(f"Running {len(cases)} cases x {len(sizes)} sizes", file=sys.stderr)
+    report = run_suite(sizes, cases, args.seed)
+    regressions = compare(report, baseline, args.tolerance) if baseline else []
+    if baseline:
+        report['regressions'] = regressions
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(text + '\n')
+        print(f"✅ Baseline saved to {args.save_baseline}", file=sys.stderr)
+    if regressions:
+        for regression in regressions:
+            print(f"❌ {regression['case']} {regression['size']}: "
+                  f"{regression['ratio']:.0%} of baseline throughput", file=sys.stderr)
+        sys.exit(1)
+
+
+def _checkout(ref: str, directory: str):
+    """Extract the tree at a git revision into directory."""
+    archive = subprocess.run(["git", "archive", "--format=tar", ref],
+                             cwd=Path(__file__).parent, capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(directory, filter='data')
+
+
+def _cold_start(command: List[str], runs: int, env: Optional[Dict] = None) -> Dict:
+    """Median and best wall time of a fresh process, in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       env=env, check=True)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return {'median_ms': round(timings[len(timings) // 2] * 1000, 1),
+            'best_ms': round(timings[0] * 1000, 1)}
+
+
+def startup_times(runs: int = STARTUP_RUNS, ref: Optional[str] = None) -> Dict[str, Dict]:
+    """Cold-start cost of one-record CLI calls, with and without the daemon."""
+    root = Path(__file__).parent
+    python = sys.executable
+    with tempfile.TemporaryDirectory() as scratch:
+        record = os.path.join(scratch, 'one.jsonl')
+        Path(record).write_text(json.dumps(generate_criteria(1)[0]) + '\n')
+        env = dict(os.environ, PROJECT_EVAL_SOCKET=os.path.join(scratch, 'daemon.sock'),
+                   PROJECT_EVAL_CACHE=os.path.join(scratch, 'cache'))
+
+        results = {
+            'interpreter': _cold_start([python, '-c', 'pass'], runs),
+            'cli': _cold_start([python, str(root / 'scoring_calculator.py'), record], runs, env)
+        }
+        if ref:
+            tree = os.path.join(scratch, 'ref')
+            _checkout(ref, tree)
+            results[f'cli@{ref}'] = _cold_start(
+                [python, os.path.join(tree, 'scoring_calculator.py'), record], runs)
+
+        daemon = subprocess.Popen([python, str(root / 'scoring_daemon.py')], env=env,
+                                  stderr=subprocess.PIPE, text=True)
+        try:
+            daemon.stderr.readline()
+            results['client+daemon'] = _cold_start(
+                [python, str(root / 'scoring_client.py'), record], runs, env)
+        finally:
+            daemon.terminate()
+            daemon.wait()
+    return results
+
+
+def startup_main(args):
+    """Print cold-start times for the CLI paths."""
+    try:
+        results = startup_times(args.runs, args.ref)
+    except subprocess.CalledProcessError as e:
+        print(f"❌ Startup run failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Cold start in ms, one record (median and best of {args.runs})")
+    print("=" * 50)
+    for name, timing in results.items():
+        print(f"{name:32}{timing['median_ms']:>9.1f}{timing['best_ms']:>9.1f}")
+
+
+def main():
+    """Run the micro-benchmark (default) or the end-to-end suite."""
+    parser = argparse.ArgumentParser(description="Benchmark the project scorer")
+    parser.add_argument("--count", type=int, default=20000,
+                        help="Number of synthetic projects (default: 20000)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Timing repeats, best is reported (default: 5)")
+    parser.add_argument("--ref", help="Git revision to compare against, e.g. HEAD~1")
+    parser.add_argument("--startup", action="store_true",
+                        help="Time cold starts of the CLI, client and daemon instead")
+    parser.add_argument("--runs", type=int, default=STARTUP_RUNS,
+                        help=f"Processes per startup case (default: {STARTUP_RUNS})")
+    parser.add_argument("--suite", action="store_true",
+                        help="Run the end-to-end suite and print a JSON report")
+    parser.add_argument("--sizes", default="1k,100k",
+                        help="Suite portfolio sizes: 1k, 100k, 1m (default: 1k,100k)")
+    parser.add_argument("--cases", help=f"Suite cases (default: all of {','.join(SUITE_CASES)})")
+    parser.add_argument("--seed", type=int, default=42, help="Data seed (default: 42)")
+    parser.add_argument("--baseline", help="Report to compare the suite against")
+    parser.add_argument("--save-baseline", help="Also write the suite report to this file")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Allowed throughput drop vs the baseline (default: 0.10)")
+    args = parser.parse_args()
+
+    if args.startup:
+        startup_main(args)
+        return
+    if args.suite:
+        suite_main(args)
+        return
+
+    modules = {'current': scoring_calculator}
+    if args.ref:
+        try:
+            modules[args.ref] = load_revision(args.ref)
+        except subprocess.CalledProcessError as e:
+            print(f"❌ Could not load {args.ref}: {e.stderr.strip()}", file=sys.stderr)
+            sys.exit(1)
+    results = benchmark(modules, generate_criteria(args.count), args.repeat)
+
+    columns = list(results)
+    print(f"Per-call cost in ns ({args.count} projects, best of {args.repeat})")
+    print("=" * 50)
+    print(f"{'':32}" + "".join(f"{name:>12}" for name in columns))
+    for method in results['current']:
+        print(f"{method:32}" + "".join(f"{results[name][method]:>12.0f}" for name in columns))
+
+
+if __name__ == "__main__":
+    main()
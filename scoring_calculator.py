@@ -6,13 +6,392 @@ This script provides deterministic scoring based on structured inputs
 without requiring any LLM or subjective interpretation.
 """
 
-import json
-from typing import Dict, List, Tuple
+import math
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from types import MappingProxyType, SimpleNamespace
+from typing import Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+# Dimension order used by every columnar/batch representation
+DIMENSIONS = (
+    'technical_complexity',
+    'resource_requirements',
+    'implementation_risk',
+    'business_impact',
+    'scalability_potential',
+    'implementation_timeline'
+)
+
+# Priority buckets, in the order they are tested in classify_priority().
+# Batch results store the index into this tuple instead of the string.
+PRIORITY_LEVELS = (
+    "Priority 1 - Immediate implementation",
+    "Priority 2 - Detailed planning required",
+    "Priority 2 - Risk mitigation planning",
+    "Priority 3 - Quick wins consideration",
+    "Priority 4 - Defer pending improvements",
+    "Priority 4 - Reject or major redesign"
+)
+
+# Field-level scoring rules, as data. ProjectEvaluator compiles this once
+# (see compile_rubric) and every score_* method reads the compiled form.
+#
+# Each dimension reads one criteria section and sums the points of its
+# fields onto a base of 1; the dimension score is min(5, max(1, total // 3)).
+# Categorical fields map a value to points ('scores'), falling back to
+# 'fallback' for unknown values. Numeric fields are threshold ladders:
+# points[bisect_<side>(breakpoints, value)]. NaN passes none of a ladder's
+# tests and scores like the original if/elif chains' final else: the top
+# points of a 'left' ladder, the first points of a 'right' one.
+RUBRIC = {
+    'technical_complexity': {
+        'section': 'technical',
+        'fields': {
+            'technology_type': {
+                'default': 'existing_apis',
+                'fallback': 1,
+                'scores': {
+                    'existing_apis': 1,
+                    'minor_customization': 2,
+                    'custom_development': 3,
+                    'cutting_edge': 4,
+                    'experimental': 5
+                }
+            },
+            'integration_count': {
+                'default': 0,
+                'side': 'left',
+                'breakpoints': (1, 2, 5, 10),
+                'points': (1, 2, 3, 4, 5)
+            },
+            'team_experience_percent': {
+                'default': 100,
+                'side': 'right',
+                'breakpoints': (20, 40, 60, 80),
+                'points': (5, 4, 3, 2, 1)
+            }
+        }
+    },
+    'resource_requirements': {
+        'section': 'resources',
+        'fields': {
+            'team_size': {
+                'default': 1,
+                'side': 'left',
+                'breakpoints': (2, 4, 6, 10),
+                'points': (1, 2, 3, 4, 5)
+            },
+            'infrastructure_level': {
+                'default': 'existing',
+                'fallback': 1,
+                'scores': {
+                    'existing': 1,
+                    'minor_additions': 2,
+                    'moderate_new': 3,
+                    'significant_changes': 4,
+                    'major_overhaul': 5
+                }
+            },
+            'expertise_required': {
+                'default': 'current_skills',
+                'fallback': 1,
+                'scores': {
+                    'current_skills': 1,
+                    'minor_training': 2,
+                    'some_hiring': 3,
+                    'external_expertise': 4,
+                    'multiple_specialists': 5
+                }
+            }
+        }
+    },
+    'implementation_risk': {
+        'section': 'risk',
+        'fields': {
+            'regulatory_level': {
+                'default': 'none',
+                'fallback': 1,
+                'scores': {
+                    'none': 1,
+                    'minor': 2,
+                    'some': 3,
+                    'significant': 4,
+                    'heavy': 5
+                }
+            },
+            'user_adoption': {
+                'default': 'high_acceptance',
+                'fallback': 1,
+                'scores': {
+                    'high_acceptance': 1,
+                    'good_buyin': 2,
+                    'moderate_change': 3,
+                    'substantial_resistance': 4,
+                    'high_resistance': 5
+                }
+            },
+            'external_dependencies_count': {
+                # "== 0" scores 1, anything below zero falls through to 2
+                'default': 0,
+                'side': 'left',
+                'breakpoints': (math.nextafter(0, -math.inf), 0, 2, 5, 10),
+                'points': (2, 1, 2, 3, 4, 5)
+            }
+        }
+    },
+    'business_impact': {
+        'section': 'business',
+        'fields': {
+            'operational_improvement': {
+                'default': 'minimal',
+                'fallback': 1,
+                'scores': {
+                    'minimal': 1,
+                    'modest': 2,
+                    'noticeable': 3,
+                    'significant': 4,
+                    'revolutionary': 5
+                }
+            },
+            'impact_scope': {
+                'default': 'single_team',
+                'fallback': 1,
+                'scores': {
+                    'single_team': 1,
+                    'department': 2,
+                    'multi_department': 3,
+                    'organization_wide': 4,
+                    'industry_level': 5
+                }
+            },
+            'competitive_advantage': {
+                'default': 'none',
+                'fallback': 1,
+                'scores': {
+                    'none': 1,
+                    'minor': 2,
+                    'meaningful': 3,
+                    'major': 4,
+                    'market_leadership': 5
+                }
+            }
+        }
+    },
+    'scalability_potential': {
+        'section': 'scalability',
+        'fields': {
+            'reusability': {
+                'default': 'single_use',
+                'fallback': 1,
+                'scores': {
+                    'single_use': 1,
+                    'few_similar': 2,
+                    'multiple_related': 3,
+                    'cross_functional': 4,
+                    'platform_potential': 5
+                }
+            },
+            'extension_capability': {
+                'default': 'difficult',
+                'fallback': 1,
+                'scores': {
+                    'difficult': 1,
+                    'minor_possible': 2,
+                    'moderate_capable': 3,
+                    'high_capable': 4,
+                    'exponential_scaling': 5
+                }
+            },
+            'monetization_potential': {
+                'default': 'no_external',
+                'fallback': 1,
+                'scores': {
+                    'no_external': 1,
+                    'limited_interest': 2,
+                    'some_applications': 3,
+                    'good_market': 4,
+                    'high_monetization': 5
+                }
+            }
+        }
+    },
+    'implementation_timeline': {
+        'section': 'timeline',
+        'fields': {
+            'development_cycle': {
+                'default': 'standard',
+                'fallback': 3,
+                'scores': {
+                    'immediate': 5,
+                    'rapid': 4,
+                    'standard': 3,
+                    'long': 2,
+                    'extended': 1
+                }
+            },
+            'deployment_complexity': {
+                'default': 'phased',
+                'fallback': 3,
+                'scores': {
+                    'instant': 5,
+                    'quick': 4,
+                    'phased': 3,
+                    'gradual': 2,
+                    'complex': 1
+                }
+            },
+            'validation_requirements': {
+                'default': 'normal',
+                'fallback': 3,
+                'scores': {
+                    'none': 5,
+                    'minimal': 4,
+                    'normal': 3,
+                    'standard': 2,
+                    'extensive': 1
+                }
+            }
+        }
+    }
+}
+
+class CategoricalField(NamedTuple):
+    """A compiled categorical rubric field."""
+    name: str
+    default: object
+    scores: Mapping
+    fallback: int
+    lookup: Callable
+
+
+class LadderField(NamedTuple):
+    """A compiled numeric rubric field: points[search(breakpoints, value)]."""
+    name: str
+    default: object
+    breakpoints: Tuple
+    points: Tuple
+    side: str
+    search: Callable
+    unordered: int
+
+    def score(self, value) -> int:
+        """Points for one value; NaN takes the ladder's fall-through points."""
+        if value != value:
+            return self.unordered
+        return self.points[self.search(self.breakpoints, value)]
+
+
+class RubricDimension(NamedTuple):
+    """A compiled dimension: its criteria section and field rules."""
+    section: str
+    categorical: Tuple[CategoricalField, ...]
+    ladders: Tuple[LadderField, ...]
+
+
+def compile_rubric(rubric: Dict) -> Mapping:
+    """Compile a RUBRIC-shaped dict into immutable lookup structures.
+
+    Categorical maps become read-only mappings and ladders become sorted
+    breakpoint tuples searched with bisect, so scoring allocates nothing.
+    """
+    compiled = {}
+    for dimension, spec in rubric.items():
+        categorical = []
+        ladders = []
+        for name, rule in spec['fields'].items():
+            if 'scores' in rule:
+                scores = dict(rule['scores'])
+                categorical.append(CategoricalField(
+                    name, rule['default'], MappingProxyType(scores),
+                    rule['fallback'], scores.get
+                ))
+                continue
+            
+            breakpoints = tuple(rule['breakpoints'])
+            points = tuple(rule['points'])
+            side = rule['side']
+            if list(breakpoints) != sorted(breakpoints):
+                raise ValueError(f"{dimension}.{name}: breakpoints must be sorted")
+            if len(points) != len(breakpoints) + 1:
+                raise ValueError(f"{dimension}.{name}: need one more point than breakpoints")
+            if side not in ('left', 'right'):
+                raise ValueError(f"{dimension}.{name}: side must be 'left' or 'right'")
+            ladders.append(LadderField(
+                name, rule['default'], breakpoints, points, side,
+                bisect_left if side == 'left' else bisect_right,
+                points[-1] if side == 'left' else points[0]
+            ))
+        compiled[dimension] = RubricDimension(
+            spec['section'], tuple(categorical), tuple(ladders)
+        )
+    return MappingProxyType(compiled)
+
+
+_EMPTY_SECTION = MappingProxyType({})
+
+
+class LRUCache:
+    """Bounded least-recently-used cache with hit/miss/eviction counters."""
+    
+    _MISSING = object()
+    
+    def __init__(self, maxsize: int):
+        if maxsize < 1:
+            raise ValueError("cache size must be at least 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._data = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def get(self, key, default=None):
+        """Return the cached value for key, counting a hit or a miss."""
+        value = self._data.get(key, self._MISSING)
+        if value is self._MISSING:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def put(self, key, value):
+        """Store value under key, evicting the least recently used entry."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self):
+        """Drop every entry; counters are kept."""
+        if self._data:
+            self._data.clear()
+            self.invalidations += 1
+    
+    def stats(self) -> Dict:
+        """Return size and counters as a plain dict."""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
 
 class ProjectEvaluator:
     """Deterministic project evaluation calculator."""
     
-    def __init__(self):
+    def __init__(self, cache_size: Optional[int] = None):
         self.weights = {
             'technical_complexity': 0.15,
             'resource_requirements': 0.15, 
@@ -33,237 +412,81 @@ class ProjectEvaluator:
             'scalability_potential': 0.333,
             'implementation_timeline': 0.25
         }
-
-    def score_technical_complexity(self, criteria: Dict) -> int:
-        """Score technical complexity based on objective criteria."""
-        score = 1
         
-        # Technology type
-        tech_scores = {
-            'existing_apis': 1,
-            'minor_customization': 2,
-            'custom_development': 3,
-            'cutting_edge': 4,
-            'experimental': 5
-        }
-        score += tech_scores.get(criteria.get('technology_type', 'existing_apis'), 1)
+        # Field rules compiled once; score_* methods only do lookups
+        self.rubric = compile_rubric(RUBRIC)
         
-        # Integration count
-        integrations = criteria.get('integration_count', 0)
-        if integrations <= 1:
-            score += 1
-        elif integrations <= 2:
-            score += 2
-        elif integrations <= 5:
-            score += 3
-        elif integrations <= 10:
-            score += 4
-        else:
-            score += 5
-            
-        # Team experience percentage
-        experience = criteria.get('team_experience_percent', 100)
-        if experience >= 80:
-            score += 1
-        elif experience >= 60:
-            score += 2
-        elif experience >= 40:
-            score += 3
-        elif experience >= 20:
-            score += 4
-        else:
-            score += 5
-            
+        # Opt-in memoization: dimension scores keyed on the rubric fields of
+        # their section, whole results keyed on all six. Only results depend
+        # on the weights; a weight change re-runs just the aggregation.
+        self.dimension_cache = LRUCache(cache_size) if cache_size else None
+        self.result_cache = LRUCache(cache_size) if cache_size else None
+        self._cached_weights = None
+        self._weights_version = 0
+        self._reaggregations = 0
+        self._build_cache_plan()
+        
+        # Opt-in stage timers; see enable_instrumentation()
+        self.instrumentation = None
+
+    def _build_cache_plan(self):
+        """Per dimension: section, rubric field names and defaults, bound scorer."""
+        self._cache_plan = tuple(
+            (
+                dimension,
+                spec.section,
+                tuple(field.name for field in spec.categorical + spec.ladders),
+                tuple(field.default for field in spec.categorical + spec.ladders),
+                getattr(self, f'score_{dimension}')
+            )
+            for dimension, spec in self.rubric.items()
+        )
+
+    def _score_dimension(self, dimension: str, criteria: Dict) -> int:
+        """Score one dimension with the compiled rubric."""
+        rubric = self.rubric[dimension]
+        get = criteria.get
+        score = 1
+        for name, default, _, fallback, lookup in rubric.categorical:
+            score += lookup(get(name, default), fallback)
+        for name, default, breakpoints, points, _, search, unordered in rubric.ladders:
+            value = get(name, default)
+            # value != value only for NaN
+            score += points[search(breakpoints, value)] if value == value else unordered
         return min(5, max(1, score // 3))
 
+    def score_technical_complexity(self, criteria: Dict) -> int:
+        """Score technical complexity based on objective criteria."""
+        return self._score_dimension('technical_complexity', criteria)
+
     def score_resource_requirements(self, criteria: Dict) -> int:
         """Score resource requirements based on objective criteria."""
-        score = 1
-        
-        # Team size
-        team_size = criteria.get('team_size', 1)
-        if team_size <= 2:
-            score += 1
-        elif team_size <= 4:
-            score += 2
-        elif team_size <= 6:
-            score += 3
-        elif team_size <= 10:
-            score += 4
-        else:
-            score += 5
-            
-        # Infrastructure level
-        infra_scores = {
-            'existing': 1,
-            'minor_additions': 2,
-            'moderate_new': 3,
-            'significant_changes': 4,
-            'major_overhaul': 5
-        }
-        score += infra_scores.get(criteria.get('infrastructure_level', 'existing'), 1)
-        
-        # Expertise requirements
-        expertise_scores = {
-            'current_skills': 1,
-            'minor_training': 2,
-            'some_hiring': 3,
-            'external_expertise': 4,
-            'multiple_specialists': 5
-        }
-        score += expertise_scores.get(criteria.get('expertise_required', 'current_skills'), 1)
-        
-        return min(5, max(1, score // 3))
+        return self._score_dimension('resource_requirements', criteria)
 
     def score_implementation_risk(self, criteria: Dict) -> int:
         """Score implementation risk based on objective criteria."""
-        score = 1
-        
-        # Regulatory requirements
-        regulatory_scores = {
-            'none': 1,
-            'minor': 2,
-            'some': 3,
-            'significant': 4,
-            'heavy': 5
-        }
-        score += regulatory_scores.get(criteria.get('regulatory_level', 'none'), 1)
-        
-        # User adoption challenges
-        adoption_scores = {
-            'high_acceptance': 1,
-            'good_buyin': 2,
-            'moderate_change': 3,
-            'substantial_resistance': 4,
-            'high_resistance': 5
-        }
-        score += adoption_scores.get(criteria.get('user_adoption', 'high_acceptance'), 1)
-        
-        # External dependencies
-        dependencies = criteria.get('external_dependencies_count', 0)
-        if dependencies == 0:
-            score += 1
-        elif dependencies <= 2:
-            score += 2
-        elif dependencies <= 5:
-            score += 3
-        elif dependencies <= 10:
-            score += 4
-        else:
-            score += 5
-            
-        return min(5, max(1, score // 3))
+        return self._score_dimension('implementation_risk', criteria)
 
     def score_business_impact(self, criteria: Dict) -> int:
         """Score business impact based on objective criteria."""
-        score = 1
-        
-        # Operational improvement level
-        improvement_scores = {
-            'minimal': 1,
-            'modest': 2,
-            'noticeable': 3,
-            'significant': 4,
-            'revolutionary': 5
-        }
-        score += improvement_scores.get(criteria.get('operational_improvement', 'minimal'), 1)
-        
-        # Impact scope
-        scope_scores = {
-            'single_team': 1,
-            'department': 2,
-            'multi_department': 3,
-            'organization_wide': 4,
-            'industry_level': 5
-        }
-        score += scope_scores.get(criteria.get('impact_scope', 'single_team'), 1)
-        
-        # Competitive advantage
-        competitive_scores = {
-            'none': 1,
-            'minor': 2,
-            'meaningful': 3,
-            'major': 4,
-            'market_leadership': 5
-        }
-        score += competitive_scores.get(criteria.get('competitive_advantage', 'none'), 1)
-        
-        return min(5, max(1, score // 3))
+        return self._score_dimension('business_impact', criteria)
 
     def score_scalability_potential(self, criteria: Dict) -> int:
         """Score scalability potential based on objective criteria."""
-        score = 1
-        
-        # Reusability
-        reuse_scores = {
-            'single_use': 1,
-            'few_similar': 2,
-            'multiple_related': 3,
-            'cross_functional': 4,
-            'platform_potential': 5
-        }
-        score += reuse_scores.get(criteria.get('reusability', 'single_use'), 1)
-        
-        # Extension capabilities
-        extension_scores = {
-            'difficult': 1,
-            'minor_possible': 2,
-            'moderate_capable': 3,
-            'high_capable': 4,
-            'exponential_scaling': 5
-        }
-        score += extension_scores.get(criteria.get('extension_capability', 'difficult'), 1)
-        
-        # External monetization
-        monetization_scores = {
-            'no_external': 1,
-            'limited_interest': 2,
-            'some_applications': 3,
-            'good_market': 4,
-            'high_monetization': 5
-        }
-        score += monetization_scores.get(criteria.get('monetization_potential', 'no_external'), 1)
-        
-        return min(5, max(1, score // 3))
+        return self._score_dimension('scalability_potential', criteria)
 
     def score_implementation_timeline(self, criteria: Dict) -> int:
         """Score implementation timeline based on objective criteria."""
-        score = 1
-        
-        # Development cycle (inverted scoring - faster is better)
-        cycle_scores = {
-            'immediate': 5,
-            'rapid': 4,
-            'standard': 3,
-            'long': 2,
-            'extended': 1
-        }
-        score += cycle_scores.get(criteria.get('development_cycle', 'standard'), 3)
-        
-        # Deployment complexity (inverted scoring)
-        deployment_scores = {
-            'instant': 5,
-            'quick': 4,
-            'phased': 3,
-            'gradual': 2,
-            'complex': 1
-        }
-        score += deployment_scores.get(criteria.get('deployment_complexity', 'phased'), 3)
-        
-        # Validation requirements (inverted scoring)
-        validation_scores = {
-            'none': 5,
-            'minimal': 4,
-            'normal': 3,
-            'standard': 2,
-            'extensive': 1
-        }
-        score += validation_scores.get(criteria.get('validation_requirements', 'normal'), 3)
-        
-        return min(5, max(1, score // 3))
+        return self._score_dimension('implementation_timeline', criteria)
 
     def evaluate_project(self, criteria: Dict) -> Dict:
         """Evaluate a project and return scores."""
+        if self.result_cache is not None:
+            return self._evaluate_cached(criteria)
+        return self._evaluate_uncached(criteria)
+
+    def _evaluate_uncached(self, criteria: Dict) -> Dict:
+        """Score all six dimensions and aggregate them."""
         
         # Calculate dimension scores
         scores = {
@@ -275,41 +498,131 @@ class ProjectEvaluator:
             'implementation_timeline': self.score_implementation_timeline(criteria.get('timeline', {}))
         }
         
-        # Calculate weighted scores
-        weighted_scores = {
-            dim: score * self.weights[dim] 
-            for dim, score in scores.items()
-        }
+        return self.aggregate_scores(scores)
+
+    def _evaluate_cached(self, criteria: Dict) -> Dict:
+        """evaluate_project() through the dimension and result caches."""
+        self._check_cached_weights()
         
-        # Calculate risk and value scores
-        risk_score = (
+        # Canonical key per dimension: its rubric fields with defaults applied,
+        # so extra keys and explicit defaults don't fragment the cache
+        keys = tuple([
+            (dimension, tuple(map(criteria.get(section, _EMPTY_SECTION).get, names, defaults)))
+            for dimension, section, names, defaults, _ in self._cache_plan
+        ])
+        try:
+            hash(keys)
+        except TypeError:
+            # Unhashable criteria values can't be cached; score them directly
+            keys = None
+        if keys is None:
+            return self._evaluate_uncached(criteria)
+        
+        # Result entries are [weights_version, result]; a stale entry keeps
+        # its dimension scores and only the weighted aggregation is redone
+        entry = self.result_cache.get(keys)
+        if entry is None:
+            scores = {}
+            for key, (dimension, section, _, _, scorer) in zip(keys, self._cache_plan):
+                score = self.dimension_cache.get(key)
+                if score is None:
+                    score = scorer(criteria.get(section, {}))
+                    self.dimension_cache.put(key, score)
+                scores[dimension] = score
+            entry = [self._weights_version, self.aggregate_scores(scores)]
+            self.result_cache.put(keys, entry)
+        elif entry[0] != self._weights_version:
+            entry[1] = self.aggregate_scores(dict(entry[1]['dimension_scores']))
+            entry[0] = self._weights_version
+            self._reaggregations += 1
+        result = entry[1]
+        
+        # Hand out copies so callers can't mutate cached entries
+        return {
+            **result,
+            'dimension_scores': result['dimension_scores'].copy(),
+            'weighted_scores': result['weighted_scores'].copy()
+        }
+
+    def _check_cached_weights(self):
+        """Mark cached results stale if any weight table changed since last call."""
+        current = (self.weights, self.risk_weights, self.value_weights)
+        if self._cached_weights != current:
+            self._cached_weights = tuple(dict(weights) for weights in current)
+            self._weights_version += 1
+
+    def clear_cache(self):
+        """Empty both evaluation caches (no-op when caching is off)."""
+        if self.result_cache is not None:
+            self.dimension_cache.clear()
+            self.result_cache.clear()
+
+    def cache_stats(self) -> Optional[Dict]:
+        """Counters for both cache levels, or None when caching is off."""
+        if self.result_cache is None:
+            return None
+        return {
+            'dimension': self.dimension_cache.stats(),
+            'result': {
+                **self.result_cache.stats(),
+                'reaggregations': self._reaggregations,
+                'weights_version': self._weights_version
+            }
+        }
+
+    def calculate_risk_score(self, scores: Dict) -> float:
+        """Combine the risk dimensions into an (unrounded) risk score."""
+        return (
             scores['technical_complexity'] * self.risk_weights['technical_complexity'] +
             scores['resource_requirements'] * self.risk_weights['resource_requirements'] +
             scores['implementation_risk'] * self.risk_weights['implementation_risk']
         )
-        
-        value_score = (
+
+    def calculate_value_score(self, scores: Dict) -> float:
+        """Combine the value dimensions into an (unrounded) value score."""
+        return (
             scores['business_impact'] * self.value_weights['business_impact'] +
             scores['scalability_potential'] * self.value_weights['scalability_potential'] +
             scores['implementation_timeline'] * self.value_weights['implementation_timeline']
         )
-        
-        # Calculate final score
-        final_score = (value_score * 0.6) - (risk_score * 0.4)
-        
-        # Determine priority
+
+    def calculate_final_score(self, value_score: float, risk_score: float) -> float:
+        """Combine value and risk into the (unrounded) final score."""
+        return (value_score * 0.6) - (risk_score * 0.4)
+
+    def classify_priority(self, value_score: float, risk_score: float) -> str:
+        """Map value and risk scores onto one of PRIORITY_LEVELS."""
         if value_score >= 4.0 and risk_score <= 2.5:
-            priority = "Priority 1 - Immediate implementation"
+            return PRIORITY_LEVELS[0]
         elif value_score >= 4.0 and risk_score <= 3.5:
-            priority = "Priority 2 - Detailed planning required"
+            return PRIORITY_LEVELS[1]
         elif value_score >= 4.0:
-            priority = "Priority 2 - Risk mitigation planning"
+            return PRIORITY_LEVELS[2]
         elif value_score >= 3.0 and risk_score <= 2.5:
-            priority = "Priority 3 - Quick wins consideration"
+            return PRIORITY_LEVELS[3]
         elif value_score >= 3.0:
-            priority = "Priority 4 - Defer pending improvements"
+            return PRIORITY_LEVELS[4]
         else:
-            priority = "Priority 4 - Reject or major redesign"
+            return PRIORITY_LEVELS[5]
+
+    def aggregate_scores(self, scores: Dict) -> Dict:
+        """Turn six dimension scores into the full evaluation result."""
+        
+        # Calculate weighted scores
+        weighted_scores = {
+            dim: score * self.weights[dim] 
+            for dim, score in scores.items()
+        }
+        
+        # Calculate risk and value scores
+        risk_score = self.calculate_risk_score(scores)
+        value_score = self.calculate_value_score(scores)
+        
+        # Calculate final score
+        final_score = self.calculate_final_score(value_score, risk_score)
+        
+        # Determine priority
+        priority = self.classify_priority(value_score, risk_score)
         
         return {
             'dimension_scores': scores,
@@ -320,7 +633,95 @@ class ProjectEvaluator:
             'priority': priority
         }
 
-def main():
+    def evaluate_compact(self, criteria: Dict) -> 'ScoreRecord':
+        """evaluate_project() returning a slotted scoring_records.ScoreRecord.
+
+        The record converts to the usual dict with to_dict(); all records
+        from this evaluator share one snapshot of its weights.
+        """
+        from scoring_records import Priority, ScoreRecord, pack_scores
+        self._check_cached_weights()
+        
+        scores = {
+            dimension: scorer(criteria.get(section, _EMPTY_SECTION))
+            for dimension, section, _, _, scorer in self._cache_plan
+        }
+        risk_score = self.calculate_risk_score(scores)
+        value_score = self.calculate_value_score(scores)
+        return ScoreRecord(
+            pack_scores(scores.values()),
+            round(risk_score, 2),
+            round(value_score, 2),
+            round(self.calculate_final_score(value_score, risk_score), 2),
+            Priority.from_label(self.classify_priority(value_score, risk_score)),
+            self._cached_weights[0]
+        )
+
+    def evaluate_batch(self, criteria) -> 'BatchResult':
+        """Evaluate many projects at once with the vectorized NumPy engine.
+
+        Accepts a list of criteria dicts, a columnar mapping of dotted
+        field names (e.g. 'technical.integration_count') to arrays, or a
+        scoring_store.CriteriaStore, and returns a scoring_batch.BatchResult whose rows equal evaluate_project.
+        """
+        from scoring_batch import evaluate_batch
+        return evaluate_batch(self, criteria)
+
+    def evaluate_parallel(self, criteria, workers: Optional[int] = None,
+                          chunk_size: int = 1000):
+        """Evaluate an iterable of criteria dicts across worker processes.
+
+        Results are yielded in input order; every worker uses this
+        evaluator's weights. See scoring_parallel.evaluate_parallel().
+        """
+        from scoring_parallel import evaluate_parallel
+        return evaluate_parallel(criteria, workers, chunk_size, evaluator=self)
+
+    def evaluate_uncertain(self, criteria: Dict, draws: int = 10000,
+                           seed: int = 42) -> 'UncertaintyResult':
+        """Monte Carlo evaluation of criteria holding distributions.
+
+        Fields may be given as {'range': ...}, {'triangular': ...},
+        {'normal': ...} or {'choices': ...}; returns the sampled risk,
+        value and final score distributions and the probability of each
+        priority. See scoring_uncertainty for the spec format.
+        """
+        from scoring_uncertainty import evaluate_uncertain
+        return evaluate_uncertain(self, criteria, draws, seed)
+
+    def evaluate_incremental(self, records, store_path: str, id_key: str = 'id',
+                             prune: bool = True) -> 'DeltaReport':
+        """Score a full snapshot of records, re-evaluating only changed projects.
+
+        Results persist in the SQLite store at store_path with a hash of each
+        project's criteria and a fingerprint of this evaluator's rubric and
+        weights; see scoring_incremental.IncrementalScorer.
+        """
+        from scoring_incremental import IncrementalScorer
+        with IncrementalScorer(store_path, self) as scorer:
+            return scorer.run(records, id_key, prune)
+
+    def enable_instrumentation(self, sample_every: int = 100,
+                               sample_size: int = 10000) -> 'Instrumentation':
+        """Start per-stage call counters and timers on this evaluator.
+
+        Returns the scoring_instrumentation.Instrumentation collecting them;
+        evaluators that never call this pay nothing.
+        """
+        if self.instrumentation is None:
+            from scoring_instrumentation import Instrumentation
+            self.instrumentation = Instrumentation(self, sample_every, sample_size)
+        self.instrumentation.install()
+        return self.instrumentation
+
+    def disable_instrumentation(self) -> Optional['Instrumentation']:
+        """Remove the stage timers; returns the collector with its final counts."""
+        instrumentation, self.instrumentation = self.instrumentation, None
+        if instrumentation is not None:
+            instrumentation.uninstall()
+        return instrumentation
+
+def print_example():
     """Example usage of the evaluator."""
     evaluator = ProjectEvaluator()
     
@@ -374,5 +775,149 @@ def main():
     print(f"Final Score: {result['final_score']}")
     print(f"Priority: {result['priority']}")
 
+def _parse_args(argv: List[str]):
+    """Parse CLI arguments; a lone input path (or none) skips argparse.
+
+    Importing argparse, and the re, gettext and locale modules it pulls in,
+    costs more than scoring a file of a few records, so the plain
+    'scoring_calculator.py FILE' call made from hooks and scripts is
+    recognised by hand.
+    """
+    if len(argv) <= 1 and not any(arg.startswith('-') and arg != '-' for arg in argv):
+        return SimpleNamespace(
+            input=argv[0] if argv else None, format=None, output=None, chunk_size=1000,
+            workers=1, rubric=None, metrics=None, example=False
+        )
+    
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Deterministic AI project scoring",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Show the built-in example evaluation
+  python scoring_calculator.py --example
+  
+  # Score JSON Lines criteria, one result per line
+  python scoring_calculator.py criteria.jsonl > scores.jsonl
+  
+  # Score CSV with dotted columns (technical.integration_count, ...)
+  cat criteria.csv | python scoring_calculator.py --format csv > scores.csv
+  
+  # Use every core
+  python scoring_calculator.py archive.jsonl --workers 0 -o scores.jsonl
+  
+  # Score with a rubric template (see scoring_rubric.py export)
+  python scoring_calculator.py criteria.jsonl --rubric rubric-v2.json
+  
+  # Time each stage and export Prometheus metrics
+  python scoring_calculator.py criteria.jsonl -o scores.jsonl --metrics scoring.prom
+        """
+    )
+    
+    parser.add_argument(
+        "input",
+        nargs="?",
+        help="Criteria file (.jsonl or .csv); '-' or omitted reads stdin"
+    )
+    
+    parser.add_argument(
+        "--format",
+        choices=["jsonl", "csv"],
+        help="Record format (default: from file extension, else jsonl)"
+    )
+    
+    parser.add_argument(
+        "--output", "-o",
+        help="Write results to this file instead of stdout"
+    )
+    
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=1000,
+        help="Records per output write (default: 1000)"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes; 0 uses every core (default: 1)"
+    )
+    
+    parser.add_argument(
+        "--rubric",
+        metavar="TEMPLATE",
+        help="Score with a JSON rubric template instead of the built-in rules"
+    )
+    
+    parser.add_argument(
+        "--metrics",
+        metavar="FILE",
+        help="Time each scoring stage and write Prometheus metrics to FILE "
+             "(single worker only)"
+    )
+    
+    parser.add_argument(
+        "--example",
+        action="store_true",
+        help="Print the built-in example evaluation and exit"
+    )
+    
+    args = parser.parse_args(argv)
+    if args.metrics and args.workers != 1:
+        # Stages run inside the worker processes, out of the parent's timers
+        parser.error("--metrics needs --workers 1")
+    return args
+
+def main():
+    """Score criteria records from a file or stdin, or show the example."""
+    args = _parse_args(sys.argv[1:])
+    
+    if args.example or (args.input is None and sys.stdin.isatty()):
+        print_example()
+        return
+    
+    from scoring_stream import detect_format, score_stream
+    
+    reading_stdin = args.input in (None, '-')
+    fmt = args.format or ('jsonl' if reading_stdin else detect_format(args.input))
+    
+    try:
+        source = sys.stdin if reading_stdin else open(args.input, newline='')
+        sink = open(args.output, 'w', newline='') if args.output else sys.stdout
+        start = time.perf_counter()
+        try:
+            if args.rubric:
+                from scoring_rubric import load_rubric
+                evaluator = load_rubric(args.rubric).evaluator()
+            else:
+                evaluator = ProjectEvaluator()
+            if args.workers == 1:
+                if args.metrics:
+                    evaluator.enable_instrumentation()
+                count = score_stream(evaluator, source, sink, fmt, args.chunk_size)
+                if args.metrics:
+                    evaluator.instrumentation.write_prometheus(args.metrics)
+            else:
+                from scoring_parallel import score_stream_parallel
+                count = score_stream_parallel(source, sink, fmt, args.chunk_size,
+                                              workers=args.workers or None,
+                                              evaluator=evaluator)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+            if sink is not sys.stdout:
+                sink.close()
+    except (OSError, ValueError, TypeError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"✅ Scored {count} records in {elapsed:.2f}s ({rate:,.0f} records/sec)",
+          file=sys.stderr)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
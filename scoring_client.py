@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Scoring Client
+
+Thin client for scoring_daemon.py. It imports nothing beyond os, select,
+sys and the C-level _socket (the socket module's enum and selectors
+imports cost more than the rest of the call), so a call costs little more
+than starting the interpreter. The criteria file (or stdin) is streamed to
+the warm daemon and the results are copied to stdout as they arrive. When no daemon is listening
+it runs scoring_calculator's CLI in-process instead, so it can stand in
+for scoring_calculator.py in hooks and scripts.
+
+The socket is $PROJECT_EVAL_SOCKET, else project-eval-<uid>.sock in
+$XDG_RUNTIME_DIR or /tmp.
+
+The request starts with a NUL byte and the record format ("\\0csv\\n"),
+chosen as scoring_calculator.py chooses it: --format, else the file
+extension, else JSON Lines. The daemon then ends its reply with a status
+line, "\\0ok\\n" or "\\0error: <message>\\n", which the client holds back.
+
+Usage:
+    python scoring_client.py [criteria.jsonl | -] [-o scores.jsonl] [--format csv]
+"""
+
+import os
+import select
+import sys
+from _socket import AF_UNIX, SHUT_WR, SOCK_STREAM, socket
+
+CHUNK_BYTES = 1 << 16
+FORMATS = ('jsonl', 'csv')
+
+# Starts the request header and the reply's status line
+FRAME = b'\0'
+OK = FRAME + b'ok\n'
+ERROR = FRAME + b'error: '
+
+
+def default_socket_path() -> str:
+    """The daemon socket: $PROJECT_EVAL_SOCKET or a per-user default."""
+    path = os.environ.get('PROJECT_EVAL_SOCKET')
+    if path:
+        return path
+    directory = os.environ.get('XDG_RUNTIME_DIR') or '/tmp'
+    return os.path.join(directory, f"project-eval-{os.getuid()}.sock")
+
+
+def connect(path: str = None):
+    """A socket connected to the daemon, or None if none is listening."""
+    sock = socket(AF_UNIX, SOCK_STREAM)
+    try:
+        sock.connect(path or default_socket_path())
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def exchange(sock, source_fd: int, sink_fd: int, fmt: str = 'jsonl') -> bytes:
+    """Stream source to the daemon while copying its replies to sink.
+
+    Sending and receiving are interleaved so neither side blocks on a full
+    socket buffer. The reply's last line is held back and returned: it is
+    the daemon's status line.
+    """
+    pending = FRAME + fmt.encode() + b'\n'
+    sending = True
+    tail = bytearray()
+    while True:
+        readable, writable, _ = select.select([sock], [sock] if sending else [], [])
+        if writable:
+            if not pending:
+                pending = os.read(source_fd, CHUNK_BYTES)
+                if not pending:
+                    sock.shutdown(SHUT_WR)
+                    sending = False
+                    continue
+            pending = pending[sock.send(pending):]
+        if readable:
+            data = sock.recv(CHUNK_BYTES)
+            if not data:
+                return bytes(tail)
+            tail += data
+            cut = tail.rfind(b'\n', 0, len(tail) - 1)
+            if cut >= 0:
+                _write_all(sink_fd, tail[:cut + 1])
+                del tail[:cut + 1]
+
+
+def _write_all(fd: int, data):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _parse_args(argv):
+    """[input] [-o OUTPUT] [--format FORMAT]; None if argv asks for anything else."""
+    inputs = []
+    output = None
+    fmt = None
+    arguments = iter(argv)
+    for arg in arguments:
+        if arg in ('-o', '--output'):
+            output = next(arguments, None)
+            if output is None:
+                return None
+        elif arg == '--format' or arg.startswith('--format='):
+            fmt = arg.partition('=')[2] or next(arguments, None)
+            if fmt not in FORMATS:
+                return None
+        elif arg.startswith('-') and arg != '-':
+            return None
+        else:
+            inputs.append(arg)
+    if len(inputs) > 1:
+        return None
+    source = inputs[0] if inputs else '-'
+    if fmt is None:
+        # scoring_calculator's rule: stdin is JSON Lines, files go by extension
+        fmt = 'csv' if source != '-' and source.lower().endswith('.csv') else 'jsonl'
+    return source, output, fmt
+
+
+def main():
+    """Score through the daemon, or in-process when it isn't running."""
+    argv = sys.argv[1:]
+    parsed = _parse_args(argv)
+    sock = connect() if parsed else None
+    if sock is None:
+        import scoring_calculator
+        sys.argv = ['scoring_calculator.py'] + argv
+        scoring_calculator.main()
+        return
+
+    source, output, fmt = parsed
+    try:
+        source_fd = sys.stdin.fileno() if source == '-' else os.open(source, os.O_RDONLY)
+        sink_fd = os.open(output, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644) \
+            if output else sys.stdout.fileno()
+        try:
+            last = exchange(sock, source_fd, sink_fd, fmt)
+        finally:
+            sock.close()
+    except OSError as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if last != OK:
+        if last.startswith(ERROR):
+            message = last[len(ERROR):].decode('utf-8', 'replace').strip()
+        else:
+            message = "the scoring daemon closed the connection before finishing"
+        print(f"❌ Error: {message}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
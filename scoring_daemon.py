@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Warm Scoring Daemon
+
+Keeps one Python process, its imports done, listening on a Unix socket so
+shell scripts and Git hooks don't pay interpreter start-up on every call.
+A connection is one request: the client sends a header line naming the
+record format after a NUL byte ("\\0csv\\n" or "\\0jsonl\\n"; without it the
+records are read as JSON Lines), then the criteria records, and shuts
+down its write side. The daemon streams results back in the same format,
+exactly as scoring_calculator.py would print them, and closes. A request
+with a header line always gets a status line last, "\\0ok\\n" or
+"\\0error: <message>\\n", so a reply can't be mistaken for a failure
+whatever its records hold. Without a header only a failure adds one.
+
+Connections are served on threads, each with its own evaluator. With
+--rubric the template is re-read through load_rubric()'s disk cache per
+connection, so edits take effect without a restart.
+
+The protocol needs no Python on the client side at all:
+
+    socat -t 30 - UNIX-CONNECT:$PROJECT_EVAL_SOCKET < criteria.jsonl
+    { printf '\\0csv\\n'; cat criteria.csv; } | socat -t 30 - UNIX-CONNECT:$PROJECT_EVAL_SOCKET
+
+scoring_client.py does the same from Python with minimal imports and falls
+back to in-process scoring when the daemon is down.
+
+Usage:
+    python scoring_daemon.py [--socket PATH] [--rubric TEMPLATE] &
+    python scoring_client.py criteria.jsonl > scores.jsonl
+"""
+
+import argparse
+import io
+import os
+import signal
+import socketserver
+import sys
+import threading
+
+from scoring_calculator import ProjectEvaluator
+from scoring_client import FRAME, connect, default_socket_path
+from scoring_stream import FORMATS, score_stream
+
+
+class _ScoringHandler(socketserver.StreamRequestHandler):
+    """Score one request stream."""
+
+    def handle(self):
+        server = self.server
+        sink = io.TextIOWrapper(self.wfile, encoding='utf-8', newline='')
+        framed = self.rfile.peek(1)[:1] == FRAME
+        status = 'ok'
+        try:
+            fmt = 'jsonl'
+            if framed:
+                fmt = self.rfile.readline()[len(FRAME):].decode('latin-1').strip()
+                if fmt not in FORMATS:
+                    raise ValueError(f"unknown format {fmt!r}, expected one of {FORMATS}")
+            source = io.TextIOWrapper(self.rfile, encoding='utf-8', newline='')
+            count = score_stream(server.evaluator(), source, sink, fmt, server.chunk_size)
+            server.count(count)
+        except Exception as e:
+            # Whatever went wrong, the client gets an answer and the daemon lives on
+            status = 'error: ' + (' '.join(str(e).split()) or type(e).__name__)
+        if framed or status != 'ok':
+            sink.write(f"{FRAME.decode()}{status}\n")
+        try:
+            sink.flush()
+        except OSError:
+            pass
+
+
+class ScoringDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server holding the warm scoring modules."""
+
+    daemon_threads = True
+
+    def __init__(self, path: str, rubric: str = None, chunk_size: int = 1000):
+        self.path = path
+        self.rubric = rubric
+        self.chunk_size = chunk_size
+        self.requests = 0
+        self.records = 0
+        self._lock = threading.Lock()
+        # Fail now, not on the first request, if the template is bad
+        self.evaluator()
+        super().__init__(path, _ScoringHandler)
+
+    def evaluator(self) -> ProjectEvaluator:
+        if self.rubric:
+            from scoring_rubric import load_rubric
+            return load_rubric(self.rubric).evaluator()
+        return ProjectEvaluator()
+
+    def count(self, records: int):
+        with self._lock:
+            self.requests += 1
+            self.records += records
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def serve(path: str, rubric: str = None, chunk_size: int = 1000):
+    """Serve until SIGINT/SIGTERM; refuses a socket another daemon answers on."""
+    sock = connect(path)
+    if sock is not None:
+        sock.close()
+        raise ValueError(f"a daemon is already listening on {path}")
+    if os.path.exists(path):
+        os.remove(path)
+
+    daemon = ScoringDaemon(path, rubric, chunk_size)
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=daemon.shutdown).start())
+    print(f"✅ Scoring daemon listening on {path}", file=sys.stderr)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.server_close()
+    print(f"📊 Served {daemon.requests} requests, {daemon.records} records", file=sys.stderr)
+
+
+def main():
+    """Run the daemon in the foreground."""
+    parser = argparse.ArgumentParser(description="Warm scoring daemon on a Unix socket")
+    parser.add_argument("--socket", default=default_socket_path(),
+                        help="Socket path (default: $PROJECT_EVAL_SOCKET or a per-user path)")
+    parser.add_argument("--rubric", metavar="TEMPLATE",
+                        help="Score with a JSON rubric template instead of the built-in rules")
+    parser.add_argument("--chunk-size", type=int, default=1000,
+                        help="Records per reply write (default: 1000)")
+    args = parser.parse_args()
+
+    try:
+        serve(args.socket, args.rubric, args.chunk_size)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Columnar Portfolio Export
+
+Writes scored portfolios as one columnar file for notebooks and dashboards:
+an optional id column, the six dimension scores as uint8 columns,
+risk/value/final as float64, priority as a categorical (uint8 codes over
+PRIORITY_LEVELS) and any passthrough string columns. Weighted scores are
+not stored; the weights go into the file metadata and are re-applied on
+read.
+
+Formats:
+    arrow    Arrow IPC file (.arrow/.feather), needs pyarrow
+    parquet  Parquet (.parquet), needs pyarrow
+    npz      NumPy .npz (.npz), no extra dependency
+
+Without pyarrow, arrow and parquet requests fall back to .npz next to the
+requested path. Arrow and .npz files are read back memory-mapped and
+zero-copy; the .npz members are stored uncompressed with their data
+64-byte aligned, so read_portfolio() maps them straight out of the zip
+while np.load() still reads the file normally. Parquet is decoded on read.
+
+Usage:
+    python scoring_export.py criteria.jsonl -o portfolio.arrow --keep department name
+    python scoring_export.py --read portfolio.npz
+"""
+
+import argparse
+import csv
+import io
+import json
+import struct
+import sys
+import time
+import zipfile
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from scoring_calculator import DIMENSIONS, PRIORITY_LEVELS, ProjectEvaluator
+
+FORMATS = ('arrow', 'parquet', 'npz')
+EXTENSIONS = {'.arrow': 'arrow', '.feather': 'arrow', '.ipc': 'arrow',
+              '.parquet': 'parquet', '.npz': 'npz'}
+EXPORT_VERSION = 1
+METADATA_KEY = 'project_eval'
+SCORE_COLUMNS = ('risk_score', 'value_score', 'final_score')
+
+# Data alignment of .npz members, as Arrow aligns its buffers
+_ALIGN = 64
+_PADDING_FIELD = 0x7064  # private zip extra-field id used for padding
+
+
+def _pyarrow():
+    """The pyarrow modules, or None when pyarrow is not installed."""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def detect_format(path: str) -> str:
+    """Format from the file extension; .npz when unknown."""
+    return EXTENSIONS.get(Path(path).suffix.lower(), 'npz')
+
+
+class ColumnCollector:
+    """Accumulates batch results chunk by chunk into export columns."""
+
+    def __init__(self, keep: Sequence[str] = (), with_ids: bool = True):
+        self.keep = tuple(keep)
+        self.with_ids = with_ids
+        self._chunks: Dict[str, List] = {}
+        self._strings: Dict[str, List[str]] = {name: [] for name in self.keep}
+        if with_ids:
+            self._strings['id'] = []
+
+    def __len__(self) -> int:
+        return sum(len(chunk) for chunk in self._chunks.get('priority', ()))
+
+    def add(self, batch, ids: Sequence = None, extra: Dict[str, Sequence] = None):
+        """Append a scoring_batch.BatchResult with its ids and passthrough values."""
+        for dim in DIMENSIONS:
+            self._chunks.setdefault(dim, []).append(batch.dimension_scores[dim].astype(np.uint8))
+        for name in SCORE_COLUMNS:
+            self._chunks.setdefault(name, []).append(np.asarray(getattr(batch, name), dtype=np.float64))
+        self._chunks.setdefault('priority', []).append(batch.priority_codes.astype(np.uint8))
+        if self.with_ids:
+            if ids is None or len(ids) != len(batch):
+                raise ValueError("one id per result is needed")
+            self._strings['id'].extend('' if value is None else str(value) for value in ids)
+        for name in self.keep:
+            values = (extra or {}).get(name, [None] * len(batch))
+            self._strings[name].extend('' if value is None else str(value) for value in values)
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Export columns in file order: id, dimensions, scores, priority, extras."""
+        columns = {}
+        if self.with_ids:
+            columns['id'] = np.array(self._strings['id'], dtype=str)
+        for name in DIMENSIONS + SCORE_COLUMNS + ('priority',):
+            chunks = self._chunks.get(name)
+            dtype = np.float64 if name in SCORE_COLUMNS else np.uint8
+            columns[name] = np.concatenate(chunks) if chunks else np.zeros(0, dtype=dtype)
+        for name in self.keep:
+            columns[name] = np.array(self._strings[name], dtype=str)
+        return columns
+
+
+def _metadata(columns: Dict[str, np.ndarray], weights: Dict[str, float]) -> Dict:
+    return {
+        'version': EXPORT_VERSION,
+        'rows': len(columns['priority']),
+        'weights': weights,
+        'priority_categories': list(PRIORITY_LEVELS),
+        'columns': list(columns)
+    }
+
+
+def _write_arrow(path: str, columns: Dict[str, np.ndarray], metadata: Dict, fmt: str, pa):
+    arrays = {}
+    for name, values in columns.items():
+        if name == 'priority':
+            arrays[name] = pa.DictionaryArray.from_arrays(
+                pa.array(values, type=pa.uint8()), pa.array(PRIORITY_LEVELS, type=pa.string())
+            )
+        elif values.dtype.kind == 'U':
+            arrays[name] = pa.array(values.tolist(), type=pa.string())
+        else:
+            arrays[name] = pa.array(values)
+    table = pa.table(arrays).replace_schema_metadata({METADATA_KEY: json.dumps(metadata)})
+    if fmt == 'parquet':
+        pa.parquet.write_table(table, path)
+        return
+    # One record batch, so every column reads back as a single buffer
+    with pa.OSFile(path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=max(1, len(table)))
+
+
+def _write_npz(path: str, columns: Dict[str, np.ndarray], metadata: Dict):
+    """np.savez() layout with stored members whose data is 64-byte aligned."""
+    arrays = dict(columns)
+    arrays['__meta__'] = np.array(json.dumps(metadata))
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for name, values in arrays.items():
+            header = io.BytesIO()
+            np.lib.format.write_array(header, np.ascontiguousarray(values), allow_pickle=False)
+            data = header.getvalue()
+            info = zipfile.ZipInfo(f"{name}.npy", date_time=(1980, 1, 1, 0, 0, 0))
+            info.compress_type = zipfile.ZIP_STORED
+            # The .npy header is padded to a multiple of 64 already; pad the
+            # zip local header so the member starts on a 64-byte boundary
+            start = archive.fp.tell() + 30 + len(info.filename.encode()) + 4
+            padding = -start % _ALIGN
+            info.extra = struct.pack('<HH', _PADDING_FIELD, padding) + bytes(padding)
+            archive.writestr(info, data)
+
+
+def write_columns(path: str, columns: Dict[str, np.ndarray], weights: Dict[str, float],
+                  fmt: str = None) -> str:
+    """Write export columns; returns the path written (.npz if pyarrow is missing)."""
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown format {fmt!r}, expected one of {FORMATS}")
+    metadata = _metadata(columns, dict(weights))
+    if fmt != 'npz':
+        pa = _pyarrow()
+        if pa is not None:
+            _write_arrow(path, columns, metadata, fmt, pa)
+            return path
+        path = str(Path(path).with_suffix('.npz'))
+    _write_npz(path, columns, metadata)
+    return path
+
+
+def export_batch(path: str, batch, weights: Dict[str, float], ids: Sequence = None,
+                 extra: Dict[str, Sequence] = None, fmt: str = None) -> str:
+    """Write one scoring_batch.BatchResult; returns the path written."""
+    collector = ColumnCollector(keep=tuple(extra or ()), with_ids=ids is not None)
+    collector.add(batch, ids, extra)
+    return write_columns(path, collector.columns(), weights, fmt)
+
+
+def export_records(evaluator: ProjectEvaluator, records: Iterable[Dict], path: str,
+                   id_key: Optional[str] = 'id', keep: Sequence[str] = (),
+                   chunk_size: int = 100000, fmt: str = None) -> Tuple[str, int]:
+    """Score criteria records with the batch engine and export the results.
+
+    id_key (None for no id column) and the keep keys are copied from each
+    record as strings. Returns the path written and the row count.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk size must be at least 1")
+    collector = ColumnCollector(keep, with_ids=id_key is not None)
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+        collector.add(
+            evaluator.evaluate_batch(chunk),
+            [record.get(id_key) for record in chunk] if id_key is not None else None,
+            {name: [record.get(name) for record in chunk] for name in keep}
+        )
+    return write_columns(path, collector.columns(), evaluator.weights, fmt), len(collector)
+
+
+def _mmap_npz(path: str) -> Dict[str, np.ndarray]:
+    """Map every stored member of an .npz file without copying it."""
+    arrays = {}
+    mapped = None
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as handle:
+        for info in archive.infolist():
+            name = info.filename[:-4] if info.filename.endswith('.npy') else info.filename
+            if info.compress_type != zipfile.ZIP_STORED:
+                # Compressed members can't be mapped; decode this one
+                arrays[name] = np.load(archive.open(info), allow_pickle=False)
+                continue
+            handle.seek(info.header_offset + 26)
+            name_length, extra_length = struct.unpack('<HH', handle.read(4))
+            handle.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(handle)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(handle)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(handle)
+            if dtype.hasobject:
+                raise ValueError(f"{path}: {name} holds Python objects")
+            count = int(np.prod(shape))
+            if count == 0 or shape == ():
+                arrays[name] = np.ndarray(shape, dtype=dtype, order='F' if fortran else 'C',
+                                          buffer=handle.read(count * dtype.itemsize))
+                continue
+            if mapped is None:
+                mapped = np.memmap(path, dtype=np.uint8, mode='r')
+            arrays[name] = np.ndarray(shape, dtype=dtype, buffer=mapped, offset=handle.tell(),
+                                      order='F' if fortran else 'C')
+    return arrays
+
+
+class PortfolioColumns:
+    """A scored portfolio read back from a columnar export."""
+
+    def __init__(self, columns: Dict[str, np.ndarray], metadata: Dict, strings=None):
+        self.columns = columns
+        self.metadata = metadata
+        self.weights = metadata['weights']
+        self.categories = tuple(metadata['priority_categories'])
+        # Arrow string columns, converted to NumPy only when first used
+        self._strings = strings or {}
+
+    def __len__(self) -> int:
+        return self.metadata['rows']
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns or name in self._strings
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name not in self.columns and name in self._strings:
+            self.columns[name] = self._strings.pop(name).to_numpy(zero_copy_only=False)
+        return self.columns[name]
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.metadata['columns'])
+
+    @property
+    def priority(self) -> np.ndarray:
+        """Priority labels, decoded from the categorical codes."""
+        return np.array(self.categories)[self.columns['priority']]
+
+    def weighted_scores(self, dimension: str) -> np.ndarray:
+        return self.columns[dimension] * self.weights[dimension]
+
+    def row(self, index: int) -> Dict:
+        """One row in the evaluate_project() dict shape, plus id and passthroughs."""
+        scores = {dim: int(self.columns[dim][index]) for dim in DIMENSIONS}
+        result = {name: str(self[name][index]) for name in self.names
+                  if name not in DIMENSIONS + SCORE_COLUMNS + ('priority',)}
+        result.update({
+            'dimension_scores': scores,
+            'weighted_scores': {dim: score * self.weights[dim] for dim, score in scores.items()},
+            'risk_score': float(self.columns['risk_score'][index]),
+            'value_score': float(self.columns['value_score'][index]),
+            'final_score': float(self.columns['final_score'][index]),
+            'priority': self.categories[self.columns['priority'][index]]
+        })
+        return result
+
+
+def read_portfolio(path: str, fmt: str = None) -> PortfolioColumns:
+    """Open an export; arrow and npz columns are memory-mapped, not copied."""
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown format {fmt!r}, expected one of {FORMATS}")
+    if fmt == 'npz':
+        columns = _mmap_npz(path)
+        metadata = json.loads(columns.pop('__meta__').item())
+        return PortfolioColumns(columns, metadata)
+
+    pa = _pyarrow()
+    if pa is None:
+        raise ValueError(f"reading {fmt} files needs pyarrow")
+    if fmt == 'parquet':
+        table = pa.parquet.read_table(path, memory_map=True)
+    else:
+        table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+    metadata = json.loads(table.schema.metadata[METADATA_KEY.encode()])
+    columns = {}
+    strings = {}
+    for name in table.column_names:
+        column = table.column(name)
+        if column.num_chunks != 1:
+            column = column.combine_chunks()
+        else:
+            column = column.chunk(0)
+        if name == 'priority':
+            columns[name] = column.indices.to_numpy(zero_copy_only=True)
+        elif pa.types.is_string(column.type):
+            strings[name] = column
+        else:
+            columns[name] = column.to_numpy(zero_copy_only=True)
+    return PortfolioColumns(columns, metadata, strings)
+
+
+def main():
+    """Export scored criteria to a columnar file, or summarize an export."""
+    parser = argparse.ArgumentParser(description="Columnar export of scored portfolios")
+    parser.add_argument("input", nargs="?", help="Criteria file (.jsonl or .csv)")
+    parser.add_argument("--output", "-o", help="Export file (.arrow, .parquet or .npz)")
+    parser.add_argument("--format", choices=FORMATS, help="Export format (default: from extension)")
+    parser.add_argument("--id-key", default="id", help="Record key for the id column (default: id)")
+    parser.add_argument("--keep", nargs="+", default=[], metavar="KEY",
+                        help="Extra record keys to export as string columns")
+    parser.add_argument("--chunk-size", type=int, default=100000,
+                        help="Records scored per batch (default: 100000)")
+    parser.add_argument("--read", metavar="FILE", help="Open an export and summarize it")
+    args = parser.parse_args()
+
+    if args.read:
+        try:
+            start = time.perf_counter()
+            portfolio = read_portfolio(args.read, args.format)
+            elapsed = time.perf_counter() - start
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+            print(f"❌ Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"📊 {len(portfolio)} rows, columns: {', '.join(portfolio.names)}")
+        codes = np.bincount(portfolio.columns['priority'], minlength=len(portfolio.categories))
+        for label, count in zip(portfolio.categories, codes.tolist()):
+            print(f"  {count:>9}  {label}")
+        print(f"✅ Opened in {elapsed * 1000:.1f}ms", file=sys.stderr)
+        return
+
+    if not args.input or not args.output:
+        parser.error("input and --output are required unless --read is given")
+
+    from scoring_stream import (detect_format as detect_input_format, criteria_sections,
+                                numeric_fields, read_jsonl, records_from_rows)
+
+    evaluator = ProjectEvaluator()
+    try:
+        start = time.perf_counter()
+        with open(args.input, newline='') as source:
+            if detect_input_format(args.input) == 'csv':
+                # Parsed as the scoring CLI parses CSV, blank passthrough cells included
+                records = records_from_rows(csv.DictReader(source), numeric_fields(evaluator),
+                                            sections=criteria_sections(evaluator))
+            else:
+                records = read_jsonl(source)
+            path, count = export_records(evaluator, records, args.output, args.id_key,
+                                         args.keep, args.chunk_size, args.format)
+        elapsed = time.perf_counter() - start
+    except (OSError, ValueError, TypeError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if path != args.output:
+        print("⚠️  pyarrow is not installed; wrote NumPy .npz instead", file=sys.stderr)
+    print(f"✅ Exported {count} rows to {path} in {elapsed:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
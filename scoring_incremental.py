@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Incremental Re-scoring
+
+Keeps the last result of every project in a SQLite store, next to a hash
+of the criteria it was scored from and a fingerprint of the evaluator
+(compiled rubric, weight tables and scoring model). A run hashes the
+rubric fields of each incoming record and re-scores only the projects whose
+hash is new or different, with the batch engine; when the fingerprint
+differs from the stored one, every project is re-scored. JSON Lines input
+also keeps a hash of each raw line, so unchanged lines are not even parsed.
+Each run returns a delta report of the score and priority changes it found.
+
+Usage:
+    python scoring_incremental.py archive.jsonl --store archive.scores.sqlite
+    python scoring_incremental.py archive.jsonl --store s.sqlite --rubric v2.json --report delta.json
+"""
+
+import argparse
+import hashlib
+import json
+import marshal
+import sqlite3
+import sys
+import time
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+import numpy as np
+
+from scoring_calculator import DIMENSIONS, PRIORITY_LEVELS, ProjectEvaluator
+from scoring_records import Priority, ScoreRecord, unpack_scores
+
+STORE_VERSION = 1
+
+# Projects scored per evaluate_batch() call
+BATCH_SIZE = 10000
+
+_EMPTY = {}
+
+
+def evaluator_fingerprint(evaluator: ProjectEvaluator) -> str:
+    """Hash of everything besides the criteria that a result depends on."""
+    rubric = {
+        dimension: [
+            spec.section,
+            [[field.name, field.default, sorted(field.scores.items()), field.fallback]
+             for field in spec.categorical],
+            [[field.name, field.default, list(field.breakpoints), list(field.points), field.side]
+             for field in spec.ladders]
+        ]
+        for dimension, spec in evaluator.rubric.items()
+    }
+    payload = {
+        'evaluator': f"{type(evaluator).__module__}.{type(evaluator).__qualname__}",
+        'rubric': rubric,
+        'weights': evaluator.weights,
+        'risk_weights': evaluator.risk_weights,
+        'value_weights': evaluator.value_weights,
+        'model': getattr(evaluator, 'scoring_model', None)
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=repr)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+
+def hash_plan(evaluator: ProjectEvaluator) -> Tuple:
+    """(section, field names, defaults) per dimension of the evaluator's rubric."""
+    return tuple(
+        (
+            spec.section,
+            tuple(field.name for field in spec.categorical + spec.ladders),
+            tuple(field.default for field in spec.categorical + spec.ladders)
+        )
+        for spec in evaluator.rubric.values()
+    )
+
+
+def criteria_hash(record: Dict, plan: Tuple) -> bytes:
+    """Content hash of the rubric fields of a record, defaults applied.
+
+    Like the evaluator's cache keys, this ignores keys the rubric does not
+    read and treats an explicit default like a missing field.
+    """
+    values = []
+    for section, names, defaults in plan:
+        values += map(record.get(section, _EMPTY).get, names, defaults)
+    try:
+        # Format 0 writes no refs or interning flags, so equal values give
+        # equal bytes from run to run
+        data = marshal.dumps(values, 0)
+    except ValueError:
+        data = repr(values).encode()
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _pack_batch(batch) -> np.ndarray:
+    """scoring_records.pack_scores() for every row of a BatchResult."""
+    packed = np.zeros(len(batch), dtype=np.int64)
+    for shift, dimension in enumerate(DIMENSIONS):
+        packed |= batch.dimension_scores[dimension].astype(np.int64) << (3 * shift)
+    return packed
+
+
+class DeltaReport:
+    """What one incremental run changed."""
+
+    def __init__(self, fingerprint: str, previous_fingerprint: Optional[str]):
+        self.fingerprint = fingerprint
+        self.previous_fingerprint = previous_fingerprint
+        self.counts = Counter(records=0, unchanged=0, rescored=0, added=0, removed=0,
+                              score_changes=0, priority_changes=0)
+        self.changes: List[Dict] = []
+        self.priority_moves = Counter()
+
+    @property
+    def full_rescore(self) -> bool:
+        return self.previous_fingerprint is not None and self.previous_fingerprint != self.fingerprint
+
+    def record(self, project_id: str, old: Optional[tuple], new: Optional[tuple]):
+        """Note one re-scored, added or removed project; rows are (packed, risk, value, final, priority)."""
+        if old is None:
+            self.counts['added'] += 1
+        elif new is None:
+            self.counts['removed'] += 1
+        elif old == new:
+            return
+        change = {'id': project_id, 'status': 'added' if old is None else
+                  'removed' if new is None else 'changed'}
+        for index, name in enumerate(('risk_score', 'value_score', 'final_score'), 1):
+            change[name] = [old and old[index], new and new[index]]
+        change['priority'] = [old and PRIORITY_LEVELS[old[4]], new and PRIORITY_LEVELS[new[4]]]
+        if old is not None and new is not None:
+            if old[4] != new[4]:
+                self.counts['priority_changes'] += 1
+                self.priority_moves[f"{PRIORITY_LEVELS[old[4]]} -> {PRIORITY_LEVELS[new[4]]}"] += 1
+            if old[1:4] != new[1:4]:
+                self.counts['score_changes'] += 1
+            if old[0] != new[0]:
+                change['dimension_scores'] = [unpack_scores(old[0]), unpack_scores(new[0])]
+        self.changes.append(change)
+
+    def to_dict(self) -> Dict:
+        return {
+            'fingerprint': self.fingerprint,
+            'previous_fingerprint': self.previous_fingerprint,
+            'full_rescore': self.full_rescore,
+            'counts': dict(self.counts),
+            'priority_moves': dict(self.priority_moves),
+            'changes': self.changes
+        }
+
+
+class IncrementalScorer:
+    """Score a portfolio snapshot, re-evaluating only what changed since last run."""
+
+    def __init__(self, store_path: str, evaluator: ProjectEvaluator = None):
+        self.evaluator = evaluator or ProjectEvaluator()
+        self.fingerprint = evaluator_fingerprint(self.evaluator)
+        self._hash_plan = hash_plan(self.evaluator)
+        self.connection = sqlite3.connect(str(store_path))
+        self._create_schema()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Close the store."""
+        self.connection.close()
+
+    def _create_schema(self):
+        """Create (or rebuild after a format change) the store tables."""
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        with self.connection:
+            if version != STORE_VERSION:
+                self.connection.execute("DROP TABLE IF EXISTS results")
+                self.connection.execute("DROP TABLE IF EXISTS meta")
+                self.connection.execute(f"PRAGMA user_version = {STORE_VERSION}")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    id TEXT PRIMARY KEY,
+                    criteria_hash BLOB NOT NULL,
+                    line_hash BLOB,
+                    packed_scores INTEGER NOT NULL,
+                    risk_score REAL NOT NULL,
+                    value_score REAL NOT NULL,
+                    final_score REAL NOT NULL,
+                    priority INTEGER NOT NULL
+                )
+            """)
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+
+    @property
+    def stored_fingerprint(self) -> Optional[str]:
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        return row[0] if row else None
+
+    def _known(self) -> Dict[str, tuple]:
+        """id -> (criteria hash, line hash) of every stored project."""
+        return {
+            row[0]: row[1:]
+            for row in self.connection.execute("SELECT id, criteria_hash, line_hash FROM results")
+        }
+
+    def _stored_results(self, ids: List[str]) -> Dict[str, tuple]:
+        """(packed, risk, value, final, priority) of the given stored projects."""
+        rows = {}
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows.update(
+                (row[0], row[1:])
+                for row in self.connection.execute(
+                    "SELECT id, packed_scores, risk_score, value_score, final_score, priority "
+                    f"FROM results WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+                )
+            )
+        return rows
+
+    @staticmethod
+    def _project_id(record: Dict, id_key: str, where: str) -> str:
+        project_id = record.get(id_key)
+        if project_id is None:
+            raise ValueError(f"{where}: no {id_key!r} key")
+        return str(project_id)
+
+    def run(self, records: Iterable[Dict], id_key: str = 'id', prune: bool = True) -> DeltaReport:
+        """Bring the store in line with a full snapshot of records.
+
+        Records need an id under id_key; a repeated id keeps its last
+        record. With prune, stored projects missing from the snapshot are
+        removed and reported.
+        """
+        entries = (
+            (self._project_id(record, id_key, f"record {number}"), record, None)
+            for number, record in enumerate(records, 1)
+        )
+        return self._sync(entries, self._known(), prune)
+
+    def run_jsonl(self, stream: TextIO, id_key: str = 'id', prune: bool = True) -> DeltaReport:
+        """run() over JSON Lines text, skipping the parse of unchanged lines.
+
+        A line that is byte-for-byte the line a project was last stored
+        from needs neither parsing nor hashing of its criteria.
+        """
+        known = self._known()
+        lines = {} if self.stored_fingerprint != self.fingerprint else {
+            line_hash: project_id for project_id, (_, line_hash) in known.items() if line_hash
+        }
+
+        def entries():
+            for line_number, line in enumerate(stream, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                line_hash = hashlib.blake2b(line.encode(), digest_size=16).digest()
+                project_id = lines.get(line_hash)
+                if project_id is not None:
+                    yield project_id, None, line_hash
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"line {line_number}: invalid JSON ({e})")
+                if not isinstance(record, dict):
+                    raise ValueError(f"line {line_number}: expected a JSON object")
+                yield self._project_id(record, id_key, f"line {line_number}"), record, line_hash
+
+        return self._sync(entries(), known, prune)
+
+    def _sync(self, entries: Iterable[tuple], known: Dict[str, tuple], prune: bool) -> DeltaReport:
+        """Score the changed (id, record, line hash) entries and update the store.
+
+        An entry whose record is None is known unchanged.
+        """
+        report = DeltaReport(self.fingerprint, self.stored_fingerprint)
+        rescore_all = report.full_rescore
+
+        pending = {}
+        touched = {}
+        seen = set()
+        for project_id, record, line_hash in entries:
+            seen.add(project_id)
+            if record is None:
+                pending.pop(project_id, None)
+                continue
+            digest = criteria_hash(record, self._hash_plan)
+            previous = known.get(project_id)
+            if not rescore_all and previous is not None and previous[0] == digest:
+                pending.pop(project_id, None)
+                if line_hash is not None and line_hash != previous[1]:
+                    # Same criteria, different line (a renamed project, say)
+                    touched[project_id] = line_hash
+                continue
+            pending[project_id] = (digest, line_hash, record)
+        report.counts['records'] = len(seen)
+
+        removed = sorted(known.keys() - seen) if prune else []
+        previous_results = self._stored_results([
+            project_id for project_id in pending if project_id in known
+        ] + removed)
+
+        upserts = []
+        ids = list(pending)
+        for start in range(0, len(ids), BATCH_SIZE):
+            chunk = ids[start:start + BATCH_SIZE]
+            batch = self.evaluator.evaluate_batch([pending[project_id][2] for project_id in chunk])
+            rows = zip(_pack_batch(batch).tolist(), batch.risk_score.tolist(),
+                       batch.value_score.tolist(), batch.final_score.tolist(),
+                       batch.priority_codes.tolist())
+            for project_id, row in zip(chunk, rows):
+                report.record(project_id, previous_results.get(project_id), row)
+                upserts.append((project_id,) + pending[project_id][:2] + row)
+        report.counts['rescored'] = len(upserts)
+        report.counts['unchanged'] = report.counts['records'] - len(upserts)
+
+        for project_id in removed:
+            report.record(project_id, previous_results[project_id], None)
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)", upserts
+            )
+            self.connection.executemany(
+                "UPDATE results SET line_hash = ? WHERE id = ?",
+                [(line_hash, project_id) for project_id, line_hash in touched.items()]
+            )
+            self.connection.executemany(
+                "DELETE FROM results WHERE id = ?", [(project_id,) for project_id in removed]
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('fingerprint', ?)", (self.fingerprint,)
+            )
+        return report
+
+    def get(self, project_id: str) -> Optional[ScoreRecord]:
+        """The stored result of one project."""
+        row = self.connection.execute(
+            "SELECT packed_scores, risk_score, value_score, final_score, priority "
+            "FROM results WHERE id = ?", (project_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return ScoreRecord(*row[:4], Priority(row[4]), dict(self.evaluator.weights))
+
+    def results(self) -> Iterator:
+        """(id, ScoreRecord) for every stored project, by id."""
+        weights = dict(self.evaluator.weights)
+        for project_id, packed, risk, value, final, priority in self.connection.execute(
+            "SELECT id, packed_scores, risk_score, value_score, final_score, priority "
+            "FROM results ORDER BY id"
+        ):
+            yield project_id, ScoreRecord(packed, risk, value, final, Priority(priority), weights)
+
+
+def main():
+    """Incrementally score a JSON Lines snapshot and report what changed."""
+    parser = argparse.ArgumentParser(description="Re-score only changed projects")
+    parser.add_argument("input", help="Criteria snapshot (.jsonl), one project per line")
+    parser.add_argument("--store", required=True, help="Result store (SQLite file)")
+    parser.add_argument("--id-key", default="id", help="Project id key (default: id)")
+    parser.add_argument("--rubric", metavar="TEMPLATE", help="Score with a rubric template")
+    parser.add_argument("--report", help="Write the delta report as JSON to this file")
+    parser.add_argument("--keep-missing", action="store_true",
+                        help="Keep stored projects that are missing from the snapshot")
+    args = parser.parse_args()
+
+    try:
+        if args.rubric:
+            from scoring_rubric import load_rubric
+            evaluator = load_rubric(args.rubric).evaluator()
+        else:
+            evaluator = ProjectEvaluator()
+        start = time.perf_counter()
+        with IncrementalScorer(args.store, evaluator) as scorer, open(args.input) as source:
+            report = scorer.run_jsonl(source, args.id_key, prune=not args.keep_missing)
+        elapsed = time.perf_counter() - start
+        if args.report:
+            with open(args.report, 'w') as handle:
+                json.dump(report.to_dict(), handle, indent=2)
+    except (OSError, ValueError, TypeError, sqlite3.Error) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    counts = report.counts
+    if report.full_rescore:
+        print("🔄 Rubric or weights changed: every project was re-scored", file=sys.stderr)
+    for move, count in report.priority_moves.most_common():
+        print(f"  {count:>6}  {move}")
+    print(f"📊 {counts['records']} projects: {counts['rescored']} re-scored "
+          f"({counts['added']} new), {counts['unchanged']} unchanged, {counts['removed']} removed; "
+          f"{counts['score_changes']} score and {counts['priority_changes']} priority changes "
+          f"in {elapsed:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
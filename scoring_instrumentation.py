@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Scoring Instrumentation
+
+Opt-in stage timers for ProjectEvaluator. Instrumentation installs timing
+wrappers as instance attributes over the evaluator's own methods, so the
+six score_* methods, the risk/value/final calculations, classify_priority,
+aggregate_scores and evaluate_project each get a call counter and a
+cumulative timer. Disabling deletes the wrappers again. An evaluator that
+never enables it runs exactly the code it always did, at zero cost.
+
+On top of the counters:
+- every Nth evaluate_project() call's duration is kept in a bounded sample
+  window for percentiles;
+- profile() runs the next N evaluations under cProfile and, optionally,
+  tracemalloc, then disarms itself;
+- timed_iter() / timed_sink() time the read and write sides of a stream.
+
+Everything exports as a stats dict or as Prometheus text, written
+atomically for a node_exporter textfile collector.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import time
+import tracemalloc
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from scoring_calculator import DIMENSIONS
+
+STAGES = tuple(f"score_{dim}" for dim in DIMENSIONS) + (
+    'calculate_risk_score', 'calculate_value_score', 'calculate_final_score',
+    'classify_priority', 'aggregate_scores', 'evaluate_project', 'evaluate_batch'
+)
+
+METRIC_PREFIX = 'project_eval'
+
+
+class Instrumentation:
+    """Stage counters, sampled latencies and bounded profiling for one evaluator."""
+
+    def __init__(self, evaluator, sample_every: int = 100, sample_size: int = 10000):
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+        self.evaluator = evaluator
+        self.sample_every = sample_every
+        self.samples = deque(maxlen=sample_size)
+        self.stages: Dict[str, List[int]] = {}
+        self.batch_records = 0
+        self.profile_stats: Optional[pstats.Stats] = None
+        self.memory_top: Optional[List[str]] = None
+        self._profiler = None
+        self._profile_remaining = 0
+        self._trace_memory = False
+        self._installed = False
+
+    # Installing and removing the wrappers
+
+    def install(self):
+        """Wrap the evaluator's stage methods; idempotent."""
+        if self._installed:
+            return
+        evaluator = self.evaluator
+        for stage in STAGES:
+            method = getattr(evaluator, stage)
+            if stage == 'evaluate_project':
+                wrapper = self._wrap_evaluate(method)
+            elif stage == 'evaluate_batch':
+                wrapper = self._wrap_batch(method)
+            else:
+                wrapper = self._wrap(stage, method)
+            setattr(evaluator, stage, wrapper)
+        evaluator._build_cache_plan()
+        self._installed = True
+
+    def uninstall(self):
+        """Restore the evaluator's plain methods."""
+        if not self._installed:
+            return
+        for stage in STAGES:
+            self.evaluator.__dict__.pop(stage, None)
+        self.evaluator._build_cache_plan()
+        self._installed = False
+        self._finish_profile()
+
+    def _counter(self, stage: str) -> List[int]:
+        return self.stages.setdefault(stage, [0, 0])
+
+    def _wrap(self, stage: str, method):
+        counter = self._counter(stage)
+        clock = time.perf_counter_ns
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                counter[0] += 1
+                counter[1] += clock() - start
+        return timed
+
+    def _wrap_evaluate(self, method):
+        counter = self._counter('evaluate_project')
+        clock = time.perf_counter_ns
+        every = self.sample_every
+        samples = self.samples
+
+        def timed(criteria):
+            if self._profile_remaining:
+                # Profiled calls count but, being slowed down, aren't timed
+                counter[0] += 1
+                return self._profiled(method, criteria)
+            start = clock()
+            try:
+                return method(criteria)
+            finally:
+                elapsed = clock() - start
+                counter[0] += 1
+                counter[1] += elapsed
+                if counter[0] % every == 0:
+                    samples.append(elapsed)
+        return timed
+
+    def _wrap_batch(self, method):
+        counter = self._counter('evaluate_batch')
+        clock = time.perf_counter_ns
+
+        def timed(criteria):
+            start = clock()
+            try:
+                result = method(criteria)
+                self.batch_records += len(result)
+                return result
+            finally:
+                counter[0] += 1
+                counter[1] += clock() - start
+        return timed
+
+    # Stream I/O
+
+    def timed_iter(self, stage: str, iterable: Iterable) -> Iterator:
+        """Yield from iterable, charging the time spent in next() to stage."""
+        counter = self._counter(stage)
+        clock = time.perf_counter_ns
+        iterator = iter(iterable)
+        while True:
+            start = clock()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                counter[1] += clock() - start
+                return
+            counter[0] += 1
+            counter[1] += clock() - start
+            yield item
+
+    def timed_sink(self, stage: str, sink):
+        """Wrap a text sink so its write() and flush() calls are charged to stage."""
+        return _TimedSink(sink, self._wrap(stage, sink.write), self._wrap(stage, sink.flush))
+
+    # Bounded profiling
+
+    def profile(self, calls: int = 1000, trace_memory: bool = False):
+        """Run the next `calls` evaluate_project() calls under cProfile.
+
+        With trace_memory, tracemalloc runs for the same calls and the top
+        allocation sites are kept in memory_top. Results appear in
+        profile_stats once the calls are done.
+        """
+        self._finish_profile()
+        self.install()
+        self._profiler = cProfile.Profile()
+        self._profile_remaining = calls
+        self._trace_memory = trace_memory and not tracemalloc.is_tracing()
+        if self._trace_memory:
+            tracemalloc.start()
+
+    def _profiled(self, method, criteria):
+        self._profiler.enable()
+        try:
+            return method(criteria)
+        finally:
+            self._profiler.disable()
+            self._profile_remaining -= 1
+            if not self._profile_remaining:
+                self._finish_profile()
+
+    def _finish_profile(self):
+        """Collect results of an armed or finished profile run."""
+        if self._profiler is None:
+            return
+        self.profile_stats = pstats.Stats(self._profiler)
+        if self._trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            self.memory_top = [str(stat) for stat in snapshot.statistics('lineno')[:20]]
+        self._profiler = None
+        self._profile_remaining = 0
+
+    def profile_report(self, limit: int = 20) -> str:
+        """Top functions by cumulative time from the last profile run."""
+        if self.profile_stats is None:
+            return ''
+        output = io.StringIO()
+        self.profile_stats.stream = output
+        self.profile_stats.sort_stats('cumulative').print_stats(limit)
+        return output.getvalue()
+
+    # Export
+
+    def reset(self):
+        """Zero every counter and drop the samples."""
+        for counter in self.stages.values():
+            counter[0] = counter[1] = 0
+        self.samples.clear()
+        self.batch_records = 0
+
+    def latency(self) -> Dict:
+        """Percentiles of the sampled evaluate_project() durations, in microseconds."""
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {'samples': 0}
+
+        def at(fraction):
+            return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] / 1000, 3)
+
+        return {'samples': len(ordered), 'p50_us': at(0.50), 'p90_us': at(0.90),
+                'p99_us': at(0.99), 'max_us': round(ordered[-1] / 1000, 3)}
+
+    def stats(self) -> Dict:
+        """Counters, timers and sampled latency as a plain dict."""
+        return {
+            'stages': {
+                stage: {
+                    'calls': calls,
+                    'total_seconds': total / 1e9,
+                    'mean_us': round(total / calls / 1000, 3) if calls else 0.0
+                }
+                for stage, (calls, total) in self.stages.items()
+            },
+            'batch_records': self.batch_records,
+            'evaluate_latency': self.latency(),
+            'profiled': self.profile_stats is not None
+        }
+
+    def prometheus(self) -> str:
+        """The stats in Prometheus text exposition format."""
+        calls = f"{METRIC_PREFIX}_stage_calls_total"
+        seconds = f"{METRIC_PREFIX}_stage_seconds_total"
+        latency = f"{METRIC_PREFIX}_evaluate_sampled_seconds"
+        lines = [
+            f"# HELP {calls} Calls per evaluation stage.",
+            f"# TYPE {calls} counter"
+        ]
+        lines += [f'{calls}{{stage="{stage}"}} {count}' for stage, (count, _) in self.stages.items()]
+        lines += [
+            f"# HELP {seconds} Cumulative time per evaluation stage.",
+            f"# TYPE {seconds} counter"
+        ]
+        lines += [f'{seconds}{{stage="{stage}"}} {total / 1e9:.9f}'
+                  for stage, (_, total) in self.stages.items()]
+        lines += [
+            f"# HELP {METRIC_PREFIX}_batch_records_total Records scored through evaluate_batch.",
+            f"# TYPE {METRIC_PREFIX}_batch_records_total counter",
+            f"{METRIC_PREFIX}_batch_records_total {self.batch_records}",
+            f"# HELP {latency} Sampled evaluate_project durations.",
+            f"# TYPE {latency} summary"
+        ]
+        ordered = sorted(self.samples)
+        for quantile in (0.5, 0.9, 0.99):
+            if ordered:
+                value = ordered[min(len(ordered) - 1, int(quantile * len(ordered)))] / 1e9
+                lines.append(f'{latency}{{quantile="{quantile}"}} {value:.9f}')
+        lines += [
+            f"{latency}_sum {sum(ordered) / 1e9:.9f}",
+            f"{latency}_count {len(ordered)}"
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str):
+        """Write prometheus() to path atomically (write a temp file, then rename)."""
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w') as handle:
+            handle.write(self.prometheus())
+        os.replace(temporary, path)
+
+
+class _TimedSink:
+    """Text sink proxy whose write() and flush() are timed."""
+
+    def __init__(self, sink, write, flush):
+        self._sink = sink
+        self.write = write
+        self.flush = flush
+
+    def __getattr__(self, name):
+        return getattr(self._sink, name)
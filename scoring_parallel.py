@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Multi-Core Parallel Scoring
+
+Shards criteria into chunks and scores them in a process pool with one
+ProjectEvaluator per worker, yielding results in input order. Each chunk
+crosses the process boundary as a single serialized block: a pickled list
+for evaluate_parallel(), or the raw JSON Lines text / CSV rows for the
+command line, which the worker parses, scores and formats itself so the
+parent process only moves bytes.
+
+At most two chunks per worker are in flight, so memory stays bounded no
+matter how long the input is.
+"""
+
+import csv
+import io
+import os
+import pickle
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from scoring_calculator import ProjectEvaluator
+import scoring_stream
+
+# The evaluator owned by the current worker process
+_worker_evaluator = None
+
+
+def _init_worker(weights: Tuple[Dict, Dict, Dict], template: Optional[Dict] = None):
+    """Create this worker's evaluator with the parent's rubric and weights."""
+    global _worker_evaluator
+    if template is None:
+        _worker_evaluator = ProjectEvaluator()
+    else:
+        from scoring_rubric import compile_template
+        _worker_evaluator = compile_template(template).evaluator()
+    (_worker_evaluator.weights,
+     _worker_evaluator.risk_weights,
+     _worker_evaluator.value_weights) = weights
+
+
+def _score_block(block: bytes) -> bytes:
+    """Score one pickled list of criteria; return the pickled results."""
+    criteria = pickle.loads(block)
+    results = [_worker_evaluator.evaluate_project(project) for project in criteria]
+    return pickle.dumps(results, pickle.HIGHEST_PROTOCOL)
+
+
+def _score_jsonl_block(task: Tuple[int, str]) -> Tuple[int, str]:
+    """Score a block of JSON Lines text; return (count, output text)."""
+    first_line, text = task
+    output = io.StringIO()
+    records = scoring_stream.read_jsonl(io.StringIO(text), first_line)
+    results = scoring_stream.score_records(_worker_evaluator, records)
+    count = scoring_stream.write_jsonl(results, output, chunk_size=text.count('\n') + 1)
+    return count, output.getvalue()
+
+
+def _score_csv_block(task: Tuple[int, List[str], List[str], List[List[str]]]) -> Tuple[int, str]:
+    """Score a block of CSV rows; return (count, rows without header).
+
+    Every block writes the columns the parent derived from the input
+    header, so rows line up whatever the block's first row holds.
+    """
+    first_row, header, columns, rows = task
+    records = scoring_stream.records_from_rows(
+        (dict(zip(header, row)) for row in rows if row),
+        scoring_stream.numeric_fields(_worker_evaluator),
+        first_row,
+        scoring_stream.criteria_sections(_worker_evaluator)
+    )
+    output = io.StringIO()
+    count = scoring_stream.write_csv(scoring_stream.score_records(_worker_evaluator, records),
+                                     output, chunk_size=len(rows) or 1, header=False,
+                                     columns=columns)
+    return count, output.getvalue()
+
+
+def _ordered_map(func, tasks: Iterable, workers: int, weights, template=None) -> Iterator:
+    """Run func over tasks in a process pool, yielding results in order."""
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(weights, template)) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(func, task))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _weights_of(evaluator: Optional[ProjectEvaluator]) -> Tuple[Dict, Dict, Dict]:
+    """Picklable copies of an evaluator's weight tables."""
+    evaluator = evaluator or ProjectEvaluator()
+    return (dict(evaluator.weights), dict(evaluator.risk_weights),
+            dict(evaluator.value_weights))
+
+
+def _template_of(evaluator: Optional[ProjectEvaluator]) -> Optional[Dict]:
+    """The rubric template of a scoring_rubric evaluator, else None."""
+    definition = getattr(evaluator, 'definition', None)
+    return definition.template if definition is not None else None
+
+
+def evaluate_parallel(criteria: Iterable[Dict], workers: Optional[int] = None,
+                      chunk_size: int = 1000,
+                      evaluator: Optional[ProjectEvaluator] = None) -> Iterator[Dict]:
+    """Evaluate criteria dicts across worker processes, in input order.
+
+    workers defaults to the CPU count; evaluator, if given, supplies the
+    rubric and weights every worker uses. With one worker everything runs in-process.
+    """
+    workers = workers or os.cpu_count() or 1
+    if chunk_size < 1:
+        raise ValueError("chunk size must be at least 1")
+    if workers == 1:
+        local = evaluator or ProjectEvaluator()
+        return (local.evaluate_project(project) for project in criteria)
+
+    blocks = (
+        pickle.dumps(chunk, pickle.HIGHEST_PROTOCOL)
+        for chunk in scoring_stream.chunked(criteria, chunk_size)
+    )
+    return (
+        result
+        for block in _ordered_map(_score_block, blocks, workers, _weights_of(evaluator),
+                                   _template_of(evaluator))
+        for result in pickle.loads(block)
+    )
+
+
+def _jsonl_tasks(source: TextIO, chunk_size: int) -> Iterator[Tuple[int, str]]:
+    """Cut JSON Lines input into (first line number, text) blocks."""
+    line_number = 1
+    while True:
+        lines = list(islice(source, chunk_size))
+        if not lines:
+            return
+        yield line_number, ''.join(lines)
+        line_number += len(lines)
+
+
+def _csv_tasks(reader: Iterator[List[str]], header: List[str], columns: List[str],
+               chunk_size: int) -> Iterator[Tuple[int, List[str], List[str], List]]:
+    """Cut CSV rows after the header into (first row number, header, columns, rows) blocks."""
+    row_number = 2
+    while True:
+        rows = list(islice(reader, chunk_size))
+        if not rows:
+            return
+        yield row_number, header, columns, rows
+        row_number += len(rows)
+
+
+def score_stream_parallel(source: TextIO, sink: TextIO, fmt: str = 'jsonl',
+                          chunk_size: int = 1000, workers: Optional[int] = None,
+                          evaluator: Optional[ProjectEvaluator] = None) -> int:
+    """Parallel counterpart of scoring_stream.score_stream(); same output."""
+    workers = workers or os.cpu_count() or 1
+    if fmt not in scoring_stream.FORMATS:
+        raise ValueError(f"unknown format {fmt!r}, expected one of {scoring_stream.FORMATS}")
+    if chunk_size < 1:
+        raise ValueError("chunk size must be at least 1")
+
+    columns = None
+    if fmt == 'csv':
+        reader = csv.reader(source)
+        # Blank lines are skipped as csv.DictReader skips them on the serial path
+        header = next(filter(None, reader), [])
+        columns = scoring_stream.csv_columns(evaluator or ProjectEvaluator(), header)
+        tasks = _csv_tasks(reader, header, columns, chunk_size)
+        func = _score_csv_block
+    else:
+        tasks = _jsonl_tasks(source, chunk_size)
+        func = _score_jsonl_block
+
+    count = 0
+    for block_count, text in _ordered_map(func, tasks, workers, _weights_of(evaluator),
+                                          _template_of(evaluator)):
+        if columns and block_count and not count:
+            # Workers emit rows only; the header goes out with the first of them
+            csv.writer(sink).writerow(columns)
+        sink.write(text)
+        sink.flush()
+        count += block_count
+    return count
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Portfolio Ranking Index
+
+PortfolioRanking holds scored projects in compact typed arrays (one slot
+per project) and keeps them bucketed by (priority, department). Each
+bucket is a list sorted by final score, best first, so queries such as
+"top 50 by final score in Priority 1 and 2, per department" merge the
+heads of the matching buckets instead of sorting the whole portfolio.
+Re-scoring one project moves it between buckets with two binary searches.
+
+Ties on final score are broken by project id, the same order the
+portfolio index uses (final_score DESC, id).
+"""
+
+import heapq
+from array import array
+from bisect import bisect_left, insort
+from itertools import islice, takewhile
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from scoring_calculator import DIMENSIONS, PRIORITY_LEVELS
+
+PriorityFilter = Optional[Iterable[Union[int, str]]]
+
+
+def priority_codes(priorities: PriorityFilter) -> List[int]:
+    """Resolve priority labels or level numbers to PRIORITY_LEVELS codes.
+
+    A number selects every label of that level: 2 means both
+    'Priority 2 - ...' buckets. None selects all of them.
+    """
+    if priorities is None:
+        return list(range(len(PRIORITY_LEVELS)))
+    codes = set()
+    for priority in priorities:
+        if isinstance(priority, int):
+            matches = [code for code, label in enumerate(PRIORITY_LEVELS)
+                       if label.startswith(f"Priority {priority} ")]
+        else:
+            matches = [PRIORITY_LEVELS.index(priority)] if priority in PRIORITY_LEVELS else []
+        if not matches:
+            raise ValueError(f"unknown priority {priority!r}")
+        codes.update(matches)
+    return sorted(codes)
+
+
+class PortfolioRanking:
+    """Scored projects with per-priority and per-department ranking indexes."""
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.final_score = array('d')
+        self.risk_score = array('d')
+        self.value_score = array('d')
+        self.priority_code = array('B')
+        self.department_code = array('I')
+        self.dimension_scores = {dim: array('b') for dim in DIMENSIONS}
+
+        self.departments: List[str] = []
+        self._department_codes: Dict[str, int] = {}
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = []
+
+        # (priority code, department code) -> [(-final_score, id, row), ...]
+        self._buckets: Dict[Tuple[int, int], List[Tuple[float, str, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, project_id: str) -> bool:
+        return project_id in self._rows
+
+    def _department(self, name: str) -> int:
+        code = self._department_codes.get(name)
+        if code is None:
+            code = self._department_codes[name] = len(self.departments)
+            self.departments.append(name)
+        return code
+
+    def _store(self, row: Optional[int], project_id: str, department: int,
+               final: float, risk: float, value: float, priority: int, scores) -> int:
+        """Write one project's scores into its row, allocating one if needed."""
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+                self.ids[row] = project_id
+            else:
+                row = len(self.ids)
+                self.ids.append(project_id)
+                self.final_score.append(final)
+                self.risk_score.append(risk)
+                self.value_score.append(value)
+                self.priority_code.append(priority)
+                self.department_code.append(department)
+                for dim, score in zip(DIMENSIONS, scores):
+                    self.dimension_scores[dim].append(score)
+                return row
+        self.final_score[row] = final
+        self.risk_score[row] = risk
+        self.value_score[row] = value
+        self.priority_code[row] = priority
+        self.department_code[row] = department
+        for dim, score in zip(DIMENSIONS, scores):
+            self.dimension_scores[dim][row] = score
+        return row
+
+    def _unlink(self, row: int):
+        """Remove a row's entry from its bucket."""
+        key = (self.priority_code[row], self.department_code[row])
+        bucket = self._buckets[key]
+        entry = (-self.final_score[row], self.ids[row], row)
+        index = bisect_left(bucket, entry)
+        assert index < len(bucket) and bucket[index] == entry, \
+            f"ranking index out of sync for {self.ids[row]!r}"
+        del bucket[index]
+        if not bucket:
+            del self._buckets[key]
+
+    def add(self, project_id: str, result: Dict, department: str = 'Unknown'):
+        """Insert or re-score one project from an evaluate_project() result."""
+        row = self._rows.get(project_id)
+        if row is not None:
+            self._unlink(row)
+
+        priority = PRIORITY_LEVELS.index(result['priority'])
+        department_code = self._department(department)
+        row = self._store(
+            row, project_id, department_code, result['final_score'], result['risk_score'],
+            result['value_score'], priority,
+            [result['dimension_scores'][dim] for dim in DIMENSIONS]
+        )
+        self._rows[project_id] = row
+        insort(self._buckets.setdefault((priority, department_code), []),
+               (-result['final_score'], project_id, row))
+
+    def add_batch(self, project_ids: Iterable[str], batch, departments: Iterable[str]):
+        """Insert or re-score many projects from a scoring_batch.BatchResult.
+
+        New projects are appended and each touched bucket is sorted once,
+        which is much cheaper than inserting them one at a time. If an id
+        repeats, its last row wins, as with repeated add() calls.
+        """
+        columns = zip(
+            project_ids, departments,
+            batch.final_score.tolist(), batch.risk_score.tolist(),
+            batch.value_score.tolist(), batch.priority_codes.tolist(),
+            zip(*[batch.dimension_scores[dim].tolist() for dim in DIMENSIONS])
+        )
+        latest = {}
+        for project_id, department, *values in columns:
+            latest[project_id] = (self._department(department), *values)
+
+        # Unlink every re-scored project while all buckets are still sorted;
+        # _unlink() binary-searches and must not see the unsorted appends below
+        for project_id in latest:
+            row = self._rows.get(project_id)
+            if row is not None:
+                self._unlink(row)
+
+        touched = set()
+        for project_id, (department_code, final, risk, value, priority, scores) in latest.items():
+            row = self._store(self._rows.get(project_id), project_id, department_code,
+                              final, risk, value, priority, scores)
+            self._rows[project_id] = row
+            key = (priority, department_code)
+            self._buckets.setdefault(key, []).append((-final, project_id, row))
+            touched.add(key)
+        for key in touched:
+            self._buckets[key].sort()
+
+    def remove(self, project_id: str):
+        """Drop a project; its row is reused by the next insert."""
+        row = self._rows.pop(project_id)
+        self._unlink(row)
+        self._free.append(row)
+
+    def get(self, project_id: str) -> Optional[Dict]:
+        """Return one project's scores, or None if it is not ranked."""
+        row = self._rows.get(project_id)
+        return None if row is None else self._record(row)
+
+    def _record(self, row: int) -> Dict:
+        return {
+            'id': self.ids[row],
+            'department': self.departments[self.department_code[row]],
+            'dimension_scores': {dim: self.dimension_scores[dim][row] for dim in DIMENSIONS},
+            'risk_score': self.risk_score[row],
+            'value_score': self.value_score[row],
+            'final_score': self.final_score[row],
+            'priority': PRIORITY_LEVELS[self.priority_code[row]]
+        }
+
+    def _ranked(self, priorities: PriorityFilter, departments: Optional[Iterable[str]],
+                max_score: Optional[float] = None) -> Iterator[Tuple[float, str, int]]:
+        """Lazily merge the matching buckets, best final score first."""
+        codes = set(priority_codes(priorities))
+        if departments is None:
+            wanted = None
+        else:
+            wanted = {self._department_codes[name] for name in departments
+                      if name in self._department_codes}
+        heads = []
+        for (priority, department), bucket in self._buckets.items():
+            if priority not in codes or (wanted is not None and department not in wanted):
+                continue
+            start = 0 if max_score is None else bisect_left(bucket, (-max_score,))
+            heads.append(islice(bucket, start, None))
+        return heapq.merge(*heads)
+
+    def top(self, k: int, priorities: PriorityFilter = None,
+            departments: Optional[Iterable[str]] = None) -> List[Dict]:
+        """The k best projects by final score among the matching buckets."""
+        return [self._record(row) for _, _, row in islice(self._ranked(priorities, departments), k)]
+
+    def in_range(self, min_score: Optional[float] = None, max_score: Optional[float] = None,
+                 priorities: PriorityFilter = None, departments: Optional[Iterable[str]] = None,
+                 limit: Optional[int] = None) -> List[Dict]:
+        """Projects with min_score <= final_score <= max_score, best first."""
+        entries = self._ranked(priorities, departments, max_score)
+        if min_score is not None:
+            entries = takewhile(lambda entry: -entry[0] >= min_score, entries)
+        return [self._record(row) for _, _, row in islice(entries, limit)]
+
+    def top_per_department(self, k: int, priorities: PriorityFilter = None) -> Dict[str, List[Dict]]:
+        """The k best projects of every department, by department name."""
+        ranked = {}
+        for name in sorted(self._department_codes):
+            projects = self.top(k, priorities, [name])
+            if projects:
+                ranked[name] = projects
+        return ranked
+
+    def priority_counts(self) -> Dict[str, int]:
+        """Number of ranked projects per priority label."""
+        counts = dict.fromkeys(PRIORITY_LEVELS, 0)
+        for (priority, _), bucket in self._buckets.items():
+            counts[PRIORITY_LEVELS[priority]] += len(bucket)
+        return counts
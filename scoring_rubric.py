@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+"""
+Data-Driven Rubrics
+
+Loads scoring rubrics from JSON in the quick_assessment template format of
+EVALUATION_FRAMEWORK.md and compiles them, once, into the same structures
+ProjectEvaluator builds from the built-in RUBRIC: read-only categorical maps,
+breakpoint ladders searched with bisect, weight tables, and a priority grid
+so classify_priority() is two bisects and two index lookups whatever the
+rules say. Compiled rubrics are immutable, so any number of versions can be
+loaded side by side, each behind its own evaluator.
+
+A template holds one criterion per scoring dimension:
+
+    {
+      "evaluationType": "quick_assessment",
+      "id": "portfolio", "version": "2.0.0",
+      "template": {
+        "criteria": [
+          {
+            "id": "technical_complexity",
+            "category": "risk_factor",
+            "weight": 0.375,             # weight within the risk score
+            "overallWeight": 0.15,       # weight in weighted_scores
+            "scoreRange": [1, 5],
+            "scoringMethod": "field_points",
+            "section": "technical",
+            "fields": {...}              # same rules as RUBRIC
+          },
+          ...
+        ],
+        "scoringModel": {
+          "valueScore": {"calculation": "weighted_average", "criteria": [...]},
+          "riskScore": {"calculation": "weighted_average", "criteria": [...]},
+          "finalScore": {"calculation": "weighted_difference",
+                         "valueWeight": 0.6, "riskWeight": 0.4}
+        },
+        "priorityRules": [
+          {"condition": "valueScore >= 4.0 && riskScore <= 2.5",
+           "label": "Priority 1 - Immediate implementation"},
+          ...
+          {"condition": "true", "label": "Priority 4 - Reject or major redesign"}
+        ]
+      }
+    }
+
+Criterion ids are the six DIMENSIONS; risk_factor criteria are the three
+risk dimensions and business_value the three value dimensions. Rules are
+tried in order and their labels must be PRIORITY_LEVELS entries, so batch
+results, records and rankings work unchanged. "value_minus_risk" is also
+accepted as the final score calculation. reverseScore is informational:
+risk dimensions already score higher for riskier projects.
+
+load_rubric() keeps each compiled template in a small marshal file under
+~/.cache/project_eval (or $PROJECT_EVAL_CACHE), keyed by the template's
+path, size and mtime, so command-line runs skip validation, rule
+compilation and fingerprinting whenever the template hasn't changed.
+
+Usage:
+    python scoring_rubric.py export -o rubric.json
+    python scoring_rubric.py check rubric.json rubric-v2.json
+"""
+
+import json
+import marshal
+import os
+import re
+import sys
+import zlib
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Tuple
+
+from scoring_calculator import (
+    DIMENSIONS, PRIORITY_LEVELS, RUBRIC, ProjectEvaluator, compile_rubric
+)
+
+RISK_DIMENSIONS = DIMENSIONS[:3]
+VALUE_DIMENSIONS = DIMENSIONS[3:]
+
+TEMPLATE_TYPE = 'quick_assessment'
+SCORING_METHOD = 'field_points'
+CATEGORIES = {'risk_factor': RISK_DIMENSIONS, 'business_value': VALUE_DIMENSIONS}
+
+CACHE_VERSION = 1
+
+_CLAUSE = re.compile(r'^(valueScore|riskScore)\s*(>=|<=|>|<)\s*(-?\d+(?:\.\d+)?)$')
+
+
+class ScoringModel(NamedTuple):
+    """Compiled final-score formula and priority rules.
+
+    A score's cell is the number of rule thresholds it has passed:
+    bisect_right over the '>=' thresholds plus bisect_left over the '>'
+    ones. grid[value cell][risk cell] is the PRIORITY_LEVELS index of the
+    first rule that holds throughout that cell.
+    """
+    final_weights: Tuple[float, float]
+    value_ge: Tuple[float, ...]
+    value_gt: Tuple[float, ...]
+    risk_ge: Tuple[float, ...]
+    risk_gt: Tuple[float, ...]
+    grid: Tuple[Tuple[int, ...], ...]
+
+    def classify(self, value_score: float, risk_score: float) -> str:
+        return PRIORITY_LEVELS[self.grid[
+            bisect_right(self.value_ge, value_score) + bisect_left(self.value_gt, value_score)
+        ][
+            bisect_right(self.risk_ge, risk_score) + bisect_left(self.risk_gt, risk_score)
+        ]]
+
+
+class Rubric:
+    """A compiled rubric template; shareable between evaluators."""
+
+    def __init__(self, rubric_id: str, version: str, name: str, fields: Mapping,
+                 weights: Dict[str, float], risk_weights: Dict[str, float],
+                 value_weights: Dict[str, float], model: ScoringModel,
+                 fingerprint: str, template: Dict):
+        self.id = rubric_id
+        self.version = version
+        self.name = name
+        self.fields = fields
+        self.weights = weights
+        self.risk_weights = risk_weights
+        self.value_weights = value_weights
+        self.model = model
+        self.fingerprint = fingerprint
+        self.template = template
+
+    @property
+    def key(self) -> str:
+        return f"{self.id}@{self.version}"
+
+    def evaluator(self, cache_size: int = None) -> 'RubricEvaluator':
+        """A new evaluator scoring with this rubric."""
+        return RubricEvaluator(self, cache_size)
+
+    def __repr__(self) -> str:
+        return f"Rubric({self.key!r}, fingerprint={self.fingerprint!r})"
+
+
+class RubricEvaluator(ProjectEvaluator):
+    """ProjectEvaluator whose rules, weights and priorities come from a Rubric."""
+
+    def __init__(self, rubric: Rubric, cache_size: int = None):
+        super().__init__(cache_size)
+        self.definition = rubric
+        self.rubric = rubric.fields
+        self.weights = dict(rubric.weights)
+        self.risk_weights = dict(rubric.risk_weights)
+        self.value_weights = dict(rubric.value_weights)
+        self.scoring_model = rubric.model
+        self._build_cache_plan()
+
+    def calculate_final_score(self, value_score: float, risk_score: float) -> float:
+        value_weight, risk_weight = self.scoring_model.final_weights
+        return (value_score * value_weight) - (risk_score * risk_weight)
+
+    def classify_priority(self, value_score: float, risk_score: float) -> str:
+        model = self.scoring_model
+        return PRIORITY_LEVELS[model.grid[
+            bisect_right(model.value_ge, value_score) + bisect_left(model.value_gt, value_score)
+        ][
+            bisect_right(model.risk_ge, risk_score) + bisect_left(model.risk_gt, risk_score)
+        ]]
+
+
+def _parse_condition(condition: str) -> List[Tuple[str, str, float]]:
+    """'valueScore >= 3.5 && riskScore <= 2.5' -> [(score, op, threshold), ...]"""
+    condition = condition.strip()
+    if condition in ('', 'true'):
+        return []
+    clauses = []
+    for clause in condition.split('&&'):
+        match = _CLAUSE.match(clause.strip())
+        if match is None:
+            raise ValueError(f"unsupported priority condition clause {clause.strip()!r}")
+        score, op, threshold = match.groups()
+        clauses.append((score, op, float(threshold)))
+    return clauses
+
+
+def compile_priority_rules(rules: List[Dict], final_weights: Tuple[float, float]) -> ScoringModel:
+    """Compile ordered priority rules into a ScoringModel grid."""
+    parsed = []
+    for number, rule in enumerate(rules, 1):
+        if rule.get('label') not in PRIORITY_LEVELS:
+            raise ValueError(f"priority rule {number}: label must be one of PRIORITY_LEVELS")
+        parsed.append((_parse_condition(rule.get('condition', 'true')),
+                       PRIORITY_LEVELS.index(rule['label'])))
+
+    # Thresholds per score, ordered as a score passes them; '>= x' is
+    # passed before '> x'. '< x' and '<= x' are the negations of those.
+    boundaries = {'valueScore': set(), 'riskScore': set()}
+    for clauses, _ in parsed:
+        for score, op, threshold in clauses:
+            boundaries[score].add((threshold, 0 if op in ('>=', '<') else 1))
+    order = {score: sorted(found) for score, found in boundaries.items()}
+    position = {score: {boundary: index for index, boundary in enumerate(found)}
+                for score, found in order.items()}
+
+    def holds(clauses, cells):
+        for score, op, threshold in clauses:
+            passed = position[score][(threshold, 0 if op in ('>=', '<') else 1)] < cells[score]
+            if passed != (op in ('>=', '>')):
+                return False
+        return True
+
+    grid = []
+    for value_cell in range(len(order['valueScore']) + 1):
+        row = []
+        for risk_cell in range(len(order['riskScore']) + 1):
+            cells = {'valueScore': value_cell, 'riskScore': risk_cell}
+            code = next((code for clauses, code in parsed if holds(clauses, cells)), None)
+            if code is None:
+                raise ValueError("priority rules leave some value/risk scores unclassified; "
+                                 "end them with a 'true' rule")
+            row.append(code)
+        grid.append(tuple(row))
+
+    def thresholds(score, kind):
+        return tuple(threshold for threshold, side in order[score] if side == kind)
+
+    return ScoringModel(
+        final_weights, thresholds('valueScore', 0), thresholds('valueScore', 1),
+        thresholds('riskScore', 0), thresholds('riskScore', 1), tuple(grid)
+    )
+
+
+def _final_weights(spec: Dict) -> Tuple[float, float]:
+    calculation = spec.get('calculation', 'weighted_difference')
+    if calculation == 'value_minus_risk':
+        return (1.0, 1.0)
+    if calculation == 'weighted_difference':
+        return (float(spec['valueWeight']), float(spec['riskWeight']))
+    raise ValueError(f"finalScore: unsupported calculation {calculation!r}")
+
+
+def compile_template(template: Dict) -> Rubric:
+    """Validate a quick_assessment template and compile it into a Rubric."""
+    if template.get('evaluationType', TEMPLATE_TYPE) != TEMPLATE_TYPE:
+        raise ValueError(f"evaluationType must be {TEMPLATE_TYPE!r}")
+    body = template['template']
+
+    criteria = {}
+    for criterion in body['criteria']:
+        dimension = criterion['id']
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"{dimension}: criterion id must be one of {DIMENSIONS}")
+        if dimension in criteria:
+            raise ValueError(f"{dimension}: defined twice")
+        if dimension not in CATEGORIES.get(criterion.get('category'), ()):
+            raise ValueError(f"{dimension}: category must be "
+                             f"{'risk_factor' if dimension in RISK_DIMENSIONS else 'business_value'}")
+        if list(criterion.get('scoreRange', [1, 5])) != [1, 5]:
+            raise ValueError(f"{dimension}: scoreRange must be [1, 5]")
+        if criterion.get('scoringMethod', SCORING_METHOD) != SCORING_METHOD:
+            raise ValueError(f"{dimension}: scoringMethod must be {SCORING_METHOD!r}")
+        criteria[dimension] = criterion
+    missing = [dim for dim in DIMENSIONS if dim not in criteria]
+    if missing:
+        raise ValueError(f"template is missing criteria {missing}")
+
+    model_spec = body.get('scoringModel', {})
+    for score, dims in (('riskScore', RISK_DIMENSIONS), ('valueScore', VALUE_DIMENSIONS)):
+        spec = model_spec.get(score, {})
+        if spec.get('calculation', 'weighted_average') != 'weighted_average':
+            raise ValueError(f"{score}: only weighted_average is supported")
+        if sorted(spec.get('criteria', dims)) != sorted(dims):
+            raise ValueError(f"{score}: criteria must be {list(dims)}")
+        total = sum(criteria[dim]['weight'] for dim in dims)
+        if abs(total - 1.0) > 0.01:
+            raise ValueError(f"{score}: criterion weights sum to {total}, expected 1.0")
+
+    # Compile in DIMENSIONS order; packed and columnar results rely on it
+    fields = compile_rubric({
+        dim: {'section': criteria[dim]['section'], 'fields': criteria[dim]['fields']}
+        for dim in DIMENSIONS
+    })
+    model = compile_priority_rules(
+        body['priorityRules'], _final_weights(model_spec.get('finalScore', {}))
+    )
+    import hashlib
+    canonical = json.dumps(template, sort_keys=True, separators=(',', ':'))
+    return Rubric(
+        template.get('id', 'rubric'),
+        str(template.get('version', '1.0.0')),
+        template.get('name', ''),
+        fields,
+        {dim: criteria[dim]['overallWeight'] for dim in DIMENSIONS},
+        {dim: criteria[dim]['weight'] for dim in RISK_DIMENSIONS},
+        {dim: criteria[dim]['weight'] for dim in VALUE_DIMENSIONS},
+        model,
+        hashlib.sha256(canonical.encode()).hexdigest()[:16],
+        template
+    )
+
+
+def _cache_file(path: str) -> str:
+    directory = os.environ.get('PROJECT_EVAL_CACHE') or \
+        os.path.join(os.path.expanduser('~'), '.cache', 'project_eval')
+    return os.path.join(directory, f"rubric-{zlib.crc32(path.encode()):08x}.marshal")
+
+
+def _read_cached(cache_file: str, key: Tuple):
+    """The cached compile of a template, or None if absent or stale."""
+    try:
+        with open(cache_file, 'rb') as handle:
+            entry = marshal.loads(handle.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(entry, tuple) or len(entry) != 2 or entry[0] != key:
+        return None
+    (rubric_id, version, name, fields, weights, risk_weights, value_weights,
+     model, fingerprint, template) = entry[1]
+    return Rubric(rubric_id, version, name, compile_rubric(fields), weights, risk_weights,
+                  value_weights, ScoringModel(*model), fingerprint, template)
+
+
+def _write_cached(cache_file: str, key: Tuple, rubric: Rubric):
+    """Store a compiled template; a cache that can't be written is skipped."""
+    fields = {
+        dim: {'section': spec.section, 'fields': {
+            **{field.name: {'default': field.default, 'scores': dict(field.scores),
+                            'fallback': field.fallback}
+               for field in spec.categorical},
+            **{field.name: {'default': field.default, 'breakpoints': field.breakpoints,
+                            'points': field.points, 'side': field.side}
+               for field in spec.ladders}
+        }}
+        for dim, spec in rubric.fields.items()
+    }
+    entry = (key, (rubric.id, rubric.version, rubric.name, fields, rubric.weights,
+                   rubric.risk_weights, rubric.value_weights, tuple(rubric.model),
+                   rubric.fingerprint, rubric.template))
+    temporary = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(temporary, 'wb') as handle:
+            handle.write(marshal.dumps(entry))
+        os.replace(temporary, cache_file)
+    except (OSError, ValueError):
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+
+
+def load_rubric(path: str, cache: bool = True) -> Rubric:
+    """Read and compile one template file, reusing the disk cache if fresh."""
+    source = os.path.abspath(path)
+    stat = os.stat(source)
+    key = (CACHE_VERSION, source, stat.st_size, stat.st_mtime_ns)
+    cache_file = _cache_file(source)
+    if cache:
+        rubric = _read_cached(cache_file, key)
+        if rubric is not None:
+            return rubric
+
+    with open(path) as handle:
+        try:
+            rubric = compile_template(json.load(handle))
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"{path}: malformed template ({e!r})")
+        except ValueError as e:
+            raise ValueError(f"{path}: {e}")
+    if cache:
+        _write_cached(cache_file, key, rubric)
+    return rubric
+
+
+class RubricSet:
+    """Several compiled rubrics side by side, one evaluator per version."""
+
+    def __init__(self, rubrics: Iterable[Rubric] = ()):
+        self.rubrics: Dict[str, Rubric] = {}
+        self._evaluators: Dict[str, RubricEvaluator] = {}
+        for rubric in rubrics:
+            self.add(rubric)
+
+    @classmethod
+    def load(cls, paths: Iterable[str]) -> 'RubricSet':
+        return cls(load_rubric(path) for path in paths)
+
+    def add(self, rubric: Rubric):
+        if rubric.key in self.rubrics:
+            raise ValueError(f"rubric {rubric.key} is already loaded")
+        self.rubrics[rubric.key] = rubric
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.rubrics
+
+    def __len__(self) -> int:
+        return len(self.rubrics)
+
+    def evaluator(self, key: str) -> RubricEvaluator:
+        """The shared evaluator for rubric key ('id@version')."""
+        evaluator = self._evaluators.get(key)
+        if evaluator is None:
+            evaluator = self._evaluators[key] = self.rubrics[key].evaluator()
+        return evaluator
+
+    def evaluate_project(self, key: str, criteria: Dict) -> Dict:
+        return self.evaluator(key).evaluate_project(criteria)
+
+    def evaluate_batch(self, key: str, criteria) -> 'BatchResult':
+        return self.evaluator(key).evaluate_batch(criteria)
+
+
+# classify_priority() of ProjectEvaluator as template rules
+BUILTIN_PRIORITY_RULES = (
+    ('valueScore >= 4.0 && riskScore <= 2.5', 0),
+    ('valueScore >= 4.0 && riskScore <= 3.5', 1),
+    ('valueScore >= 4.0', 2),
+    ('valueScore >= 3.0 && riskScore <= 2.5', 3),
+    ('valueScore >= 3.0', 4),
+    ('true', 5)
+)
+
+
+def builtin_template() -> Dict:
+    """The built-in RUBRIC and ProjectEvaluator weights as a template."""
+    evaluator = ProjectEvaluator()
+    criteria = []
+    for dim in DIMENSIONS:
+        risk = dim in RISK_DIMENSIONS
+        fields = {}
+        for name, rule in RUBRIC[dim]['fields'].items():
+            rule = dict(rule)
+            for key in ('breakpoints', 'points'):
+                if key in rule:
+                    rule[key] = list(rule[key])
+            fields[name] = rule
+        criteria.append({
+            'id': dim,
+            'name': dim.replace('_', ' ').title(),
+            'category': 'risk_factor' if risk else 'business_value',
+            'weight': (evaluator.risk_weights if risk else evaluator.value_weights)[dim],
+            'overallWeight': evaluator.weights[dim],
+            'scoreRange': [1, 5],
+            'scoringMethod': SCORING_METHOD,
+            'reverseScore': risk,
+            'section': RUBRIC[dim]['section'],
+            'fields': fields
+        })
+    return {
+        'evaluationType': TEMPLATE_TYPE,
+        'id': 'builtin',
+        'version': '1.0.0',
+        'name': 'Built-in deterministic rubric',
+        'template': {
+            'criteria': criteria,
+            'scoringModel': {
+                'valueScore': {'calculation': 'weighted_average', 'criteria': list(VALUE_DIMENSIONS)},
+                'riskScore': {'calculation': 'weighted_average', 'criteria': list(RISK_DIMENSIONS)},
+                'finalScore': {'calculation': 'weighted_difference',
+                               'valueWeight': 0.6, 'riskWeight': 0.4}
+            },
+            'priorityRules': [
+                {'condition': condition, 'priority': code + 1, 'label': PRIORITY_LEVELS[code]}
+                for condition, code in BUILTIN_PRIORITY_RULES
+            ]
+        }
+    }
+
+
+def main():
+    """Export the built-in rubric as a template, or validate template files."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Compile and check rubric templates")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Write the built-in rubric as a template")
+    export.add_argument("--output", "-o", help="Output file (default: stdout)")
+
+    check = commands.add_parser("check", help="Compile templates and summarize them")
+    check.add_argument("templates", nargs="+", help="Template JSON files")
+
+    args = parser.parse_args()
+
+    if args.command == "export":
+        text = json.dumps(builtin_template(), indent=2) + '\n'
+        if args.output:
+            with open(args.output, 'w') as handle:
+                handle.write(text)
+            print(f"✅ Built-in rubric written to {args.output}", file=sys.stderr)
+        else:
+            sys.stdout.write(text)
+        return
+
+    try:
+        rubrics = RubricSet(load_rubric(path, cache=False) for path in args.templates)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    for key, rubric in rubrics.rubrics.items():
+        fields = sum(len(spec.categorical) + len(spec.ladders) for spec in rubric.fields.values())
+        print(f"✅ {key}: {fields} fields, {len(rubric.model.grid)}x{len(rubric.model.grid[0])} "
+              f"priority grid, fingerprint {rubric.fingerprint}")
+
+
+if __name__ == "__main__":
+    main()
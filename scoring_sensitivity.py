@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Weight Sensitivity and What-If Analysis
+
+Dimension scores never depend on weights, so SensitivityEngine scores a
+portfolio once with the batch engine and then re-aggregates it under many
+weight configurations at the same time. Projects sharing the same six
+dimension scores always land together, so the sweep runs over the distinct
+score profiles (at most 5^6) rather than over every project: each weight
+table becomes one column of a profiles-by-configurations matrix.
+
+The arithmetic mirrors ProjectEvaluator.calculate_risk_score(),
+calculate_value_score(), calculate_final_score() and classify_priority()
+term by term, so a configuration gives the same buckets evaluate_project()
+would.
+
+Usage:
+    python scoring_sensitivity.py criteria.jsonl --vary value_weights.business_impact=0.3:0.6:0.05
+"""
+
+import argparse
+import json
+import sys
+from itertools import product
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from scoring_calculator import DIMENSIONS, PRIORITY_LEVELS, ProjectEvaluator
+
+RISK_DIMENSIONS = DIMENSIONS[:3]
+VALUE_DIMENSIONS = DIMENSIONS[3:]
+WEIGHT_TABLES = ('weights', 'risk_weights', 'value_weights')
+
+
+class SweepResult:
+    """Outcome of a weight sweep.
+
+    The 2-D arrays have one row per distinct score profile and one column
+    per configuration; profile_of maps each project to its row, and the
+    per-project reports below are computed per profile and then expanded.
+    """
+
+    def __init__(self, configs: List[Dict], profile_of: np.ndarray, counts: np.ndarray,
+                 baseline_priority: np.ndarray, baseline_rank: np.ndarray,
+                 priority_codes: np.ndarray, ranks: np.ndarray, weighted_total: np.ndarray):
+        self.configs = configs
+        self.profile_of = profile_of
+        self.counts = counts
+        self.baseline_priority = baseline_priority
+        self.baseline_rank = baseline_rank
+        self.priority_codes = priority_codes
+        self.ranks = ranks
+        self.weighted_total = weighted_total
+
+    def __len__(self) -> int:
+        return len(self.profile_of)
+
+    def _changed(self) -> np.ndarray:
+        return self.priority_codes != self.baseline_priority[:, None]
+
+    def priority_changes(self) -> np.ndarray:
+        """Per project: in how many configurations its bucket differs from baseline."""
+        return self._changed().sum(axis=1)[self.profile_of]
+
+    def priority_share(self) -> np.ndarray:
+        """Per project: fraction of configurations in each PRIORITY_LEVELS bucket."""
+        share = np.empty((len(self.priority_codes), len(PRIORITY_LEVELS)))
+        for code in range(len(PRIORITY_LEVELS)):
+            share[:, code] = (self.priority_codes == code).mean(axis=1)
+        return share[self.profile_of]
+
+    def rank_stability(self) -> Dict[str, np.ndarray]:
+        """Per project: baseline rank and the min/max/mean/std of its rank."""
+        ranks = self.ranks
+        return {
+            'baseline': self.baseline_rank[self.profile_of],
+            'min': ranks.min(axis=1)[self.profile_of],
+            'max': ranks.max(axis=1)[self.profile_of],
+            'mean': ranks.mean(axis=1)[self.profile_of],
+            'std': ranks.std(axis=1)[self.profile_of]
+        }
+
+    def config_changes(self) -> np.ndarray:
+        """Per configuration: how many projects change priority bucket."""
+        return self.counts @ self._changed()
+
+    def summary(self) -> Dict:
+        """Portfolio-level digest, JSON-serializable."""
+        total = int(self.counts.sum())
+        changed = self._changed()
+        spread = self.ranks.max(axis=1) - self.ranks.min(axis=1)
+        return {
+            'projects': total,
+            'configurations': len(self.configs),
+            'projects_changing_bucket': int(self.counts[changed.any(axis=1)].sum()),
+            'mean_rank_spread': float(self.counts @ spread / total) if total else 0.0,
+            'per_configuration': [
+                {'config': config, 'bucket_changes': int(count)}
+                for config, count in zip(self.configs, self.counts @ changed)
+            ]
+        }
+
+
+class SensitivityEngine:
+    """Score a portfolio once, then sweep weight configurations over it."""
+
+    # classify_priority() as a table: [value band][risk band]
+    PRIORITY_TABLE = np.array([[0, 1, 2], [3, 4, 4], [5, 5, 5]], dtype=np.uint8)
+
+    # Above this many rank histogram bins, fall back to sorting
+    MAX_RANK_BINS = 50_000_000
+
+    def __init__(self, criteria, evaluator: ProjectEvaluator = None):
+        self.evaluator = evaluator or ProjectEvaluator()
+        batch = self.evaluator.evaluate_batch(criteria)
+
+        # Collapse projects onto their distinct score profiles: a base-5
+        # code whose high three digits are the risk dimensions
+        codes = np.zeros(len(batch), dtype=np.int32)
+        for dimension in DIMENSIONS:
+            codes = codes * 5 + (batch.dimension_scores[dimension].astype(np.int32) - 1)
+        profiles, self.profile_of = np.unique(codes, return_inverse=True)
+        self.profile_of = self.profile_of.reshape(-1)
+        self.profile_counts = np.bincount(self.profile_of, minlength=len(profiles))
+        self.risk_index = profiles // 125
+        self.value_index = profiles % 125
+        self.value_scores = np.column_stack([
+            self.value_index // 25 + 1, self.value_index // 5 % 5 + 1, self.value_index % 5 + 1
+        ]).astype(np.float64)
+
+        # Scores of the three dimensions in each of the 125 combinations
+        combos = np.arange(125)
+        self._combo_scores = np.column_stack(
+            [combos // 25 + 1, combos // 5 % 5 + 1, combos % 5 + 1]
+        ).astype(np.float64)
+
+    def __len__(self) -> int:
+        return len(self.profile_of)
+
+    def _resolve(self, config: Dict) -> Dict[str, Dict]:
+        """Apply a config's overrides on top of the evaluator's weights."""
+        resolved = {}
+        for table in WEIGHT_TABLES:
+            overrides = config.get(table, {})
+            unknown = set(overrides) - set(getattr(self.evaluator, table))
+            if unknown:
+                raise ValueError(f"{table}: unknown dimensions {sorted(unknown)}")
+            resolved[table] = {**getattr(self.evaluator, table), **overrides}
+        return resolved
+
+    def _aggregate(self, configs: List[Dict]):
+        """Final score, priority code and weighted total per profile x config.
+
+        Risk and value each depend on three dimensions only, so they are
+        computed for the 125 combinations x configs and gathered per
+        profile. Sums run left to right, in the scalar methods' order.
+        """
+        resolved = [self._resolve(config) for config in configs]
+
+        def weight_matrix(table, dims):
+            return np.array([[config[table][dim] for dim in dims] for config in resolved])
+
+        def combine(scores, weights, total=None):
+            for column in range(weights.shape[1]):
+                term = scores[:, [column]] * weights[:, column]
+                total = term if total is None else total + term
+            return total
+
+        risk = combine(self._combo_scores, weight_matrix('risk_weights', RISK_DIMENSIONS))
+        value = combine(self._combo_scores, weight_matrix('value_weights', VALUE_DIMENSIONS))
+        model = getattr(self.evaluator, 'scoring_model', None)
+        if model is None:
+            final = (value * 0.6)[self.value_index] - (risk * 0.4)[self.risk_index]
+            risk_band = (risk > 2.5).astype(np.uint8) + (risk > 3.5)
+            value_band = (value < 4.0).astype(np.uint8) + (value < 3.0)
+            priority = self.PRIORITY_TABLE[value_band[self.value_index], risk_band[self.risk_index]]
+        else:
+            # A template rubric: its final weights and compiled priority grid
+            value_weight, risk_weight = model.final_weights
+            final = (value * value_weight)[self.value_index] - (risk * risk_weight)[self.risk_index]
+            value_cell = (np.searchsorted(np.array(model.value_ge, dtype=np.float64), value, 'right') +
+                          np.searchsorted(np.array(model.value_gt, dtype=np.float64), value, 'left'))
+            risk_cell = (np.searchsorted(np.array(model.risk_ge, dtype=np.float64), risk, 'right') +
+                         np.searchsorted(np.array(model.risk_gt, dtype=np.float64), risk, 'left'))
+            grid = np.array(model.grid, dtype=np.uint8)
+            priority = grid[value_cell[self.value_index], risk_cell[self.risk_index]]
+
+        weighted = combine(self._combo_scores, weight_matrix('weights', RISK_DIMENSIONS))
+        weighted = combine(self.value_scores, weight_matrix('weights', VALUE_DIMENSIONS),
+                           weighted[self.risk_index])
+        return final, priority, weighted
+
+    def _ranks(self, final: np.ndarray) -> np.ndarray:
+        """Competition rank (1 = best) of every profile in every config.
+
+        Final scores are compared at two decimals, as they are reported;
+        a profile's rank is one plus the number of projects scoring
+        strictly higher. Ranks come from a per-config histogram over
+        whole cents, which avoids sorting.
+        """
+        cents = np.rint(np.round(final, 2) * 100).astype(np.int64)
+        low = cents.min(axis=0)
+        span = int((cents.max(axis=0) - low).max()) + 1
+        if span * cents.shape[1] > self.MAX_RANK_BINS:
+            return self._ranks_sorted(cents)
+
+        bins = (cents - low) + np.arange(cents.shape[1]) * span
+        weights = np.broadcast_to(self.profile_counts[:, None], bins.shape)
+        histogram = np.bincount(bins.ravel(), weights.ravel(), minlength=span * cents.shape[1])
+        at_or_below = np.cumsum(histogram.reshape(-1, span), axis=1).ravel()
+        return (len(self) - at_or_below[bins]).astype(np.int64) + 1
+
+    def _ranks_sorted(self, cents: np.ndarray) -> np.ndarray:
+        """Sorting fallback of _ranks() for very wide score ranges."""
+        order = np.argsort(-cents, axis=0, kind='stable')
+        sorted_cents = np.take_along_axis(cents, order, axis=0)
+        sorted_counts = self.profile_counts[order]
+        ahead = np.cumsum(sorted_counts, axis=0) - sorted_counts
+
+        # Ties share the rank of the first profile in their run
+        position = np.arange(len(cents))[:, None]
+        starts = np.ones_like(sorted_cents, dtype=bool)
+        starts[1:] = sorted_cents[1:] != sorted_cents[:-1]
+        group_start = np.maximum.accumulate(np.where(starts, position, 0), axis=0)
+        sorted_ranks = np.take_along_axis(ahead, group_start, axis=0) + 1
+
+        ranks = np.empty_like(sorted_ranks)
+        np.put_along_axis(ranks, order, sorted_ranks, axis=0)
+        return ranks
+
+    def sweep(self, configs: Iterable[Dict]) -> SweepResult:
+        """Re-aggregate the portfolio under every configuration at once.
+
+        Each config maps 'weights', 'risk_weights' and/or 'value_weights'
+        to partial overrides of the evaluator's tables, e.g.
+        {'value_weights': {'business_impact': 0.5}}.
+        """
+        configs = list(configs)
+        if not configs:
+            raise ValueError("need at least one weight configuration")
+
+        # Column 0 is the evaluator's own weights, the baseline
+        final, priority, weighted = self._aggregate([{}] + configs)
+        ranks = self._ranks(final)
+        return SweepResult(
+            configs, self.profile_of, self.profile_counts,
+            priority[:, 0], ranks[:, 0],
+            priority[:, 1:], ranks[:, 1:], weighted[:, 1:]
+        )
+
+
+def weight_grid(**ranges: Iterable[float]) -> List[Dict]:
+    """Cartesian product of weight values as sweep configs.
+
+    Keys are 'table__dimension', e.g.
+    weight_grid(value_weights__business_impact=[0.3, 0.4, 0.5]).
+    """
+    axes = []
+    for key, values in ranges.items():
+        table, _, dimension = key.partition('__')
+        if table not in WEIGHT_TABLES or not dimension:
+            raise ValueError(f"bad grid key {key!r}, expected '<table>__<dimension>'")
+        axes.append([(table, dimension, value) for value in values])
+
+    configs = []
+    for combination in product(*axes):
+        config = {}
+        for table, dimension, value in combination:
+            config.setdefault(table, {})[dimension] = value
+        configs.append(config)
+    return configs
+
+
+def _parse_vary(spec: str):
+    """Parse 'table.dimension=start:stop:step' into a grid axis."""
+    name, _, span = spec.partition('=')
+    table, _, dimension = name.partition('.')
+    try:
+        start, stop, step = (float(part) for part in span.split(':'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected table.dimension=start:stop:step, got {spec!r}")
+    values = np.round(np.arange(start, stop + step / 2, step), 6).tolist()
+    return f"{table}__{dimension}", values
+
+
+def main():
+    """Sweep weight ranges over a JSON Lines portfolio and print a summary."""
+    parser = argparse.ArgumentParser(description="Weight sensitivity analysis")
+    parser.add_argument("input", help="Criteria file, one JSON object per line")
+    parser.add_argument("--vary", type=_parse_vary, action="append", required=True,
+                        help="table.dimension=start:stop:step (repeat for a grid)")
+    args = parser.parse_args()
+
+    from scoring_stream import read_jsonl
+
+    try:
+        with open(args.input) as source:
+            engine = SensitivityEngine(list(read_jsonl(source)))
+        result = engine.sweep(weight_grid(**dict(args.vary)))
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(json.dumps(result.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
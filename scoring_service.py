@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+"""
+Asyncio Scoring Service
+
+Long-running HTTP service for project evaluation, answering the
+/api/projects/:id/evaluate calls made by src/services/api.js. One warm
+ProjectEvaluator lives for the life of the process. Concurrent requests
+are queued and micro-batched: whatever is waiting when the scorer comes
+round (up to --max-batch records) is scored in one evaluate_batch() pass.
+
+Endpoints (JSON bodies are criteria dicts as accepted by evaluate_project):
+
+    POST /api/projects/:id/evaluate   score one project
+    POST /api/evaluate                score one criteria dict
+    POST /api/evaluate/batch          JSON array in, JSON array out; or
+                                      NDJSON in (Content-Type:
+                                      application/x-ndjson), NDJSON
+                                      streamed back in input order
+    GET  /api/health                  liveness
+    GET  /api/stats                   queue, batching and p50/p99 latency
+
+The queue is bounded. Single-record requests that find it full get a 503
+with Retry-After; batch requests simply wait for room, which slows the
+client's upload instead of buffering it.
+
+Usage:
+    python scoring_service.py [--host HOST] [--port PORT] [options]
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from scoring_calculator import ProjectEvaluator
+
+DEFAULT_PORT = 8101
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type'
+}
+
+STATUS_TEXT = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    411: 'Length Required', 413: 'Payload Too Large', 500: 'Internal Server Error',
+    503: 'Service Unavailable'
+}
+
+_PROJECT_EVALUATE = re.compile(r'^/api/projects/([^/]+)/evaluate$')
+
+
+class HTTPError(Exception):
+    """A request that ends in an error response."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ServiceBusy(Exception):
+    """The scoring queue is full."""
+
+
+class LatencyTracker:
+    """Sliding window of request latencies with percentile reporting."""
+
+    def __init__(self, window: int = 10000):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def percentiles(self) -> Dict:
+        """p50/p99/max of the window, in milliseconds."""
+        if not self.samples:
+            return {'count': self.count, 'p50_ms': None, 'p99_ms': None, 'max_ms': None}
+        ordered = sorted(self.samples)
+
+        def at(fraction):
+            return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000, 3)
+
+        return {'count': self.count, 'p50_ms': at(0.50), 'p99_ms': at(0.99),
+                'max_ms': round(ordered[-1] * 1000, 3)}
+
+
+class MicroBatcher:
+    """Bounded queue of criteria scored in vectorized batches."""
+
+    def __init__(self, evaluator: ProjectEvaluator, max_batch: int = 1024,
+                 max_delay: float = 0.001, queue_size: int = 10000):
+        self.evaluator = evaluator
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.queue = asyncio.Queue(queue_size)
+        self.batches = 0
+        self.evaluations = 0
+        self.rejected = 0
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def submit_nowait(self, criteria: Dict) -> asyncio.Future:
+        """Queue criteria for scoring; raise ServiceBusy when the queue is full."""
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((criteria, future))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise ServiceBusy()
+        return future
+
+    async def submit(self, criteria: Dict) -> asyncio.Future:
+        """Queue criteria for scoring, waiting for room if the queue is full."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((criteria, future))
+        return future
+
+    async def _next_batch(self) -> List[Tuple[Dict, asyncio.Future]]:
+        """Wait for one item, then take whatever else is queued."""
+        batch = [await self.queue.get()]
+        deadline = time.perf_counter() + self.max_delay
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self.queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            self._score(batch)
+            self.batches += 1
+            self.evaluations += len(batch)
+
+    def _score(self, batch: List[Tuple[Dict, asyncio.Future]]):
+        """Score a batch in one pass; isolate failures record by record.
+
+        evaluate_batch() rejects exactly the criteria evaluate_project()
+        rejects, so the record-by-record retry gives every request the
+        outcome it would get alone, whatever else shared its batch.
+        """
+        try:
+            results = self.evaluator.evaluate_batch([criteria for criteria, _ in batch]).to_dicts()
+        except Exception:
+            results = None
+        for index, (criteria, future) in enumerate(batch):
+            if future.done():
+                continue
+            if results is not None:
+                future.set_result(results[index])
+                continue
+            try:
+                future.set_result(self.evaluator.evaluate_project(criteria))
+            except Exception as e:
+                future.set_exception(HTTPError(400, f"cannot score criteria: {e}"))
+
+
+class ScoringService:
+    """HTTP front end over a MicroBatcher."""
+
+    def __init__(self, evaluator: Optional[ProjectEvaluator] = None, max_batch: int = 1024,
+                 max_delay: float = 0.001, queue_size: int = 10000):
+        self.evaluator = evaluator or ProjectEvaluator()
+        self.batcher = MicroBatcher(self.evaluator, max_batch, max_delay, queue_size)
+        self.sections = {spec.section for spec in self.evaluator.rubric.values()}
+        self.latency = {'single': LatencyTracker(), 'batch': LatencyTracker()}
+        self.requests = 0
+        self.started = time.time()
+
+    # HTTP plumbing
+
+    async def _read_head(self, reader) -> Optional[Tuple[str, str, Dict[str, str]]]:
+        """Read a request line and headers; None when the client hung up."""
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            raise HTTPError(413, "request headers too large")
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, _ = lines[0].split(' ', 2)
+        except ValueError:
+            raise HTTPError(400, "malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+        return method.upper(), target.split('?', 1)[0], headers
+
+    async def _body_chunks(self, reader, headers: Dict[str, str]):
+        """Yield the request body as it arrives (Content-Length or chunked)."""
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                size_line = await reader.readline()
+                try:
+                    size = int(size_line.split(b';', 1)[0].strip(), 16)
+                except ValueError:
+                    raise HTTPError(400, "malformed chunked body")
+                if size == 0:
+                    # Discard trailers up to the final blank line
+                    while (await reader.readline()).strip():
+                        pass
+                    return
+                yield await reader.readexactly(size)
+                await reader.readexactly(2)
+        elif 'content-length' in headers:
+            try:
+                remaining = int(headers['content-length'])
+            except ValueError:
+                raise HTTPError(400, "invalid Content-Length")
+            while remaining > 0:
+                chunk = await reader.read(min(remaining, 1 << 16))
+                if not chunk:
+                    raise HTTPError(400, "body shorter than Content-Length")
+                remaining -= len(chunk)
+                yield chunk
+
+    async def _read_json(self, reader, headers: Dict[str, str]):
+        """Read and parse a whole JSON body."""
+        if 'content-length' not in headers and 'transfer-encoding' not in headers:
+            raise HTTPError(411, "request body required")
+        body = bytearray()
+        async for chunk in self._body_chunks(reader, headers):
+            body += chunk
+            if len(body) > MAX_BODY_BYTES:
+                raise HTTPError(413, "request body too large")
+        try:
+            return json.loads(body)
+        except ValueError as e:
+            raise HTTPError(400, f"invalid JSON ({e})")
+
+    @staticmethod
+    def _head(status: int, content_type: str, extra: Dict[str, str] = None) -> bytes:
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'OK')}",
+                 f"Content-Type: {content_type}"]
+        lines.extend(f"{name}: {value}" for name, value in {**CORS_HEADERS, **(extra or {})}.items())
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+    async def _send_json(self, writer, status: int, payload, extra: Dict[str, str] = None):
+        body = json.dumps(payload).encode('utf-8')
+        writer.write(self._head(status, 'application/json',
+                                {'Content-Length': str(len(body)), **(extra or {})}) + body)
+        await writer.drain()
+
+    # Handlers
+
+    def _check_criteria(self, criteria) -> Dict:
+        if not isinstance(criteria, dict):
+            raise HTTPError(400, "criteria must be a JSON object")
+        return criteria
+
+    async def _evaluate_one(self, reader, headers, project_id: Optional[str] = None) -> Dict:
+        criteria = self._check_criteria(await self._read_json(reader, headers))
+        try:
+            future = self.batcher.submit_nowait(criteria)
+        except ServiceBusy:
+            raise HTTPError(503, "scoring queue is full, retry shortly")
+        evaluation = await future
+        if project_id is None:
+            return {'success': True, 'evaluation': evaluation}
+        return {'success': True, 'projectId': project_id, 'evaluation': evaluation}
+
+    async def _evaluate_array(self, reader, headers) -> Dict:
+        items = await self._read_json(reader, headers)
+        if not isinstance(items, list):
+            raise HTTPError(400, "batch body must be a JSON array (or NDJSON)")
+        futures = []
+        for index, criteria in enumerate(items):
+            if not isinstance(criteria, dict):
+                raise HTTPError(400, f"item {index}: criteria must be a JSON object")
+            futures.append(await self.batcher.submit(criteria))
+
+        evaluations = []
+        for index, future in enumerate(futures):
+            try:
+                evaluations.append(await future)
+            except HTTPError as e:
+                evaluations.append({'error': f"item {index}: {e}"})
+        return {'success': True, 'count': len(evaluations), 'evaluations': evaluations}
+
+    async def _stream_ndjson(self, reader, headers, writer) -> bool:
+        """Score NDJSON lines as they arrive; stream results back in order.
+
+        Non-criteria keys of each line (an id, say) are echoed ahead of the
+        scores; a line that cannot be scored yields {"line": n, "error": ...}.
+        Returns False if the request body was malformed, as the connection
+        cannot be reused then.
+        """
+        writer.write(self._head(200, 'application/x-ndjson', {'Transfer-Encoding': 'chunked'}))
+        pending = asyncio.Queue(self.batcher.max_batch * 2)
+
+        async def produce():
+            buffer = b''
+            line_number = 0
+
+            async def submit(raw: bytes):
+                nonlocal line_number
+                line_number += 1
+                if not raw.strip():
+                    return
+                try:
+                    record = self._check_criteria(json.loads(raw))
+                except (ValueError, HTTPError) as e:
+                    await pending.put((line_number, None, str(e)))
+                    return
+                passthrough = {key: value for key, value in record.items()
+                               if key not in self.sections}
+                await pending.put((line_number, passthrough, await self.batcher.submit(record)))
+
+            try:
+                async for chunk in self._body_chunks(reader, headers):
+                    buffer += chunk
+                    *lines, buffer = buffer.split(b'\n')
+                    for raw in lines:
+                        await submit(raw)
+                await submit(buffer)
+            except (HTTPError, asyncio.IncompleteReadError) as e:
+                # Report the broken body in-band; the headers are already sent
+                await pending.put((None, None, f"request body: {e}"))
+                await pending.put(None)
+                return False
+            await pending.put(None)
+            return True
+
+        producer = asyncio.create_task(produce())
+        try:
+            out = []
+            while True:
+                item = await pending.get()
+                if item is not None:
+                    line_number, passthrough, outcome = item
+                    if line_number is None:
+                        out.append({'error': outcome})
+                    elif passthrough is None:
+                        out.append({'line': line_number, 'error': outcome})
+                    else:
+                        try:
+                            out.append({**passthrough, **(await outcome)})
+                        except HTTPError as e:
+                            out.append({'line': line_number, 'error': str(e)})
+                # Flush whenever we would otherwise wait for more input
+                if out and (item is None or pending.empty() or len(out) >= 1000):
+                    data = ''.join(json.dumps(result) + '\n' for result in out).encode('utf-8')
+                    writer.write(f"{len(data):x}\r\n".encode('latin-1') + data + b'\r\n')
+                    await writer.drain()
+                    out = []
+                if item is None:
+                    break
+            body_ok = await producer
+        finally:
+            producer.cancel()
+        writer.write(b'0\r\n\r\n')
+        await writer.drain()
+        return body_ok
+
+    def stats(self) -> Dict:
+        """Counters and latency percentiles for /api/stats."""
+        uptime = time.time() - self.started
+        batcher = self.batcher
+        return {
+            'success': True,
+            'uptime_seconds': round(uptime, 1),
+            'requests': self.requests,
+            'evaluations': batcher.evaluations,
+            'evaluations_per_sec': round(batcher.evaluations / uptime, 1) if uptime else 0.0,
+            'batches': batcher.batches,
+            'mean_batch_size': round(batcher.evaluations / batcher.batches, 2) if batcher.batches else 0.0,
+            'queue_depth': batcher.queue.qsize(),
+            'queue_size': batcher.queue.maxsize,
+            'rejected': batcher.rejected,
+            'latency': {name: tracker.percentiles() for name, tracker in self.latency.items()}
+        }
+
+    async def _dispatch(self, method: str, path: str, headers: Dict[str, str],
+                        reader, writer) -> bool:
+        """Route one request and write its response; False closes the connection."""
+        if method == 'OPTIONS':
+            writer.write(self._head(200, 'text/plain', {'Content-Length': '0'}))
+            return True
+
+        match = _PROJECT_EVALUATE.match(path)
+        if match or path in ('/api/evaluate', '/api/evaluate/batch'):
+            if method != 'POST':
+                raise HTTPError(405, "use POST")
+            start = time.perf_counter()
+            if path == '/api/evaluate/batch':
+                if 'ndjson' in headers.get('content-type', ''):
+                    if not await self._stream_ndjson(reader, headers, writer):
+                        return False
+                else:
+                    await self._send_json(writer, 200, await self._evaluate_array(reader, headers))
+                self.latency['batch'].record(time.perf_counter() - start)
+            else:
+                project_id = match.group(1) if match else None
+                await self._send_json(writer, 200,
+                                      await self._evaluate_one(reader, headers, project_id))
+                self.latency['single'].record(time.perf_counter() - start)
+        elif path == '/api/health' and method == 'GET':
+            await self._send_json(writer, 200, {
+                'success': True,
+                'status': 'healthy',
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                'queue_depth': self.batcher.queue.qsize()
+            })
+        elif path == '/api/stats' and method == 'GET':
+            await self._send_json(writer, 200, self.stats())
+        else:
+            raise HTTPError(404, "not found")
+        return True
+
+    async def handle_connection(self, reader, writer):
+        """Serve keep-alive requests on one connection until it closes."""
+        try:
+            while True:
+                try:
+                    request = await self._read_head(reader)
+                    if request is None:
+                        break
+                    method, path, headers = request
+                    self.requests += 1
+                    if not await self._dispatch(method, path, headers, reader, writer):
+                        break
+                except HTTPError as e:
+                    extra = {'Retry-After': '1'} if e.status == 503 else {}
+                    # The body may be half read; close after an error
+                    extra['Connection'] = 'close'
+                    await self._send_json(writer, e.status, {'success': False, 'error': str(e)}, extra)
+                    break
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT,
+                    report_interval: float = 0):
+        """Run until cancelled; optionally print stats every report_interval seconds."""
+        self.batcher.start()
+        server = await asyncio.start_server(self.handle_connection, host, port,
+                                            limit=MAX_HEADER_BYTES)
+        print(f"🚀 Scoring service running on http://{host}:{port}/api/evaluate", file=sys.stderr)
+        try:
+            async with server:
+                if report_interval > 0:
+                    while True:
+                        await asyncio.sleep(report_interval)
+                        self._report()
+                else:
+                    await server.serve_forever()
+        finally:
+            await self.batcher.stop()
+
+    def _report(self):
+        stats = self.stats()
+        single = stats['latency']['single']
+        print(f"📊 {stats['evaluations']} evaluations, {stats['evaluations_per_sec']}/s, "
+              f"mean batch {stats['mean_batch_size']}, queue {stats['queue_depth']}, "
+              f"p50 {single['p50_ms']}ms, p99 {single['p99_ms']}ms", file=sys.stderr)
+
+
+def main():
+    """Start the scoring service."""
+    parser = argparse.ArgumentParser(description="Asyncio project scoring service")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT,
+                        help=f"Port (default: {DEFAULT_PORT})")
+    parser.add_argument("--max-batch", type=int, default=1024,
+                        help="Most records scored in one pass (default: 1024)")
+    parser.add_argument("--max-delay-ms", type=float, default=1.0,
+                        help="How long a batch waits to fill up (default: 1ms)")
+    parser.add_argument("--queue-size", type=int, default=10000,
+                        help="Queued records before single requests get 503 (default: 10000)")
+    parser.add_argument("--report-interval", type=float, default=0,
+                        help="Print stats every N seconds (default: off)")
+    args = parser.parse_args()
+
+    service = ScoringService(max_batch=args.max_batch, max_delay=args.max_delay_ms / 1000,
+                             queue_size=args.queue_size)
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.report_interval))
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping scoring service", file=sys.stderr)
+    except OSError as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Binary Criteria Store
+
+Fixed-width binary encoding of the criteria ProjectEvaluator reads, for
+replaying scoring over archives of millions of snapshots without parsing
+JSON. Each record is one row of a NumPy structured dtype with one column
+per rubric field, named by its dotted path ('technical.integration_count'):
+
+    categorical fields   uint8 code: 0 = missing, 1..n = the rubric's values
+                         in order, 255 = any value outside the rubric
+    numeric fields       int16; -32768 = missing
+
+plus, optionally, a fixed-width UTF-8 project id. A file is a short header
+(magic, then the JSON schema with every field's vocabulary, padded to 64
+bytes) followed by the records, and is append-only: new records are
+written at the end under an exclusive lock. Readers ignore a torn trailing
+record; the next append cuts it off before writing.
+
+Stores are read memory-mapped. evaluate_batch() accepts a store, or a
+slice of one from store.block(), and scores it straight from the codes:
+each field becomes a points table indexed by code, so no per-record Python
+objects are created. Rubric fields missing from the store score their
+default, so an archive can be replayed under a newer rubric template.
+
+Values outside the rubric vocabulary are all stored as code 255 and come
+back from to_dicts() as OTHER, which scores the same fallback points.
+Numeric values must be whole numbers that fit in int16.
+
+Usage:
+    python scoring_store.py import criteria.jsonl archive.crit --id-width 32
+    python scoring_store.py score archive.crit [--rubric rubric-v2.json]
+    python scoring_store.py export archive.crit criteria.jsonl
+"""
+
+import argparse
+import json
+import operator
+import os
+import struct
+import sys
+import time
+from itertools import islice, repeat
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional
+
+import numpy as np
+
+from scoring_calculator import PRIORITY_LEVELS, ProjectEvaluator
+
+MAGIC = b'PECRIT01'
+STORE_VERSION = 1
+
+OTHER_CODE = 255
+OTHER = '<other>'
+MISSING_NUMBER = -32768
+NUMBER_RANGE = (-32767, 32767)
+
+_ALIGN = 64
+_EMPTY = {}
+
+
+def schema_from_rubric(rubric: Mapping, id_width: int = 0) -> Dict:
+    """Store schema for a compiled rubric (ProjectEvaluator.rubric)."""
+    fields = []
+    for spec in rubric.values():
+        for field in spec.categorical:
+            vocabulary = list(field.scores)
+            if len(vocabulary) >= OTHER_CODE:
+                raise ValueError(f"{spec.section}.{field.name}: too many values for a uint8 code")
+            fields.append({'section': spec.section, 'name': field.name,
+                           'kind': 'categorical', 'vocabulary': vocabulary})
+        for field in spec.ladders:
+            fields.append({'section': spec.section, 'name': field.name, 'kind': 'number'})
+    return {'version': STORE_VERSION, 'id_width': id_width, 'fields': fields}
+
+
+def record_dtype(schema: Dict) -> np.dtype:
+    """The packed structured dtype of one stored record."""
+    columns = []
+    if schema['id_width']:
+        columns.append(('id', f"S{schema['id_width']}"))
+    for field in schema['fields']:
+        kind = np.uint8 if field['kind'] == 'categorical' else np.int16
+        columns.append((f"{field['section']}.{field['name']}", kind))
+    return np.dtype(columns)
+
+
+def encode_records(schema: Dict, records: List[Dict], id_key: str = 'id') -> np.ndarray:
+    """Nested criteria dicts -> structured array of the store's dtype."""
+    count = len(records)
+    encoded = np.zeros(count, dtype=record_dtype(schema))
+    if schema['id_width']:
+        ids = [str(record.get(id_key, '')).encode() for record in records]
+        longest = max(map(len, ids), default=0)
+        if longest > schema['id_width']:
+            raise ValueError(f"an id is {longest} bytes, the store holds {schema['id_width']}")
+        encoded['id'] = ids
+
+    sections = {}
+    for field in schema['fields']:
+        section = field['section']
+        if section not in sections:
+            sections[section] = list(map(dict.get, records, repeat(section), repeat(_EMPTY)))
+        values = map(dict.get, sections[section], repeat(field['name']))
+        column = f"{section}.{field['name']}"
+        if field['kind'] == 'categorical':
+            codes = {value: code for code, value in enumerate(field['vocabulary'], 1)}
+            codes[None] = 0
+            try:
+                encoded[column] = np.fromiter(map(codes.get, values, repeat(OTHER_CODE)),
+                                              dtype=np.uint8, count=count)
+            except TypeError:
+                raise ValueError(f"{column}: unhashable value")
+            continue
+        values = list(values)
+        if any(map(isinstance, values, repeat((str, bytes)))):
+            raise ValueError(f"{column}: values must be numbers")
+        missing = np.fromiter(map(operator.is_, values, repeat(None)), dtype=bool, count=count)
+        try:
+            numbers = np.fromiter((0 if value is None else value for value in values),
+                                  dtype=np.float64, count=count)
+        except (TypeError, ValueError):
+            raise ValueError(f"{column}: values must be numbers")
+        # NaN fails the whole-number test: the int16 column has no room for it
+        present = numbers[~missing]
+        bad = (present != np.round(present)) | (present < NUMBER_RANGE[0]) | (present > NUMBER_RANGE[1])
+        if bad.any():
+            raise ValueError(f"{column}: {float(present[bad][0])} is not a whole number in {NUMBER_RANGE}")
+        encoded[column] = np.where(missing, MISSING_NUMBER, numbers).astype(np.int16)
+    return encoded
+
+
+def decode_records(schema: Dict, encoded: np.ndarray, id_key: str = 'id') -> Iterator[Dict]:
+    """Structured records -> nested criteria dicts; missing fields are left out."""
+    columns = []
+    for field in schema['fields']:
+        values = encoded[f"{field['section']}.{field['name']}"].tolist()
+        if field['kind'] == 'categorical':
+            vocabulary = [None] + field['vocabulary'] + [OTHER] * (OTHER_CODE - len(field['vocabulary']))
+            values = [vocabulary[code] for code in values]
+        else:
+            values = [None if value == MISSING_NUMBER else value for value in values]
+        columns.append((field['section'], field['name'], values))
+    ids = encoded['id'].tolist() if schema['id_width'] else None
+
+    for index in range(len(encoded)):
+        record = {id_key: ids[index].decode()} if ids is not None else {}
+        for section, name, values in columns:
+            value = values[index]
+            if value is not None:
+                record.setdefault(section, {})[name] = value
+        yield record
+
+
+def _lock(handle):
+    """Lock an open store file exclusively until it is closed; a no-op without fcntl."""
+    try:
+        import fcntl
+    except ImportError:
+        return
+    fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+
+
+class CriteriaBlock:
+    """A contiguous run of stored records; evaluate_batch() accepts it."""
+
+    def __init__(self, store: 'CriteriaStore', start: int, stop: int):
+        self.store = store
+        self.start = start
+        self.stop = stop
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def dimension_totals(self, rubric: Mapping) -> Dict[str, np.ndarray]:
+        return self.store.dimension_totals(rubric, self.start, self.stop)
+
+
+class CriteriaStore:
+    """Append-only, memory-mapped file of fixed-width criteria records."""
+
+    def __init__(self, path: str, schema: Dict, data_offset: int):
+        self.path = path
+        self.schema = schema
+        self.dtype = record_dtype(schema)
+        self.data_offset = data_offset
+        self._records = None
+        self._tables = {}
+
+    @classmethod
+    def create(cls, path: str, rubric: Mapping = None, id_width: int = 0) -> 'CriteriaStore':
+        """Start a new, empty store for a compiled rubric (the built-in one by default)."""
+        schema = schema_from_rubric(rubric if rubric is not None else ProjectEvaluator().rubric,
+                                    id_width)
+        header = json.dumps(schema).encode()
+        prefix = len(MAGIC) + 4
+        header += b' ' * (-(prefix + len(header)) % _ALIGN)
+        with open(path, 'wb') as handle:
+            handle.write(MAGIC + struct.pack('<I', len(header)) + header)
+        return cls(path, schema, prefix + len(header))
+
+    @classmethod
+    def open(cls, path: str) -> 'CriteriaStore':
+        """Open an existing store; a torn trailing record is left for extend() to repair."""
+        with open(path, 'rb') as handle:
+            if handle.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path}: not a criteria store")
+            (length,) = struct.unpack('<I', handle.read(4))
+            schema = json.loads(handle.read(length))
+        if schema.get('version') != STORE_VERSION:
+            raise ValueError(f"{path}: unsupported store version {schema.get('version')}")
+        return cls(path, schema, len(MAGIC) + 4 + length)
+
+    def __len__(self) -> int:
+        """Whole records in the file; a partly written one is not counted."""
+        return (os.path.getsize(self.path) - self.data_offset) // self.dtype.itemsize
+
+    @property
+    def records(self) -> np.ndarray:
+        """All records, memory-mapped read-only."""
+        count = len(self)
+        if self._records is None or len(self._records) != count:
+            if count == 0:
+                return np.zeros(0, dtype=self.dtype)
+            self._records = np.memmap(self.path, dtype=self.dtype, mode='r',
+                                      offset=self.data_offset, shape=(count,))
+        return self._records
+
+    def extend(self, records: Iterable[Dict], id_key: str = 'id', chunk_size: int = 100000) -> int:
+        """Encode and append criteria dicts; returns how many were written.
+
+        Appends are serialized with an exclusive lock. A torn trailing record
+        can only be a crashed append then, so it is cut off here; a reader
+        could not tell it from one still being written.
+        """
+        written = 0
+        records = iter(records)
+        with open(self.path, 'r+b') as handle:
+            _lock(handle)
+            size = handle.seek(0, os.SEEK_END)
+            torn = (size - self.data_offset) % self.dtype.itemsize
+            if torn:
+                handle.truncate(size - torn)
+                handle.seek(size - torn)
+            while True:
+                chunk = list(islice(records, chunk_size))
+                if not chunk:
+                    break
+                handle.write(encode_records(self.schema, chunk, id_key).tobytes())
+                written += len(chunk)
+        return written
+
+    def append(self, record: Dict, id_key: str = 'id'):
+        self.extend([record], id_key)
+
+    def block(self, start: int = 0, stop: Optional[int] = None) -> CriteriaBlock:
+        """Records start..stop as something evaluate_batch() can score."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        return CriteriaBlock(self, start, stop)
+
+    def blocks(self, size: int = 1000000) -> Iterator[CriteriaBlock]:
+        count = len(self)
+        for start in range(0, count, size):
+            yield CriteriaBlock(self, start, min(start + size, count))
+
+    def to_dicts(self, start: int = 0, stop: Optional[int] = None,
+                 id_key: str = 'id') -> Iterator[Dict]:
+        """Decode records back to the nested criteria dict format."""
+        return decode_records(self.schema, self.records[start:stop], id_key)
+
+    def _points_tables(self, rubric: Mapping):
+        """Per stored field: (column, dimension, points by code or ladder)."""
+        key = id(rubric)
+        cached = self._tables.get(key)
+        if cached is not None and cached[0] is rubric:
+            return cached[1]
+
+        stored = {(field['section'], field['name']): field for field in self.schema['fields']}
+        tables = []
+        for dimension, spec in rubric.items():
+            for field in spec.categorical:
+                schema_field = stored.get((spec.section, field.name))
+                if schema_field is None or schema_field['kind'] != 'categorical':
+                    tables.append((None, dimension, field.lookup(field.default, field.fallback)))
+                    continue
+                vocabulary = [field.default] + schema_field['vocabulary']
+                points = np.full(256, field.fallback, dtype=np.int16)
+                points[:len(vocabulary)] = [field.lookup(value, field.fallback) for value in vocabulary]
+                tables.append((f"{spec.section}.{field.name}", dimension, points))
+            for field in spec.ladders:
+                schema_field = stored.get((spec.section, field.name))
+                if schema_field is None or schema_field['kind'] != 'number':
+                    default_points = field.score(field.default)
+                    tables.append((None, dimension, default_points))
+                    continue
+                tables.append((f"{spec.section}.{field.name}", dimension, field))
+        self._tables[key] = (rubric, tables)
+        return tables
+
+    def dimension_totals(self, rubric: Mapping, start: int = 0,
+                         stop: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Raw per-dimension point totals for scoring_batch.evaluate_totals()."""
+        records = self.records[start:stop]
+        count = len(records)
+        totals = {dimension: np.ones(count, dtype=np.int16) for dimension in rubric}
+        for column, dimension, points in self._points_tables(rubric):
+            if column is None:
+                totals[dimension] += points
+            elif isinstance(points, np.ndarray):
+                totals[dimension] += points[records[column]]
+            else:
+                numbers = records[column]
+                numbers = np.where(numbers == MISSING_NUMBER, points.default, numbers)
+                index = np.searchsorted(np.asarray(points.breakpoints, dtype=np.float64),
+                                        numbers, side=points.side)
+                totals[dimension] += np.asarray(points.points, dtype=np.int16)[index]
+        return totals
+
+
+def main():
+    """Import criteria into a store, replay scoring over it, or export it."""
+    parser = argparse.ArgumentParser(description="Binary criteria store")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser("import", help="Append JSON Lines criteria to a store")
+    importer.add_argument("input", help="Criteria file (.jsonl)")
+    importer.add_argument("store", help="Store file; created if missing")
+    importer.add_argument("--id-key", default="id", help="Record id key (default: id)")
+    importer.add_argument("--id-width", type=int, default=0,
+                          help="Bytes kept per id in a new store; 0 stores no ids")
+
+    scorer = commands.add_parser("score", help="Score every stored record")
+    scorer.add_argument("store", help="Store file")
+    scorer.add_argument("--rubric", metavar="TEMPLATE", help="Replay under a rubric template")
+    scorer.add_argument("--block-size", type=int, default=1000000,
+                        help="Records per batch (default: 1000000)")
+
+    exporter = commands.add_parser("export", help="Write a store back as JSON Lines")
+    exporter.add_argument("store", help="Store file")
+    exporter.add_argument("output", help="Output file (.jsonl)")
+    exporter.add_argument("--id-key", default="id", help="Record id key (default: id)")
+
+    args = parser.parse_args()
+
+    from scoring_stream import read_jsonl
+
+    try:
+        start = time.perf_counter()
+        if args.command == "import":
+            if os.path.exists(args.store):
+                store = CriteriaStore.open(args.store)
+            else:
+                store = CriteriaStore.create(args.store, id_width=args.id_width)
+            with open(args.input) as source:
+                count = store.extend(read_jsonl(source), args.id_key)
+            print(f"✅ Appended {count} records ({store.dtype.itemsize} bytes each); "
+                  f"{len(store)} in store, {time.perf_counter() - start:.2f}s", file=sys.stderr)
+        elif args.command == "score":
+            store = CriteriaStore.open(args.store)
+            if args.rubric:
+                from scoring_rubric import load_rubric
+                evaluator = load_rubric(args.rubric).evaluator()
+            else:
+                evaluator = ProjectEvaluator()
+            counts = np.zeros(len(PRIORITY_LEVELS), dtype=np.int64)
+            for block in store.blocks(args.block_size):
+                batch = evaluator.evaluate_batch(block)
+                counts += np.bincount(batch.priority_codes, minlength=len(PRIORITY_LEVELS))
+            elapsed = time.perf_counter() - start
+            for label, count in zip(PRIORITY_LEVELS, counts.tolist()):
+                print(f"  {count:>10}  {label}")
+            rate = len(store) / elapsed if elapsed > 0 else 0.0
+            print(f"✅ Scored {len(store)} records in {elapsed:.2f}s ({rate:,.0f} records/sec)",
+                  file=sys.stderr)
+        else:
+            store = CriteriaStore.open(args.store)
+            with open(args.output, 'w') as sink:
+                for record in store.to_dicts(id_key=args.id_key):
+                    sink.write(json.dumps(record) + '\n')
+            print(f"✅ Exported {len(store)} records in {time.perf_counter() - start:.2f}s",
+                  file=sys.stderr)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
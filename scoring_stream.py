@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Streaming Criteria I/O
+
+Generator pipeline behind the scoring_calculator.py command line: criteria
+records are read lazily from JSON Lines or CSV, scored one at a time and
+written back in the same format in fixed-size chunks, so memory use does
+not grow with the size of the input.
+
+CSV files use dotted column names for nested fields, e.g.
+'technical.integration_count'; result columns are flattened the same way
+('dimension_scores.business_impact'). Input columns or top-level JSON keys
+that are not criteria sections (an id or name, say) are copied through to
+the output ahead of the scores.
+"""
+
+import csv
+import json
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+from scoring_calculator import DIMENSIONS
+
+FORMATS = ('jsonl', 'csv')
+
+# Flattened evaluate_project() result, in its key order
+SCORE_COLUMNS = (
+    *(f"dimension_scores.{dimension}" for dimension in DIMENSIONS),
+    *(f"weighted_scores.{dimension}" for dimension in DIMENSIONS),
+    'risk_score', 'value_score', 'final_score', 'priority'
+)
+
+
+def detect_format(path: str) -> str:
+    """Guess the record format from a file name; JSON Lines by default."""
+    return 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+
+def read_jsonl(stream: TextIO, first_line: int = 1) -> Iterator[Dict]:
+    """Yield one criteria dict per non-blank JSON line."""
+    for line_number, line in enumerate(stream, first_line):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"line {line_number}: invalid JSON ({e})")
+        if not isinstance(record, dict):
+            raise ValueError(f"line {line_number}: expected a JSON object")
+        yield record
+
+
+def _to_number(value: str):
+    """Parse a CSV cell as an int when possible, otherwise as a float."""
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def records_from_rows(rows: Iterable[Dict], numeric_columns: Iterable[str] = (),
+                      first_row: int = 2, sections: Optional[Iterable[str]] = None) -> Iterator[Dict]:
+    """Turn flat rows with dotted keys into nested criteria dicts.
+
+    Empty cells are left out so the rubric default applies; cells in
+    numeric_columns are parsed as numbers. If the criteria sections are
+    given, empty cells of other columns are kept as ''.
+    """
+    numeric_columns = set(numeric_columns)
+    sections = None if sections is None else set(sections)
+    for row_number, row in enumerate(rows, first_row):
+        record = {}
+        for column, value in row.items():
+            if column is None or value is None:
+                continue
+            if value == '' and (sections is None or column.split('.', 1)[0] in sections):
+                continue
+            if column in numeric_columns:
+                try:
+                    value = _to_number(value)
+                except ValueError:
+                    raise ValueError(f"row {row_number}: {column} is not a number: {value!r}")
+            target = record
+            *parents, name = column.split('.')
+            for parent in parents:
+                target = target.setdefault(parent, {})
+            target[name] = value
+        yield record
+
+
+def read_csv(stream: TextIO, numeric_columns: Iterable[str] = ()) -> Iterator[Dict]:
+    """Yield nested criteria dicts from a CSV file with dotted headers."""
+    return records_from_rows(csv.DictReader(stream), numeric_columns)
+
+
+def numeric_fields(evaluator) -> List[str]:
+    """Dotted names of the rubric fields that hold numbers."""
+    return [
+        f"{spec.section}.{field.name}"
+        for spec in evaluator.rubric.values()
+        for field in spec.ladders
+    ]
+
+
+def criteria_sections(evaluator) -> List[str]:
+    """Top-level criteria keys the evaluator reads."""
+    return [spec.section for spec in evaluator.rubric.values()]
+
+
+def csv_columns(evaluator, header: Iterable[str]) -> List[str]:
+    """Output columns for a CSV input header: passthrough columns, then scores.
+
+    Fixed by the header rather than by any one row, so a passthrough cell
+    that is empty in the first row keeps its column in every row.
+    """
+    sections = set(criteria_sections(evaluator))
+    passthrough = [column for column in header
+                   if column is not None and column.split('.', 1)[0] not in sections]
+    return list(dict.fromkeys(passthrough + list(SCORE_COLUMNS)))
+
+
+def flatten(record: Dict, prefix: str = '') -> Dict:
+    """Flatten nested dicts into one level with dotted keys."""
+    flat = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        else:
+            flat[name] = value
+    return flat
+
+
+def score_records(evaluator, records: Iterable[Dict]) -> Iterator[Dict]:
+    """Evaluate records lazily, carrying non-criteria keys through."""
+    sections = set(criteria_sections(evaluator))
+    for record in records:
+        passthrough = {key: value for key, value in record.items() if key not in sections}
+        yield {**passthrough, **evaluator.evaluate_project(record)}
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[List]:
+    """Group an iterable into lists of at most size items."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def write_jsonl(results: Iterable[Dict], stream: TextIO, chunk_size: int) -> int:
+    """Write results as JSON Lines, one chunk per write; return the count."""
+    count = 0
+    for chunk in chunked(results, chunk_size):
+        stream.write(''.join(json.dumps(result) + '\n' for result in chunk))
+        stream.flush()
+        count += len(chunk)
+    return count
+
+
+def write_csv(results: Iterable[Dict], stream: TextIO, chunk_size: int,
+              header: bool = True, columns: Optional[List[str]] = None) -> int:
+    """Write flattened results as CSV, one chunk per write; return the count.
+
+    Columns are taken from the first result unless given (see csv_columns());
+    cells missing from a row are written empty.
+    """
+    count = 0
+    writer = None
+    for chunk in chunked(results, chunk_size):
+        rows = [flatten(result) for result in chunk]
+        if writer is None:
+            writer = csv.DictWriter(stream, fieldnames=columns or list(rows[0]),
+                                    extrasaction='ignore')
+            if header:
+                writer.writeheader()
+        writer.writerows(rows)
+        stream.flush()
+        count += len(rows)
+    return count
+
+
+def score_stream(evaluator, source: TextIO, sink: TextIO, fmt: str = 'jsonl',
+                 chunk_size: int = 1000) -> int:
+    """Read, score and write a whole stream; return the number of records."""
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown format {fmt!r}, expected one of {FORMATS}")
+    if chunk_size < 1:
+        raise ValueError("chunk size must be at least 1")
+
+    columns = None
+    if fmt == 'csv':
+        reader = csv.DictReader(source)
+        columns = csv_columns(evaluator, reader.fieldnames or ())
+        records = records_from_rows(reader, numeric_fields(evaluator),
+                                    sections=criteria_sections(evaluator))
+    else:
+        records = read_jsonl(source)
+
+    # An instrumented evaluator also gets the parse and write time
+    instrumentation = getattr(evaluator, 'instrumentation', None)
+    if instrumentation is not None:
+        records = instrumentation.timed_iter('read_records', records)
+        sink = instrumentation.timed_sink('write_records', sink)
+
+    results = score_records(evaluator, records)
+    if fmt == 'csv':
+        return write_csv(results, sink, chunk_size, columns=columns)
+    return write_jsonl(results, sink, chunk_size)
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo Uncertainty Scoring
+
+Intake criteria are often estimates. Here any criteria field may be given
+as a distribution instead of a single value:
+
+    {'range': [low, high]}               uniform
+    {'triangular': [low, mode, high]}
+    {'normal': [mean, sd]}               optionally with 'min' / 'max' bounds
+    {'choices': {'high': 0.7, 'medium': 0.3}}   weighted choices
+
+Numeric draws are rounded to whole numbers, because every ladder field is
+a count or a whole percentage. A range then picks each whole number in it
+with equal chance. Pass 'round': False to keep draws continuous. Plain
+values stay fixed.
+
+Draws are scored as arrays, straight to rubric points, and finished by
+the batch engine's aggregation tables, so 10k draws cost a handful of
+array operations rather than 10k evaluate_project() calls. Each project
+gets its own random stream spawned from the seed, so its results do not
+depend on the rest of the portfolio.
+"""
+
+import math
+from typing import Dict, Iterable, Iterator
+
+import numpy as np
+
+from scoring_batch import evaluate_totals, ladder_points
+from scoring_calculator import PRIORITY_LEVELS
+
+DISTRIBUTIONS = ('range', 'triangular', 'normal', 'choices')
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+class UncertaintyResult:
+    """Sampled score distributions for one project."""
+
+    def __init__(self, risk_score: np.ndarray, value_score: np.ndarray,
+                 final_score: np.ndarray, priority_codes: np.ndarray):
+        self.risk_score = risk_score
+        self.value_score = value_score
+        self.final_score = final_score
+        self.priority_codes = priority_codes
+
+    def __len__(self) -> int:
+        return len(self.priority_codes)
+
+    def priority_probabilities(self) -> Dict[str, float]:
+        """Share of draws landing in each priority bucket."""
+        counts = np.bincount(self.priority_codes, minlength=len(PRIORITY_LEVELS))
+        return dict(zip(PRIORITY_LEVELS, (counts / len(self)).tolist()))
+
+    def distribution(self, name: str) -> Dict[str, float]:
+        """Mean, spread and percentiles of 'risk_score', 'value_score' or 'final_score'."""
+        samples = getattr(self, name)
+        percentiles = np.percentile(samples, PERCENTILES)
+        stats = {
+            'mean': float(samples.mean()),
+            'std': float(samples.std()),
+            'min': float(samples.min()),
+            'max': float(samples.max())
+        }
+        stats.update((f"p{q}", float(value)) for q, value in zip(PERCENTILES, percentiles))
+        return stats
+
+    def summary(self) -> Dict:
+        """JSON-serializable digest of all distributions."""
+        return {
+            'draws': len(self),
+            'risk_score': self.distribution('risk_score'),
+            'value_score': self.distribution('value_score'),
+            'final_score': self.distribution('final_score'),
+            'priority_probabilities': self.priority_probabilities()
+        }
+
+
+def _choices(spec: Dict, where: str, rng, draws: int):
+    """Draw from weighted choices; return (values, index of the value per draw).
+
+    Choices are a mapping of value to weight or a list of [value, weight]
+    pairs; weights need not sum to one.
+    """
+    choices = spec['choices']
+    pairs = list(choices.items()) if isinstance(choices, dict) else [tuple(p) for p in choices]
+    if not pairs:
+        raise ValueError(f"{where}: choices must not be empty")
+    values, weights = zip(*pairs)
+    weights = np.asarray(weights, dtype=np.float64)
+    if (weights < 0).any() or weights.sum() <= 0:
+        raise ValueError(f"{where}: choice weights must be non-negative and not all zero")
+    return values, rng.choice(len(values), size=draws, p=weights / weights.sum())
+
+
+def _numeric(spec: Dict, where: str, rng, draws: int) -> np.ndarray:
+    """Draw a numeric field from a range, triangular or normal spec."""
+    whole = spec.get('round', True)
+    try:
+        if 'range' in spec:
+            low, high = map(float, spec['range'])
+            if low > high:
+                raise ValueError("low must not exceed high")
+            if whole:
+                return rng.integers(math.ceil(low), math.floor(high), endpoint=True,
+                                    size=draws).astype(np.float64)
+            samples = rng.uniform(low, high, draws)
+        elif 'triangular' in spec:
+            low, mode, high = map(float, spec['triangular'])
+            samples = rng.triangular(low, mode, high, draws)
+        else:
+            mean, sd = map(float, spec['normal'])
+            samples = rng.normal(mean, sd, draws)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"{where}: bad distribution {spec!r} ({e})")
+
+    if 'min' in spec or 'max' in spec:
+        samples = np.clip(samples, spec.get('min', -np.inf), spec.get('max', np.inf))
+    return np.rint(samples) if whole else samples
+
+
+def _distribution_kind(spec: Dict, where: str) -> str:
+    kinds = [kind for kind in DISTRIBUTIONS if kind in spec]
+    if len(kinds) != 1:
+        raise ValueError(f"{where}: give exactly one of {', '.join(DISTRIBUTIONS)}")
+    return kinds[0]
+
+
+def _categorical_points(field, value, where: str, rng, draws: int):
+    """Points of a categorical field: a scalar if fixed, else one per draw."""
+    if not isinstance(value, dict):
+        return field.lookup(value, field.fallback)
+    if _distribution_kind(value, where) != 'choices':
+        raise ValueError(f"{where}: categorical fields take 'choices' only")
+    values, picks = _choices(value, where, rng, draws)
+    points = np.array([field.lookup(choice, field.fallback) for choice in values], dtype=np.int16)
+    return points[picks]
+
+
+def _ladder_points(field, value, where: str, rng, draws: int):
+    """Points of a numeric ladder field: a scalar if fixed, else one per draw."""
+    if not isinstance(value, dict):
+        return field.score(value)
+    if _distribution_kind(value, where) == 'choices':
+        values, picks = _choices(value, where, rng, draws)
+        try:
+            samples = np.asarray(values, dtype=np.float64)[picks]
+        except ValueError:
+            raise ValueError(f"{where}: numeric choices must be numbers")
+    else:
+        samples = _numeric(value, where, rng, draws)
+    return ladder_points(field, samples)
+
+
+def sample_totals(rubric, criteria: Dict, draws: int, rng) -> Dict[str, np.ndarray]:
+    """Draw one project's criteria and sum rubric points per dimension.
+
+    Fields are scored straight to points: a categorical choice is looked
+    up once per distinct value, not once per draw, and fixed fields add a
+    constant.
+    """
+    totals = {}
+    for dimension, spec in rubric.items():
+        section = criteria.get(spec.section, {})
+        total = np.ones(draws, dtype=np.int16)
+        for field in spec.categorical:
+            total += _categorical_points(field, section.get(field.name, field.default),
+                                         f"{spec.section}.{field.name}", rng, draws)
+        for field in spec.ladders:
+            total += _ladder_points(field, section.get(field.name, field.default),
+                                    f"{spec.section}.{field.name}", rng, draws)
+        totals[dimension] = total
+    return totals
+
+
+def evaluate_uncertain_many(evaluator, projects: Iterable[Dict], draws: int = 10000,
+                            seed: int = 42) -> Iterator[UncertaintyResult]:
+    """Yield one UncertaintyResult per project, in order.
+
+    Project i always draws from the i-th stream spawned from seed, and
+    only one project's draws are held at a time.
+    """
+    if draws < 1:
+        raise ValueError("draws must be at least 1")
+    seeds = np.random.SeedSequence(seed)
+    for project in projects:
+        rng = np.random.default_rng(seeds.spawn(1)[0])
+        result = evaluate_totals(evaluator, sample_totals(evaluator.rubric, project, draws, rng))
+        yield UncertaintyResult(result.risk_score, result.value_score,
+                                result.final_score, result.priority_codes)
+
+
+def evaluate_uncertain(evaluator, criteria: Dict, draws: int = 10000,
+                       seed: int = 42) -> UncertaintyResult:
+    """Sample one project's criteria and return its score distributions."""
+    return next(evaluate_uncertain_many(evaluator, [criteria], draws, seed))
@@ -56,6 +56,15 @@ class APIService {
     })
   }
 
+  // Precomputed rollups (portfolio_rollup.py): kind is portfolio, department, category or priority
+  async getRollups(kind) {
+    return this.request(kind ? `/rollups/${encodeURIComponent(kind)}` : '/rollups')
+  }
+
+  async getRollup(kind, key) {
+    return this.request(`/rollups/${encodeURIComponent(kind)}/${encodeURIComponent(key)}`)
+  }
+
   // Evaluations
   async evaluateProject(projectId, evaluationData) {
     return this.request(`/projects/${projectId}/evaluate`, {
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Incremental Test Discovery
+
+Python counterpart of scripts/discover-tests.js: same IGNORE_DIRS,
+TEST_PATTERNS, depth limit and categories, writing the same
+test-registry.json layout, but with every path relative (fullPath and
+projectRoot are relative to the registry's directory) so a registry works
+on any checkout.
+
+A directory's mtime changes whenever an entry is added, removed or renamed
+in it, so discovery keeps a persistent index of every scanned directory:
+its mtime, subdirectories and test files. On re-discovery a directory
+whose mtime is unchanged reuses its indexed listing, and the walk costs one
+stat() per directory instead of a listing of every file. Directories
+modified within RACY_SECONDS of a scan are always re-listed next time,
+since a change in the same clock tick would not move their mtime.
+
+Usage:
+    python discover_tests.py [options] [project-dirs...]
+
+Options:
+    -o, --output DIR    Where to write test-registry.json (default: current dir)
+    --index PATH        Directory index (default: OUTPUT/.test-discovery-index.json)
+    --full              Ignore the index and re-list every directory
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from typing import Optional, Dict, List, Tuple
+
+TEST_FILE_PATTERNS = [
+    re.compile(pattern) for pattern in (
+        r"\.test\.[jt]sx?$",
+        r"\.spec\.[jt]sx?$",
+        r"^test[-_]",
+        r"_test\.[jt]sx?$",
+        r"\.test\.py$",
+        r"^test_.*\.py$",
+        r"\.test\.cjs$",
+        r"\.test\.mjs$",
+        r"\.test\.html$",
+    )
+]
+
+TEST_DIRECTORIES = ["test", "tests", "__tests__", "spec", "specs", "e2e", "integration"]
+
+IGNORE_DIRS = {
+    "node_modules", ".git", ".venv", "venv", "env", "__pycache__", "dist", "build",
+    "coverage", ".nyc_output", ".pytest_cache", "vendor", "bower_components",
+    ".next", ".nuxt", "out",
+}
+
+VALID_EXTENSIONS = (".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs", ".py", ".html", ".test", ".spec")
+
+MAX_DEPTH = 10
+INDEX_FILE = ".test-discovery-index.json"
+INDEX_VERSION = 1
+RACY_SECONDS = 2
+
+
+def is_test_file(filename: str) -> bool:
+    """Same rule as discover-tests.js: a valid extension and a test pattern."""
+    return filename.endswith(VALID_EXTENSIONS) and \
+        any(pattern.search(filename) for pattern in TEST_FILE_PATTERNS)
+
+
+class TestDiscovery:
+    """Discover tests in project directories using a persistent directory index."""
+
+    def __init__(self, project_dirs: Optional[List[str]] = None, output_dir: str = ".",
+                 index_path: Optional[str] = None, full: bool = False):
+        self.project_dirs = [Path(d).resolve() for d in (project_dirs or ["."])]
+        self.output_dir = Path(output_dir).resolve()
+        self.index_path = Path(index_path) if index_path else self.output_dir / INDEX_FILE
+        self.full = full
+        self.tests: Dict[str, List[Dict]] = {}
+        self.stats = {"directories": 0, "listed": 0}
+        self.changed = False
+
+    def discover(self) -> Dict[str, List[Dict]]:
+        """Walk every project, refreshing the index; return the registry."""
+        index = {} if self.full else self._load_index()
+        fresh_index = {}
+        for root in self.project_dirs:
+            print(f"  📂 Scanning: {root}", file=sys.stderr)
+            key = str(root)
+            known = index.get(key, {})
+            directories = self._scan(root, known)
+            fresh_index[key] = directories
+            if directories.keys() != known.keys():
+                self.changed = True
+            root_path = os.path.relpath(root, self.output_dir).replace(os.sep, "/")
+            for relative_dir, (_, _, tests) in directories.items():
+                for filename in tests:
+                    self._add_test(root, root_path, relative_dir, filename)
+        if fresh_index.keys() != index.keys():
+            self.changed = True
+        if self.changed or any(entry[0] is None for directories in fresh_index.values()
+                               for entry in directories.values()):
+            self._save_index(fresh_index)
+
+        for entries in self.tests.values():
+            entries.sort(key=lambda test: (test["file"].lower(), test["file"]))
+        self.tests = dict(sorted(self.tests.items()))
+        return self.tests
+
+    def _scan(self, root: Path, known: Dict) -> Dict[str, list]:
+        """Index entries [mtime_ns, subdirs, tests] for every directory under root."""
+        racy_after = time.time_ns() - RACY_SECONDS * 1_000_000_000
+        directories = {}
+        pending: List[Tuple[str, int]] = [("", 0)]
+        while pending:
+            relative_dir, depth = pending.pop()
+            path = os.path.join(root, relative_dir) if relative_dir else str(root)
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            self.stats["directories"] += 1
+
+            entry = known.get(relative_dir)
+            if entry is None or entry[0] != mtime:
+                listed = self._list(path, mtime, racy_after)
+                if listed is None:
+                    continue
+                if entry is None or listed[1:] != entry[1:]:
+                    self.changed = True
+                entry = listed
+            directories[relative_dir] = entry
+            if depth < MAX_DEPTH:
+                pending += [(f"{relative_dir}/{name}" if relative_dir else name, depth + 1)
+                            for name in entry[1]]
+        return directories
+
+    def _list(self, path: str, mtime: int, racy_after: int) -> Optional[list]:
+        self.stats["listed"] += 1
+        subdirs = []
+        tests = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    # Like Dirent.isDirectory()/isFile(): symlinks are not followed
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in IGNORE_DIRS and not entry.name.startswith("."):
+                            subdirs.append(entry.name)
+                    elif entry.is_file(follow_symlinks=False) and is_test_file(entry.name):
+                        tests.append(entry.name)
+        except OSError as e:
+            if not isinstance(e, PermissionError):
+                print(f"⚠️  Error scanning {path}: {e}", file=sys.stderr)
+            return None
+        # A listing taken in the same clock tick as a change can't be trusted later
+        return [mtime if mtime < racy_after else None, sorted(subdirs), sorted(tests)]
+
+    def _add_test(self, root: Path, root_path: str, relative_dir: str, filename: str):
+        relative_path = f"{relative_dir}/{filename}" if relative_dir else filename
+        category = self._categorize(relative_dir or ".", root)
+        self.tests.setdefault(category, []).append({
+            "file": filename,
+            "relativePath": relative_path,
+            "directory": relative_dir or ".",
+            "fullPath": relative_path if root_path == "." else f"{root_path}/{relative_path}",
+            "projectRoot": root_path,
+        })
+
+    def _categorize(self, directory: str, root: Path) -> str:
+        """Same categories as discover-tests.js categorizeTest()."""
+        prefix = f"[{root.name}] " if len(self.project_dirs) > 1 else ""
+        if directory in (".", ""):
+            return f"{prefix}Root Tests"
+        parts = directory.split("/")
+        for test_dir in TEST_DIRECTORIES:
+            if test_dir in parts:
+                position = parts.index(test_dir)
+                if position > 0:
+                    return prefix + "/".join(parts[:position + 1])
+                return prefix + test_dir
+        if len(parts) > 2:
+            return prefix + "/".join(parts[:2])
+        return prefix + "/".join(parts)
+
+    # Index and registry files
+
+    def _load_index(self) -> Dict[str, Dict]:
+        try:
+            with open(self.index_path, "r") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if data.get("version") != INDEX_VERSION:
+            return {}
+        return data.get("roots", {})
+
+    def _save_index(self, roots: Dict[str, Dict]):
+        self._write_atomic(self.index_path,
+                           json.dumps({"version": INDEX_VERSION, "roots": roots},
+                                      separators=(",", ":")))
+
+    def save_registry(self) -> Tuple[Path, bool]:
+        """Write test-registry.json unless no directory changed; return (path, written)."""
+        registry_path = self.output_dir / "test-registry.json"
+        if not self.changed and registry_path.exists():
+            return registry_path, False
+        self._write_atomic(registry_path, json.dumps(self.tests, indent=2))
+        return registry_path, True
+
+    @staticmethod
+    def _write_atomic(path: Path, content: str):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temporary.write_text(content, encoding="utf-8")
+        os.replace(temporary, path)
+
+    def print_summary(self):
+        """Print per-category counts, as discover-tests.js does."""
+        total = sum(len(tests) for tests in self.tests.values())
+        print("\n📊 Test Discovery Summary:")
+        print("─" * 50)
+        for category, tests in self.tests.items():
+            print(f"📁 {category}: {len(tests)} test{'s' if len(tests) != 1 else ''}")
+        print("─" * 50)
+        print(f"✅ Total: {total} test{'s' if total != 1 else ''} in {len(self.tests)} "
+              f"{'categories' if len(self.tests) != 1 else 'category'}")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Discover tests incrementally and write test-registry.json",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Discover tests in current directory
+  python discover_tests.py
+
+  # Discover tests in multiple projects
+  python discover_tests.py /project1 /project2
+
+  # Specify output directory
+  python discover_tests.py -o ./dashboard /path/to/project
+        """
+    )
+
+    parser.add_argument(
+        "project_dirs",
+        nargs="*",
+        help="Project directories to scan (default: current directory)"
+    )
+
+    parser.add_argument(
+        "--output", "-o",
+        default=".",
+        help="Output directory for test-registry.json (default: current directory)"
+    )
+
+    parser.add_argument(
+        "--index",
+        help=f"Directory index file (default: OUTPUT/{INDEX_FILE})"
+    )
+
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignore the index and re-list every directory"
+    )
+
+    args = parser.parse_args()
+
+    discovery = TestDiscovery(args.project_dirs, args.output, args.index, args.full)
+    print(f"🔍 Discovering tests in {len(discovery.project_dirs)} project(s)", file=sys.stderr)
+    started = time.perf_counter()
+    try:
+        discovery.discover()
+        registry_path, written = discovery.save_registry()
+    except OSError as e:
+        print(f"❌ Error during test discovery: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    discovery.print_summary()
+    stats = discovery.stats
+    print(f"\n⚡ {stats['directories']} directories, {stats['listed']} re-listed, "
+          f"{time.perf_counter() - started:.3f}s")
+    if written:
+        print(f"💾 Test registry saved to: {registry_path}")
+    else:
+        print(f"✓ Test registry unchanged: {registry_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Test Dashboard Runner
+
+Runs the tests listed in test-registry.json in a pool of worker threads,
+each test in its own process with a timeout, and streams one JSON object
+per line (NDJSON) to stdout as results come in, for the dashboard to
+consume live. Tests are launched the way server.js launches them: node
+for .js/.cjs/.mjs, python for .py; .html tests need a browser and are
+reported as skipped.
+
+A test that passed is remembered in a result cache keyed by a content hash
+of the test file and the local files it imports (relative require()/import
+paths for JavaScript, same-project modules for Python), followed
+transitively. Until one of those files changes, the test is reported as
+cached instead of being run again.
+
+Usage:
+    python run_tests.py [options]
+
+Options:
+    --registry PATH     Test registry (default: ./test-registry.json)
+    --category NAME     Only run this category (repeatable)
+    --jobs N            Parallel tests (default: CPU count)
+    --timeout SECONDS   Per-test timeout (default: 30)
+    --no-cache          Run every test, ignoring cached passes
+"""
+
+import ast
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Dict, List, Tuple
+
+CACHE_FILE = ".test-results-cache.json"
+CACHE_VERSION = 2
+OUTPUT_LIMIT = 64 * 1024
+
+NODE_EXTENSIONS = {".js", ".cjs", ".mjs"}
+JS_RESOLVE_SUFFIXES = ["", ".js", ".cjs", ".mjs", ".json", "/index.js"]
+
+JS_IMPORT = re.compile(
+    r"""(?:require\s*\(\s*|import\s*\(\s*|\bfrom\s+|^\s*import\s+)['"](\.{1,2}/[^'"]+)['"]""",
+    re.MULTILINE
+)
+
+
+class TestRunner:
+    """Run registry tests in parallel with a content-hash result cache."""
+
+    def __init__(self, registry: str = "test-registry.json", categories: Optional[List[str]] = None,
+                 jobs: Optional[int] = None, timeout: float = 30, use_cache: bool = True,
+                 output=None):
+        self.registry_path = Path(registry).resolve()
+        self.categories = categories
+        self.jobs = jobs or os.cpu_count() or 1
+        self.timeout = timeout
+        self.use_cache = use_cache
+        self.output = output or sys.stdout
+        self.cache_path = self.registry_path.parent / CACHE_FILE
+        self.cache: Dict[str, Dict] = {}
+        self._hashes: Dict[Path, str] = {}
+        self._lock = threading.Lock()
+
+        # Search roots for relative test paths, in server.js order
+        self.roots = [Path.cwd()]
+        self.roots += [Path(d).resolve() for d in os.environ.get("PROJECT_DIRS", "").split(":") if d]
+        self.roots.append(self.registry_path.parent)
+
+    def run(self) -> Dict:
+        """Run every selected test; return the summary."""
+        tests = self._load_registry()
+        # Loaded even with use_cache off, so other tests' entries survive
+        self.cache = self._load_cache()
+
+        started = time.perf_counter()
+        self._emit({"event": "start", "total": len(tests), "jobs": self.jobs,
+                    "registry": str(self.registry_path)})
+
+        counts: Dict[str, int] = {}
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            futures = [pool.submit(self._run_one, category, entry) for category, entry in tests]
+            for future in as_completed(futures):
+                result = future.result()
+                counts[result["status"]] = counts.get(result["status"], 0) + 1
+                self._emit(result)
+
+        self._save_cache()
+        summary = {
+            "event": "summary",
+            "total": len(tests),
+            "counts": counts,
+            "success": not (counts.get("failed") or counts.get("timeout") or counts.get("error")),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1)
+        }
+        self._emit(summary)
+        return summary
+
+    def _load_registry(self) -> List[Tuple[str, Dict]]:
+        with open(self.registry_path, "r") as f:
+            registry = json.load(f)
+        return [
+            (category, entry)
+            for category, entries in registry.items()
+            if not self.categories or category in self.categories
+            for entry in entries
+        ]
+
+    def _emit(self, event: Dict):
+        """Write one NDJSON line and flush, so readers see it immediately."""
+        line = json.dumps(event)
+        with self._lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    # Locating and launching tests
+
+    def _resolve(self, entry: Dict) -> Tuple[Optional[Path], Path]:
+        """The test file and its working directory, or (None, cwd) if missing."""
+        relative = entry.get("relativePath") or entry.get("file", "")
+        if os.path.isabs(relative):
+            path = Path(relative)
+            return (path, path.parent) if path.exists() else (None, Path.cwd())
+        for root in self.roots:
+            candidate = root / relative
+            if candidate.exists():
+                return candidate, root
+        # discover_tests.py writes these relative to the registry's directory
+        base = self.registry_path.parent
+        full = entry.get("fullPath")
+        if full and (base / full).exists():
+            root = entry.get("projectRoot")
+            return base / full, (base / root) if root else (base / full).parent
+        return None, Path.cwd()
+
+    def _command(self, path: Path) -> Optional[List[str]]:
+        if path.suffix == ".py":
+            return [sys.executable, str(path)]
+        if path.suffix == ".html":
+            return None
+        # .js/.cjs/.mjs and, as in server.js, anything else goes to node
+        return ["node", str(path)]
+
+    def _run_one(self, category: str, entry: Dict) -> Dict:
+        """Run (or answer from the cache) one registry entry."""
+        name = entry.get("relativePath") or entry.get("file", "")
+        result = {"event": "result", "test": name, "category": category}
+        path, workdir = self._resolve(entry)
+        if path is None:
+            return {**result, "status": "error", "output": f"Test file not found: {name}"}
+        command = self._command(path)
+        if command is None:
+            return {**result, "status": "skipped", "output": f"HTML test file. Open in browser: {name}"}
+
+        # Keyed by the resolved file: the same relative path in two projects is two tests
+        key = str(path.resolve())
+        digest = self._test_hash(path, command[0])
+        cached = self.cache.get(key) if self.use_cache else None
+        if cached and cached.get("hash") == digest:
+            return {**result, "status": "cached", "duration_ms": cached["duration_ms"],
+                    "passed_at": cached["passed_at"]}
+
+        started = time.perf_counter()
+        try:
+            completed = subprocess.run(command, cwd=workdir, capture_output=True, text=True,
+                                       errors="replace", timeout=self.timeout)
+            status = "passed" if completed.returncode == 0 else "failed"
+            output = completed.stdout + completed.stderr
+            exit_code = completed.returncode
+        except subprocess.TimeoutExpired as e:
+            status = "timeout"
+            output = _text(e.stdout) + _text(e.stderr) + f"\nTimed out after {self.timeout}s"
+            exit_code = None
+        except OSError as e:
+            status = "error"
+            output = str(e)
+            exit_code = None
+        duration = round((time.perf_counter() - started) * 1000, 1)
+
+        with self._lock:
+            if status == "passed":
+                self.cache[key] = {"hash": digest, "duration_ms": duration,
+                                   "passed_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+            else:
+                self.cache.pop(key, None)
+        return {**result, "status": status, "exit_code": exit_code, "duration_ms": duration,
+                "output": output[-OUTPUT_LIMIT:]}
+
+    # Content hashing
+
+    def _test_hash(self, path: Path, interpreter: str) -> str:
+        """Hash of the test, everything it imports locally, and its interpreter."""
+        digest = hashlib.sha256(interpreter.encode())
+        for dependency in sorted(self._dependencies(path)):
+            digest.update(str(dependency).encode() + b"\0" + self._file_hash(dependency).encode())
+        return digest.hexdigest()
+
+    def _file_hash(self, path: Path) -> str:
+        with self._lock:
+            known = self._hashes.get(path)
+        if known is None:
+            known = hashlib.sha256(path.read_bytes()).hexdigest()
+            with self._lock:
+                self._hashes[path] = known
+        return known
+
+    def _dependencies(self, path: Path) -> set:
+        """The test file plus the local files it imports, transitively."""
+        seen = set()
+        pending = [path.resolve()]
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            try:
+                source = current.read_text(errors="replace")
+            except OSError:
+                continue
+            if current.suffix in NODE_EXTENSIONS:
+                pending += self._js_imports(current, source)
+            elif current.suffix == ".py":
+                pending += self._py_imports(current, source)
+        return seen
+
+    def _js_imports(self, path: Path, source: str) -> List[Path]:
+        found = []
+        for spec in JS_IMPORT.findall(source):
+            base = path.parent / spec
+            for suffix in JS_RESOLVE_SUFFIXES:
+                candidate = Path(str(base) + suffix)
+                if candidate.is_file():
+                    found.append(candidate.resolve())
+                    break
+        return found
+
+    def _py_imports(self, path: Path, source: str) -> List[Path]:
+        """Local modules and packages a Python file imports, found next to it or in a root.
+
+        'from pkg import name' may import pkg/name.py as well as pkg/__init__.py,
+        and relative imports resolve against the file's own package.
+        """
+        try:
+            tree = ast.parse(source)
+        except (SyntaxError, ValueError):
+            return []
+        found = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    found += self._py_modules([path.parent] + self.roots, alias.name.split("."))
+            elif isinstance(node, ast.ImportFrom):
+                module = node.module.split(".") if node.module else []
+                if node.level:
+                    package = path.parent
+                    for _ in range(node.level - 1):
+                        package = package.parent
+                    bases = [package]
+                    init = package / "__init__.py"
+                    if init.is_file():
+                        found.append(init.resolve())
+                else:
+                    bases = [path.parent] + self.roots
+                found += self._py_modules(bases, module)
+                for alias in node.names:
+                    if alias.name != "*":
+                        found += self._py_modules(bases, module + [alias.name], packages=False)
+        return found
+
+    def _py_modules(self, bases: List[Path], parts: List[str], packages: bool = True) -> List[Path]:
+        """A dotted module's file, plus its parent packages' __init__.py files with packages.
+
+        Looked up in the first base that holds any of them.
+        """
+        for base in bases:
+            found = []
+            for depth in range(1 if packages else len(parts), len(parts) + 1):
+                candidate = base.joinpath(*parts[:depth])
+                for target in (candidate.with_name(candidate.name + ".py"),
+                               candidate / "__init__.py"):
+                    if target.is_file():
+                        found.append(target.resolve())
+                        break
+            if found:
+                return found
+        return []
+
+    # Result cache
+
+    def _load_cache(self) -> Dict[str, Dict]:
+        try:
+            with open(self.cache_path, "r") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if data.get("version") != CACHE_VERSION:
+            return {}
+        return data.get("results", {})
+
+    def _save_cache(self):
+        """Write the cache atomically; a read-only tree just goes uncached."""
+        temporary = self.cache_path.with_name(f"{CACHE_FILE}.{os.getpid()}.tmp")
+        try:
+            with open(temporary, "w") as f:
+                json.dump({"version": CACHE_VERSION, "results": self.cache}, f, indent=2)
+            os.replace(temporary, self.cache_path)
+        except OSError as e:
+            print(f"⚠️  Could not save result cache: {e}", file=sys.stderr)
+
+
+def _text(value) -> str:
+    if value is None:
+        return ""
+    return value.decode(errors="replace") if isinstance(value, bytes) else value
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Run test-registry.json tests in parallel, streaming NDJSON results",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Run everything in the registry, 8 at a time
+  python run_tests.py --jobs 8
+
+  # Only unit and integration tests, 10 second timeout
+  python run_tests.py --category unit --category integration --timeout 10
+
+  # Ignore cached passes
+  python run_tests.py --no-cache > results.ndjson
+        """
+    )
+
+    parser.add_argument(
+        "--registry",
+        default="test-registry.json",
+        help="Test registry to run (default: ./test-registry.json)"
+    )
+
+    parser.add_argument(
+        "--category",
+        action="append",
+        help="Only run tests in this category; repeat for several"
+    )
+
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        help="Tests to run at once (default: CPU count)"
+    )
+
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=30,
+        help="Seconds before a test is killed (default: 30)"
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Run every test, even if it passed unchanged last time"
+    )
+
+    args = parser.parse_args()
+
+    runner = TestRunner(
+        registry=args.registry,
+        categories=args.category,
+        jobs=args.jobs,
+        timeout=args.timeout,
+        use_cache=not args.no_cache
+    )
+
+    try:
+        summary = runner.run()
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    counts = ", ".join(f"{count} {status}" for status, count in sorted(summary["counts"].items()))
+    print(f"{'✅' if summary['success'] else '❌'} {summary['total']} tests: {counts} "
+          f"({summary['duration_ms'] / 1000:.1f}s)", file=sys.stderr)
+    sys.exit(0 if summary["success"] else 1)
+
+
+if __name__ == "__main__":
+    main()
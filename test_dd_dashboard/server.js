@@ -4,7 +4,7 @@ const express = require('express');
 const cors = require('cors');
 const fs = require('fs').promises;
 const path = require('path');
-const { exec } = require('child_process');
+const { exec, spawn } = require('child_process');
 const { promisify } = require('util');
 
 const execAsync = promisify(exec);
@@ -176,6 +176,31 @@ app.post('/api/run-test', async (req, res) => {
     }
 });
 
+// API: Run registry tests in parallel via run_tests.py, streaming NDJSON results
+app.post('/api/run-tests', (req, res) => {
+    const { categories = [], jobs, timeout, noCache = false } = req.body;
+    const args = [path.join(__dirname, 'run_tests.py'),
+                  '--registry', path.join(process.cwd(), 'test-registry.json')];
+    // A single category may arrive as a bare string
+    [].concat(categories || [])
+        .filter(category => typeof category === 'string' && category.trim())
+        .forEach(category => args.push('--category', category.trim()));
+    if (Number.isInteger(jobs) && jobs > 0) args.push('--jobs', String(jobs));
+    if (typeof timeout === 'number' && timeout > 0) args.push('--timeout', String(timeout));
+    if (noCache) args.push('--no-cache');
+    
+    const runner = spawn(process.env.PYTHON || 'python3', args, { cwd: process.cwd() });
+    res.setHeader('Content-Type', 'application/x-ndjson');
+    runner.stdout.pipe(res);
+    runner.stderr.on('data', data => console.log(data.toString().trim()));
+    runner.on('error', error => {
+        console.error('Error starting test runner:', error);
+        res.end(JSON.stringify({ event: 'error', error: error.message }) + '\n');
+    });
+    // Stop the run if the dashboard goes away
+    res.on('close', () => runner.kill());
+});
+
 // API: Discover tests with custom directories
 app.post('/api/discover-tests', async (req, res) => {
     try {
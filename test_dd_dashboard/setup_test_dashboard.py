@@ -13,6 +13,30 @@ Options:
     --force            Overwrite existing files
     --port PORT        Default port for the dashboard (default: 8085)
     --no-git           Don't add .gitignore entries
+    --upgrade          Update an existing install in place, copying only changed files
+    --targets PATH...  Fleet mode: install into many projects (paths or globs)
+    --targets-from F   Fleet mode: read targets from a file, one per line
+    --jobs N           Parallel workers
+    --store PATH       Fleet content store (default: ~/.cache/test-dashboard)
+    --link MODE        auto, reflink, hardlink or copy (default: auto)
+
+Every install writes .dashboard-manifest.json into the module directory. It
+records a hash of each file as installed and of package.json's dependencies.
+--upgrade compares the source against that manifest. It copies only files
+that changed upstream (or are missing) and removes files dropped upstream
+unless they were edited locally. Local files such as test-registry.json are
+never overwritten, and npm install is skipped when the dependencies are
+unchanged.
+
+Fleet mode (--targets/--targets-from) installs into many projects with a
+pool of workers. Each source file is hashed once and kept read-only in a
+content-addressed store (objects/<sha256>). Targets get the files as
+reflinks where the filesystem supports them, else hard links, else copies.
+package.json, server.js and the per-project files are always private
+copies, since they are rewritten per project. npm install runs once per
+dependency set, into the store. Each target's node_modules is a symlink to
+that shared install. Fleet installs write the same manifest, so --upgrade
+works on them, fleet or not.
 """
 
 import os
@@ -21,20 +45,101 @@ import shutil
 import argparse
 import tempfile
 import subprocess
+import hashlib
+import glob
+import time
+import errno
+import threading
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, Dict, List
 import json
 
+MANIFEST_FILE = ".dashboard-manifest.json"
+MANIFEST_VERSION = 1
+
+# Never copied from the source tree or into the target
+SKIP_NAMES = {"setup_test_dashboard.py", "node_modules", "__pycache__", MANIFEST_FILE}
+
+# Per-project files: installed if missing, never overwritten by an upgrade
+LOCAL_FILES = {"test-registry.json", "project-config.json",
+               ".test-results-cache.json", ".test-discovery-index.json"}
+
+DEPENDENCY_KEYS = ("dependencies", "devDependencies", "optionalDependencies", "peerDependencies")
+
+# Rewritten per project, so a fleet install always gives each target its own copy
+PRIVATE_FILES = LOCAL_FILES | {"package.json", "server.js"}
+
+# Fleet link modes, cheapest first
+LINK_MODES = ("reflink", "hardlink", "copy")
+FICLONE = 0x40049409
+UNSUPPORTED_ERRNOS = {errno.EXDEV, errno.EPERM, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL,
+                      errno.ENOSYS}
+NPM_TIMEOUT = 300
+
+
+def file_hash(path: Path) -> str:
+    """sha256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def dependency_hash(package_json: Path) -> Optional[str]:
+    """Hash of the dependency sections of package.json, or None if unreadable."""
+    try:
+        with open(package_json, "r") as f:
+            package_data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    dependencies = {key: package_data.get(key) for key in DEPENDENCY_KEYS}
+    return hashlib.sha256(json.dumps(dependencies, sort_keys=True).encode()).hexdigest()
+
+
+def reflink(source: Path, target: Path):
+    """Copy-on-write clone of source (btrfs, XFS, ...); OSError where unsupported."""
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError(errno.EOPNOTSUPP, "reflinks need fcntl", str(target))
+    with open(source, "rb") as src, open(target, "xb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return
+        except OSError as e:
+            error = e
+    target.unlink()
+    raise error
+
+
+def expand_targets(patterns: List[str]) -> List[Path]:
+    """Target directories from paths and glob patterns, in order, without duplicates."""
+    targets = []
+    for pattern in patterns:
+        pattern = os.path.expanduser(pattern)
+        if any(char in pattern for char in "*?["):
+            targets += [Path(match) for match in sorted(glob.glob(pattern)) if os.path.isdir(match)]
+        else:
+            targets.append(Path(pattern))
+    return list(dict.fromkeys(target.resolve() for target in targets))
+
+
 class TestDashboardSetup:
     """Setup test dashboard module in a project."""
     
     def __init__(self, target: str = ".", force: bool = False, 
-                 port: int = 8085, no_git: bool = False):
+                 port: int = 8085, no_git: bool = False, upgrade: bool = False,
+                 jobs: Optional[int] = None, log=print):
         self.target = Path(target).resolve()
         self.force = force
         self.port = port
         self.no_git = no_git
+        self.upgrade = upgrade
+        self.jobs = jobs or min(32, (os.cpu_count() or 1) * 4)
+        self.log = log
         self.dashboard_dir = self.target / "test-dashboard-module"
         
         # Source is the directory where this script is located
@@ -52,8 +157,11 @@ class TestDashboardSetup:
         print(f"\n📋 Current state:")
         print(f"   test-dashboard-module/: {'✅ exists' if dashboard_exists else '❌ missing'}")
         
-        # Install dashboard if missing or force flag is set
-        if not dashboard_exists or self.force:
+        # Upgrade in place, install if missing or force flag is set
+        if dashboard_exists and self.upgrade and not self.force:
+            print(f"\n🔄 Upgrading test-dashboard-module (changed files only)")
+            self._upgrade_dashboard()
+        elif not dashboard_exists or self.force:
             if dashboard_exists and self.force:
                 print(f"\n🔄 Reinstalling test-dashboard-module (--force flag)")
             else:
@@ -86,6 +194,113 @@ class TestDashboardSetup:
         
         # Install Node.js dependencies
         self._install_node_dependencies()
+        
+        self._write_manifest(self._source_files())
+    
+    def _source_files(self) -> Dict[str, Path]:
+        """Every file the dashboard installs, by path relative to the module."""
+        files = {}
+        for root, dirs, names in os.walk(self.source_dir):
+            dirs[:] = [d for d in dirs if d not in SKIP_NAMES]
+            for name in names:
+                if name in SKIP_NAMES:
+                    continue
+                path = Path(root) / name
+                files[path.relative_to(self.source_dir).as_posix()] = path
+        return files
+    
+    def _load_manifest(self) -> Dict:
+        try:
+            with open(self.dashboard_dir / MANIFEST_FILE, "r") as f:
+                manifest = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return manifest if manifest.get("version") == MANIFEST_VERSION else {}
+    
+    def _write_manifest(self, source_files: Dict[str, Path], hashes: Optional[Dict[str, str]] = None):
+        """Record what was installed, for the next --upgrade."""
+        if hashes is None:
+            with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+                hashes = dict(zip(source_files, pool.map(file_hash, source_files.values())))
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "installed": datetime.now().isoformat(),
+            "files": dict(sorted(hashes.items())),
+            "dependencyHash": dependency_hash(self.dashboard_dir / "package.json")
+        }
+        (self.dashboard_dir / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+    
+    def _upgrade_dashboard(self):
+        """Bring an existing install up to date, touching only what changed."""
+        manifest = self._load_manifest()
+        if not manifest:
+            print("⚠️  No install manifest, comparing against installed files")
+        
+        source_files = self._source_files()
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            hashes = dict(zip(source_files, pool.map(file_hash, source_files.values())))
+        to_copy, to_remove = self._plan_upgrade(hashes, manifest)
+        
+        def copy(relative):
+            target_path = self.dashboard_dir / relative
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            # A fleet install may have hard-linked this file to the shared store
+            if os.path.lexists(target_path):
+                target_path.unlink()
+            shutil.copy2(source_files[relative], target_path)
+        
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            list(pool.map(copy, to_copy))
+        for relative in sorted(to_copy):
+            print(f"📄 Updated: {relative}")
+        for relative in to_remove:
+            (self.dashboard_dir / relative).unlink()
+            print(f"🗑️  Removed: {relative}")
+        
+        print(f"📊 {len(to_copy)} of {len(source_files)} files changed")
+        if {"package.json", "server.js"} & set(to_copy):
+            self._update_dashboard_config()
+        
+        dependencies = dependency_hash(self.dashboard_dir / "package.json")
+        if (dependencies is not None and dependencies == manifest.get("dependencyHash")
+                and (self.dashboard_dir / "node_modules").exists()):
+            print("⏭️  Skipping npm install (dependencies unchanged)")
+        else:
+            node_modules = self.dashboard_dir / "node_modules"
+            if node_modules.is_symlink():
+                # Shared by a fleet install: npm gets a private copy, not the cache
+                node_modules.unlink()
+            self._install_node_dependencies()
+        
+        self._write_manifest(source_files, hashes)
+    
+    def _plan_upgrade(self, hashes: Dict[str, str], manifest: Dict):
+        """Files to (re)install and files to remove for an upgrade to `hashes`."""
+        installed = manifest.get("files", {})
+        to_copy = []
+        for relative in hashes:
+            target_path = self.dashboard_dir / relative
+            if not target_path.exists():
+                to_copy.append(relative)
+            elif Path(relative).name in LOCAL_FILES:
+                continue
+            elif manifest:
+                if installed.get(relative) != hashes[relative]:
+                    to_copy.append(relative)
+            elif file_hash(target_path) != hashes[relative]:
+                to_copy.append(relative)
+        
+        # Files dropped upstream go too, unless they were edited locally
+        to_remove = []
+        for relative in sorted(set(installed) - set(hashes)):
+            target_path = self.dashboard_dir / relative
+            if not target_path.exists() or Path(relative).name in LOCAL_FILES:
+                continue
+            if file_hash(target_path) == installed[relative]:
+                to_remove.append(relative)
+            else:
+                self.log(f"⚠️  Kept locally modified file no longer shipped: {relative}")
+        return to_copy, to_remove
     
     def _copy_dashboard(self):
         """Copy dashboard files from source directory."""
@@ -132,10 +347,10 @@ class TestDashboardSetup:
                 with open(package_json_path, 'w') as f:
                     json.dump(package_data, f, indent=2)
                 
-                print(f"📝 Updated package.json for project: {self.target.name}")
+                self.log(f"📝 Updated package.json for project: {self.target.name}")
             
             except (json.JSONDecodeError, KeyError) as e:
-                print(f"⚠️  Could not update package.json: {e}")
+                self.log(f"⚠️  Could not update package.json: {e}")
         
         # Update server configuration if needed
         server_js_path = self.dashboard_dir / "server.js"
@@ -145,9 +360,9 @@ class TestDashboardSetup:
                 # Update default port
                 content = content.replace("PORT || 8085", f"PORT || {self.port}")
                 server_js_path.write_text(content)
-                print(f"📝 Updated default port to: {self.port}")
+                self.log(f"📝 Updated default port to: {self.port}")
             except Exception as e:
-                print(f"⚠️  Could not update server port: {e}")
+                self.log(f"⚠️  Could not update server port: {e}")
     
     def _install_node_dependencies(self):
         """Install Node.js dependencies for the test dashboard."""
@@ -188,10 +403,12 @@ class TestDashboardSetup:
         
         entries_to_add = [
             "\n# Test Dashboard Module",
-            "test-dashboard-module/node_modules/",
+            "test-dashboard-module/node_modules",
             "test-dashboard-module/package-lock.json",
             "test-dashboard-module/test-registry.json",
             "test-dashboard-module/*.log",
+            ".test-results-cache.json",
+            ".test-discovery-index.json",
         ]
         
         if gitignore_path.exists():
@@ -199,7 +416,7 @@ class TestDashboardSetup:
             
             # Check if already has test dashboard entries
             if "test-dashboard-module" in content:
-                print("✓ .gitignore already configured for test dashboard")
+                self.log("✓ .gitignore already configured for test dashboard")
                 return
             
             # Append entries
@@ -208,12 +425,12 @@ class TestDashboardSetup:
             
             content += "\n".join(entries_to_add) + "\n"
             gitignore_path.write_text(content)
-            print("📝 Updated .gitignore")
+            self.log("📝 Updated .gitignore")
         else:
             # Create new .gitignore
             content = "\n".join(entries_to_add) + "\n"
             gitignore_path.write_text(content)
-            print("📝 Created .gitignore")
+            self.log("📝 Created .gitignore")
     
     def _print_next_steps(self):
         """Print next steps for the user."""
@@ -246,6 +463,283 @@ class TestDashboardSetup:
         print(f"\n🎯 Start dashboard with: cd {self.dashboard_dir.relative_to(self.target)} && npm start")
 
 
+class FleetInstaller:
+    """Install the test dashboard into many projects at once from a shared store."""
+    
+    def __init__(self, targets: List[Path], store: Optional[str] = None, force: bool = False,
+                 port: int = 8085, no_git: bool = False, upgrade: bool = False,
+                 jobs: Optional[int] = None, link_mode: str = "auto"):
+        self.targets = targets
+        self.store = Path(store or os.environ.get("TEST_DASHBOARD_STORE")
+                          or Path.home() / ".cache" / "test-dashboard").expanduser().resolve()
+        self.force = force
+        self.port = port
+        self.no_git = no_git
+        self.upgrade = upgrade
+        self.jobs = jobs or min(32, (os.cpu_count() or 1) * 4)
+        self.link_mode = link_mode
+        self.source_dir = Path(__file__).parent
+        
+        self.source_files: Dict[str, Path] = {}
+        self.hashes: Dict[str, str] = {}
+        self.objects: Dict[str, tuple] = {}
+        self.node_modules: Optional[Path] = None
+        # Cheapest link mode known to work, per device
+        self._device_modes: Dict[int, str] = {}
+    
+    def run(self) -> bool:
+        """Install into every target; return True if none failed."""
+        print("📊 Test Dashboard Fleet Install")
+        print(f"📁 Source directory: {self.source_dir}")
+        print(f"🗄️  Store: {self.store}")
+        print(f"🎯 {len(self.targets)} targets, {self.jobs} at a time, link mode: {self.link_mode}")
+        
+        started = time.perf_counter()
+        self._prepare_store()
+        prepared = time.perf_counter() - started
+        print(f"✅ Store ready: {len(self.objects)} files ({prepared:.2f}s)\n")
+        
+        results = []
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            futures = [pool.submit(self._install_target, target) for target in self.targets]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                self._print_result(result)
+        
+        self._print_summary(results, time.perf_counter() - started)
+        return not any(result["status"] == "failed" for result in results)
+    
+    # Shared store
+    
+    def _prepare_store(self):
+        """Hash the source once and add its files and dependencies to the store."""
+        self.source_files = TestDashboardSetup(jobs=self.jobs)._source_files()
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            self.hashes = dict(zip(self.source_files,
+                                   pool.map(file_hash, self.source_files.values())))
+            self.objects = dict(zip(self.source_files, pool.map(self._store_object, self.source_files)))
+        self.node_modules = self._prepare_node_modules()
+    
+    def _store_object(self, relative: str) -> tuple:
+        """(object path, file mode) for a source file, adding it to the store if new.
+
+        An existing object is reused only if its content still hashes to its
+        name; otherwise it is replaced, which also gives it a fresh inode so
+        targets hard-linked to the bad copy keep it to themselves.
+        """
+        source = self.source_files[relative]
+        mode = source.stat().st_mode & 0o777
+        executable = bool(mode & 0o111)
+        digest = self.hashes[relative]
+        # Objects are read-only: a hard-linked file is shared by every target
+        obj = self.store / "objects" / digest[:2] / (digest[2:] + ("x" if executable else ""))
+        if not self._object_intact(obj, digest):
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            temporary = obj.with_name(f"{obj.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            shutil.copyfile(source, temporary)
+            os.chmod(temporary, 0o555 if executable else 0o444)
+            os.replace(temporary, obj)
+        return obj, mode
+
+    @staticmethod
+    def _object_intact(obj: Path, digest: str) -> bool:
+        """True if a store object exists and its content matches its digest."""
+        try:
+            return obj.is_file() and file_hash(obj) == digest
+        except OSError:
+            return False
+    
+    def _prepare_node_modules(self) -> Optional[Path]:
+        """node_modules for the source package.json, installed once per dependency set."""
+        digest = dependency_hash(self.source_dir / "package.json")
+        if digest is None:
+            print("⚠️  No package.json found, skipping shared node_modules")
+            return None
+        shared = self.store / "node_modules" / digest
+        if (shared / "node_modules").is_dir():
+            print("⏭️  Shared node_modules already in store")
+            return shared / "node_modules"
+        
+        print("📦 Installing shared Node.js dependencies (once for the fleet)...")
+        shared.parent.mkdir(parents=True, exist_ok=True)
+        build = Path(tempfile.mkdtemp(prefix=f".{digest[:12]}.", dir=shared.parent))
+        try:
+            for name in ("package.json", "package-lock.json"):
+                if (self.source_dir / name).exists():
+                    shutil.copy2(self.source_dir / name, build / name)
+            result = subprocess.run(
+                ["npm", "install"],
+                cwd=build,
+                capture_output=True,
+                text=True,
+                timeout=NPM_TIMEOUT
+            )
+            if result.returncode != 0 or not (build / "node_modules").is_dir():
+                print("⚠️  npm install failed, targets will need their own 'npm install'")
+                if result.stderr:
+                    print(f"   stderr: {result.stderr[:200]}...")
+                return None
+            try:
+                os.rename(build, shared)
+            except OSError:
+                pass  # Another fleet run finished the same install first
+        except subprocess.TimeoutExpired:
+            print("⚠️  npm install timed out, targets will need their own 'npm install'")
+            return None
+        except FileNotFoundError:
+            print("⚠️  npm not found - install Node.js to use test dashboard")
+            return None
+        finally:
+            shutil.rmtree(build, ignore_errors=True)
+        print("✅ Shared Node.js dependencies installed")
+        return shared / "node_modules"
+    
+    # Targets
+    
+    def _install_target(self, target: Path) -> Dict:
+        """Install, upgrade or skip one target; never raises."""
+        started = time.perf_counter()
+        notes: List[str] = []
+        links = dict.fromkeys(LINK_MODES, 0)
+        result = {"target": target, "links": links, "notes": notes, "removed": 0}
+        try:
+            if not target.is_dir():
+                raise NotADirectoryError(f"Not a directory: {target}")
+            setup = TestDashboardSetup(target, self.force, self.port, self.no_git,
+                                       self.upgrade, jobs=1, log=notes.append)
+            exists = setup.dashboard_dir.exists()
+            if exists and self.upgrade and not self.force:
+                status = "upgraded"
+                to_place, to_remove = setup._plan_upgrade(self.hashes, setup._load_manifest())
+            elif exists and not self.force:
+                status = "skipped"
+            else:
+                status = "installed"
+                if exists:
+                    shutil.rmtree(setup.dashboard_dir)
+                to_place, to_remove = list(self.hashes), []
+            
+            if status != "skipped":
+                self._place_files(setup, to_place, links)
+                for relative in to_remove:
+                    (setup.dashboard_dir / relative).unlink()
+                result["removed"] = len(to_remove)
+                if status == "installed" or {"package.json", "server.js"} & set(to_place):
+                    setup._update_dashboard_config()
+                self._link_node_modules(setup, notes)
+                setup._write_manifest(self.source_files, self.hashes)
+            if not self.no_git:
+                setup._update_gitignore()
+        except Exception as e:
+            status = "failed"
+            result["error"] = str(e)
+        result["status"] = status
+        result["seconds"] = time.perf_counter() - started
+        return result
+    
+    def _place_files(self, setup: TestDashboardSetup, relatives: List[str], links: Dict[str, int]):
+        dashboard_dir = setup.dashboard_dir
+        dashboard_dir.mkdir(parents=True, exist_ok=True)
+        device = dashboard_dir.stat().st_dev
+        made = {dashboard_dir}
+        for relative in relatives:
+            path = dashboard_dir / relative
+            if path.parent not in made:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                made.add(path.parent)
+            if os.path.lexists(path):
+                path.unlink()
+            obj, mode = self.objects[relative]
+            # Files rewritten per project (package.json, server.js, registries) stay private
+            private = Path(relative).name in PRIVATE_FILES
+            links[self._place(obj, mode, path, device, private)] += 1
+    
+    def _place(self, obj: Path, mode: int, path: Path, device: int, private: bool) -> str:
+        """Put a store object at path the cheapest way the filesystem allows."""
+        if private:
+            modes = ("copy",)
+        elif self.link_mode != "auto":
+            modes = (self.link_mode,)
+        else:
+            modes = LINK_MODES[LINK_MODES.index(self._device_modes.get(device, "reflink")):]
+        
+        for link_mode in modes:
+            try:
+                if link_mode == "reflink":
+                    reflink(obj, path)
+                elif link_mode == "hardlink":
+                    os.link(obj, path)
+                else:
+                    shutil.copyfile(obj, path)
+            except OSError as e:
+                if link_mode == modes[-1]:
+                    raise
+                if e.errno in UNSUPPORTED_ERRNOS:
+                    # Don't try this mode again on this filesystem
+                    self._device_modes[device] = modes[modes.index(link_mode) + 1]
+                continue
+            if link_mode != "hardlink":
+                os.chmod(path, mode)
+            return link_mode
+    
+    def _link_node_modules(self, setup: TestDashboardSetup, notes: List[str]):
+        """Point the module's node_modules at the shared install."""
+        if self.node_modules is None:
+            return
+        link = setup.dashboard_dir / "node_modules"
+        if link.is_symlink():
+            if os.readlink(link) == str(self.node_modules):
+                return
+            link.unlink()
+        elif link.exists():
+            notes.append("⚠️  Kept private node_modules; run 'npm install' if dependencies changed")
+            return
+        link.symlink_to(self.node_modules, target_is_directory=True)
+    
+    # Reporting
+    
+    def _print_result(self, result: Dict):
+        icons = {"installed": "✅", "upgraded": "🔄", "skipped": "⏭️ ", "failed": "❌"}
+        line = f"{icons[result['status']]} {result['target']}: {result['status']}"
+        if result["status"] == "failed":
+            line += f" - {result['error']}"
+        elif result["status"] != "skipped":
+            placed = ", ".join(f"{count} {mode}" for mode, count in result["links"].items() if count)
+            line += f", {sum(result['links'].values())} files ({placed or 'none changed'})"
+            if result["removed"]:
+                line += f", {result['removed']} removed"
+        print(f"{line} ({result['seconds'] * 1000:.0f}ms)")
+        for note in result["notes"]:
+            if note.startswith("⚠️"):
+                print(f"   {note}")
+    
+    def _print_summary(self, results: List[Dict], elapsed: float):
+        statuses: Dict[str, int] = {}
+        links = dict.fromkeys(LINK_MODES, 0)
+        for result in results:
+            statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+            for mode, count in result["links"].items():
+                links[mode] += count
+        seconds = sorted(result["seconds"] for result in results)
+        
+        print("\n📊 Fleet Summary:")
+        print("─" * 50)
+        print(f"🎯 Targets: {len(results)} ("
+              + ", ".join(f"{count} {status}" for status, count in sorted(statuses.items())) + ")")
+        print("📄 Files: " + ", ".join(f"{count} {mode}" for mode, count in links.items()))
+        print(f"📦 node_modules: {self.node_modules or 'not shared'}")
+        if seconds:
+            print(f"⏱️  Per target: median {seconds[len(seconds) // 2] * 1000:.0f}ms, "
+                  f"max {seconds[-1] * 1000:.0f}ms")
+        print(f"⚡ Total: {elapsed:.2f}s")
+        print("─" * 50)
+        if statuses.get("failed"):
+            print(f"❌ {statuses['failed']} target(s) failed")
+        else:
+            print("✅ Fleet install complete!")
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -262,8 +756,17 @@ Examples:
   # Force overwrite existing installation
   python setup_test_dashboard.py --force
   
+  # Upgrade in place: changed files only, npm install only if dependencies changed
+  python setup_test_dashboard.py --upgrade
+  
   # Use custom port
   python setup_test_dashboard.py --port 3000
+  
+  # Fleet install into every repo under ~/src, 32 at a time, from the shared store
+  python setup_test_dashboard.py --targets '~/src/*' --jobs 32
+  
+  # Fleet upgrade of the repos listed in a file
+  python setup_test_dashboard.py --targets-from repos.txt --upgrade
         """
     )
     
@@ -292,14 +795,57 @@ Examples:
         help="Don't add .gitignore entries"
     )
     
+    parser.add_argument(
+        "--upgrade",
+        action="store_true",
+        help="Update an existing installation in place, copying only changed files"
+    )
+    
+    parser.add_argument(
+        "--targets",
+        nargs="+",
+        metavar="PATH_OR_GLOB",
+        help="Fleet mode: install into every matching directory concurrently"
+    )
+    
+    parser.add_argument(
+        "--targets-from",
+        metavar="FILE",
+        help="Fleet mode: read target paths or globs from FILE, one per line"
+    )
+    
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        help="Parallel workers (default: 4 per CPU, at most 32)"
+    )
+    
+    parser.add_argument(
+        "--store",
+        help="Fleet content store (default: $TEST_DASHBOARD_STORE or ~/.cache/test-dashboard)"
+    )
+    
+    parser.add_argument(
+        "--link",
+        choices=("auto",) + LINK_MODES,
+        default="auto",
+        help="How fleet targets get store files (default: auto, cheapest that works)"
+    )
+    
     args = parser.parse_args()
     
+    if args.targets or args.targets_from:
+        _run_fleet(args)
+        return
+    
     # Run setup
     setup = TestDashboardSetup(
         target=args.target,
         force=args.force,
         port=args.port,
-        no_git=args.no_git
+        no_git=args.no_git,
+        upgrade=args.upgrade,
+        jobs=args.jobs
     )
     
     try:
@@ -309,5 +855,34 @@ Examples:
         sys.exit(1)
 
 
+def _run_fleet(args):
+    """Fleet mode of main()."""
+    patterns = list(args.targets or [])
+    try:
+        if args.targets_from:
+            with open(args.targets_from, "r") as f:
+                patterns += [line.strip() for line in f
+                             if line.strip() and not line.lstrip().startswith("#")]
+        targets = expand_targets(patterns)
+        if not targets:
+            raise ValueError("no target directories matched")
+        
+        fleet = FleetInstaller(
+            targets,
+            store=args.store,
+            force=args.force,
+            port=args.port,
+            no_git=args.no_git,
+            upgrade=args.upgrade,
+            jobs=args.jobs,
+            link_mode=args.link
+        )
+        success = fleet.run()
+    except Exception as e:
+        print(f"\n❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    sys.exit(0 if success else 1)
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
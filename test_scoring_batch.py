@@ -0,0 +1,106 @@
+"""Regression tests: evaluate_batch() must agree with evaluate_project()."""
+
+import math
+import random
+
+import pytest
+
+from scoring_calculator import ProjectEvaluator
+
+NAN = float('nan')
+
+LADDER_FIELDS = (
+    ('technical', 'integration_count'),
+    ('technical', 'team_experience_percent'),
+    ('resources', 'team_size'),
+    ('risk', 'external_dependencies_count'),
+)
+
+
+@pytest.fixture
+def evaluator():
+    return ProjectEvaluator()
+
+
+def columns_of(criteria):
+    """One project's nested criteria as dotted single-row columns."""
+    return {
+        f"{section}.{name}": [value]
+        for section, fields in criteria.items()
+        for name, value in fields.items()
+    }
+
+
+@pytest.mark.parametrize('section, name', LADDER_FIELDS)
+def test_nan_falls_through_like_the_original_ladders(evaluator, section, name):
+    # The if/elif ladders this rubric replaced sent NaN to their final else
+    fall_through = {
+        'integration_count': 5,
+        'team_experience_percent': 5,
+        'team_size': 5,
+        'external_dependencies_count': 5,
+    }
+    field = next(field for spec in evaluator.rubric.values() if spec.section == section
+                 for field in spec.ladders if field.name == name)
+    assert field.score(NAN) == fall_through[name]
+
+    criteria = {section: {name: NAN}}
+    expected = evaluator.evaluate_project(criteria)
+    assert evaluator.evaluate_batch([criteria])[0] == expected
+    assert evaluator.evaluate_batch(columns_of(criteria))[0] == expected
+
+
+def test_nan_scores(evaluator):
+    scores = evaluator.evaluate_project({'technical': {'integration_count': NAN}})
+    assert scores['dimension_scores']['technical_complexity'] == 2
+    scores = evaluator.evaluate_project({'technical': {'team_experience_percent': NAN}})
+    assert scores['dimension_scores']['technical_complexity'] == 2
+    assert not math.isnan(scores['final_score'])
+
+
+def random_criteria(rng, count):
+    """Criteria covering every rubric value, out-of-vocabulary values and missing fields."""
+    evaluator = ProjectEvaluator()
+    projects = []
+    for _ in range(count):
+        project = {}
+        for spec in evaluator.rubric.values():
+            section = {}
+            for field in spec.categorical:
+                if rng.random() < 0.9:
+                    section[field.name] = rng.choice(list(field.scores) + ['unknown'])
+            for field in spec.ladders:
+                if rng.random() < 0.9:
+                    section[field.name] = rng.choice([rng.randint(-2, 120), rng.uniform(-2, 120),
+                                                      True, *field.breakpoints])
+            project[spec.section] = section
+        projects.append(project)
+    return projects
+
+
+def test_batch_matches_evaluate_project(evaluator):
+    projects = random_criteria(random.Random(7), 2000)
+    expected = [evaluator.evaluate_project(project) for project in projects]
+
+    assert evaluator.evaluate_batch(projects).to_dicts() == expected
+
+    columns = {}
+    for spec in evaluator.rubric.values():
+        for field in spec.categorical + spec.ladders:
+            columns[f"{spec.section}.{field.name}"] = [
+                project[spec.section].get(field.name, field.default) for project in projects
+            ]
+    assert evaluator.evaluate_batch(columns).to_dicts() == expected
+
+
+@pytest.mark.parametrize('value', [None, '5', '', [1], 1 + 2j])
+@pytest.mark.parametrize('section, name', LADDER_FIELDS)
+def test_batch_rejects_what_evaluate_project_rejects(evaluator, section, name, value):
+    criteria = {section: {name: value}}
+    with pytest.raises(TypeError) as scalar:
+        evaluator.evaluate_project(criteria)
+    with pytest.raises(TypeError) as batch:
+        evaluator.evaluate_batch([{}, criteria])
+    assert str(batch.value) == str(scalar.value)
+    with pytest.raises(TypeError):
+        evaluator.evaluate_batch({f"{section}.{name}": [1, value]})
@@ -0,0 +1,66 @@
+"""scoring_client.py must print the same thing with or without the daemon."""
+
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from scoring_daemon import ScoringDaemon
+
+HERE = Path(__file__).parent
+
+CSV_TEXT = "id,technical.integration_count\n1,3\n2,12\n"
+
+
+@pytest.fixture(scope='module')
+def daemon_socket(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('daemon') / 'eval.sock')
+    daemon = ScoringDaemon(path)
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    yield path
+    daemon.shutdown()
+    daemon.server_close()
+
+
+def run_client(socket_path, args, stdin=''):
+    env = {**os.environ, 'PROJECT_EVAL_SOCKET': socket_path}
+    done = subprocess.run([sys.executable, str(HERE / 'scoring_client.py'), *args],
+                          input=stdin, capture_output=True, text=True, env=env, cwd=HERE)
+    return done.returncode, done.stdout
+
+
+def both_ways(daemon_socket, tmp_path, args, stdin=''):
+    """(daemon result, in-process result) for one client call."""
+    return (run_client(daemon_socket, args, stdin),
+            run_client(str(tmp_path / 'nobody.sock'), args, stdin))
+
+
+def test_record_with_an_error_key_is_scored(daemon_socket, tmp_path):
+    source = tmp_path / 'criteria.jsonl'
+    source.write_text('{"error": "none", "id": 7}\n')
+    via_daemon, in_process = both_ways(daemon_socket, tmp_path, [str(source)])
+    assert via_daemon == in_process
+    assert via_daemon[0] == 0
+    assert via_daemon[1].startswith('{"error": "none", "id": 7, "dimension_scores"')
+
+
+def test_jsonl_file_with_leading_blank_line(daemon_socket, tmp_path):
+    source = tmp_path / 'criteria.jsonl'
+    source.write_text('\n  {"id": 1, "technical": {"integration_count": 3}}\n')
+    via_daemon, in_process = both_ways(daemon_socket, tmp_path, [str(source)])
+    assert via_daemon == in_process
+    assert via_daemon[0] == 0
+
+
+def test_csv_on_stdin_needs_format(daemon_socket, tmp_path):
+    via_daemon, in_process = both_ways(daemon_socket, tmp_path, ['-'], CSV_TEXT)
+    assert via_daemon[0] == in_process[0] == 1
+
+    via_daemon, in_process = both_ways(daemon_socket, tmp_path, ['--format', 'csv'], CSV_TEXT)
+    assert via_daemon == in_process
+    assert via_daemon[0] == 0
+    assert via_daemon[1].splitlines()[0].startswith('id,dimension_scores.')
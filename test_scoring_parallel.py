@@ -0,0 +1,37 @@
+"""The parallel stream scorer must write exactly what the serial one writes."""
+
+import io
+
+import pytest
+
+from scoring_calculator import ProjectEvaluator
+from scoring_parallel import score_stream_parallel
+from scoring_stream import score_stream
+
+CSV_INPUT = (
+    "id,name,owner.team,technical.integration_count,resources.team_size\n"
+    "1,,,3,2\n"
+    "2,Beta,core,,\n"
+    "\n"
+    "3,,,12,8\n"
+    "4,Delta,ops,1,\n"
+    "5,Eps,,7,11\n"
+)
+
+JSONL_INPUT = (
+    '{"id": 1, "technical": {"integration_count": 3}}\n'
+    '\n'
+    '{"name": "Beta", "resources": {"team_size": 7}}\n'
+    '{"id": 3}\n'
+)
+
+
+@pytest.mark.parametrize('fmt, text', [('csv', CSV_INPUT), ('jsonl', JSONL_INPUT)])
+@pytest.mark.parametrize('chunk_size', [1, 2, 1000])
+def test_parallel_output_is_byte_identical(fmt, text, chunk_size):
+    serial = io.StringIO()
+    serial_count = score_stream(ProjectEvaluator(), io.StringIO(text), serial, fmt, chunk_size)
+    parallel = io.StringIO()
+    parallel_count = score_stream_parallel(io.StringIO(text), parallel, fmt, chunk_size, workers=2)
+    assert parallel_count == serial_count
+    assert parallel.getvalue() == serial.getvalue()
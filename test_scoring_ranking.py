@@ -0,0 +1,69 @@
+"""Regression tests for PortfolioRanking.add_batch()."""
+
+import random
+from types import SimpleNamespace
+
+import numpy as np
+
+from scoring_calculator import DIMENSIONS, ProjectEvaluator
+from scoring_ranking import PortfolioRanking
+from test_scoring_batch import random_criteria
+
+
+def ranking_state(ranking):
+    """Everything a query can observe, independent of row allocation."""
+    projects = sorted((ranking.get(project_id) for project_id in ranking._rows),
+                      key=lambda project: project['id'])
+    return projects, [project['id'] for project in ranking.top(len(ranking))]
+
+
+def scored(final_scores, priority=0):
+    """A BatchResult stand-in: given final scores, one priority bucket."""
+    count = len(final_scores)
+    return SimpleNamespace(
+        final_score=np.array(final_scores, dtype=np.float64),
+        risk_score=np.full(count, 2.0),
+        value_score=np.full(count, 4.0),
+        priority_codes=np.full(count, priority, dtype=np.uint8),
+        dimension_scores={dim: np.full(count, 3, dtype=np.int8) for dim in DIMENSIONS}
+    )
+
+
+def test_rescore_after_appends_to_the_same_bucket():
+    ranking = PortfolioRanking()
+    ranking.add_batch(['a', 'b'], scored([5, 3]), ['Ops', 'Ops'])
+    # c, d and e are appended ahead of b in its bucket before b is re-scored
+    ranking.add_batch(['c', 'd', 'e', 'b'], scored([10, 10, 10, 1]), ['Ops'] * 4)
+    assert len(ranking) == 5
+    assert [(project['id'], project['final_score']) for project in ranking.top(5)] == [
+        ('c', 10), ('d', 10), ('e', 10), ('a', 5), ('b', 1)
+    ]
+
+
+def test_repeated_id_in_one_batch_keeps_the_last_row():
+    ranking = PortfolioRanking()
+    ranking.add_batch(['a', 'b', 'a'], scored([4, 3, 2]), ['Ops', 'Ops', 'IT'])
+    assert len(ranking) == 2
+    assert ranking.get('a')['final_score'] == 2
+    assert ranking.get('a')['department'] == 'IT'
+    assert [project['id'] for project in ranking.top(2)] == ['b', 'a']
+
+
+def test_add_batch_matches_repeated_add():
+    evaluator = ProjectEvaluator()
+    rng = random.Random(3)
+    batched = PortfolioRanking()
+    single = PortfolioRanking()
+    for _ in range(20):
+        criteria = random_criteria(rng, 50)
+        # Re-score existing ids and repeat some within the batch
+        ids = [f"p{rng.randrange(120)}" for _ in criteria]
+        departments = [rng.choice(['Ops', 'Risk', 'IT']) for _ in criteria]
+        batch = evaluator.evaluate_batch(criteria)
+        batched.add_batch(ids, batch, departments)
+        for project_id, result, department in zip(ids, batch.to_dicts(), departments):
+            single.add(project_id, result, department)
+        for project_id in rng.sample(sorted(single._rows), 5):
+            batched.remove(project_id)
+            single.remove(project_id)
+        assert ranking_state(batched) == ranking_state(single)
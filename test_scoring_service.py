@@ -0,0 +1,57 @@
+"""A request's outcome must not depend on what shares its micro-batch."""
+
+import asyncio
+
+import pytest
+
+from scoring_calculator import ProjectEvaluator
+from scoring_service import HTTPError, MicroBatcher
+
+CRITERIA = [
+    {'technical': {'integration_count': 4}, 'business': {'impact_scope': 'department'}},
+    {'technical': {'integration_count': None}},
+    {'technical': {'integration_count': '5'}},
+    {'technical': {'integration_count': float('nan')}},
+    {'technical': 'bad'},
+    {'resources': {'team_size': True}},
+    {'risk': {'regulatory_level': ['heavy']}},
+    {},
+]
+
+
+def outcomes(batches):
+    """Score each list of criteria as one micro-batch; (status, result) per record."""
+
+    async def run():
+        batcher = MicroBatcher(ProjectEvaluator(), max_batch=len(CRITERIA), max_delay=0)
+        results = []
+        for batch in batches:
+            # Queued before the scorer runs, so each list is taken as one batch
+            futures = [batcher.submit_nowait(criteria) for criteria in batch]
+            batcher.start()
+            for future in futures:
+                try:
+                    results.append((200, await future))
+                except HTTPError as e:
+                    results.append((e.status, None))
+            await batcher.stop()
+        return results
+
+    return asyncio.run(run())
+
+
+def test_batched_outcomes_match_single_requests():
+    alone = outcomes([[criteria] for criteria in CRITERIA])
+    together = outcomes([CRITERIA])
+    assert together == alone
+
+
+@pytest.mark.parametrize('criteria', CRITERIA)
+def test_outcome_matches_evaluate_project(criteria):
+    [(status, result)] = outcomes([[criteria]])
+    try:
+        expected = ProjectEvaluator().evaluate_project(criteria)
+    except Exception:
+        assert status == 400
+    else:
+        assert (status, result) == (200, expected)
@@ -0,0 +1,48 @@
+"""Torn-tail handling of the binary criteria store."""
+
+import os
+
+from scoring_store import CriteriaStore, encode_records
+
+RECORDS = [
+    {'id': 'a', 'technical': {'integration_count': 3}},
+    {'id': 'b', 'business': {'impact_scope': 'department'}},
+]
+
+
+def new_store(tmp_path):
+    store = CriteriaStore.create(str(tmp_path / 'archive.crit'), id_width=8)
+    store.extend(RECORDS)
+    return store
+
+
+def test_reader_leaves_a_record_being_written_alone(tmp_path):
+    store = new_store(tmp_path)
+    record = encode_records(store.schema, [{'id': 'c', 'technical': {'team_experience_percent': 10}}])
+    data = record.tobytes()
+
+    with open(store.path, 'ab') as writer:
+        writer.write(data[:5])
+        writer.flush()
+        reader = CriteriaStore.open(store.path)
+        assert len(reader) == 2
+        assert [project['id'] for project in reader.to_dicts()] == ['a', 'b']
+        writer.write(data[5:])
+
+    reader = CriteriaStore.open(store.path)
+    assert len(reader) == 3
+    assert list(reader.to_dicts())[2] == {'id': 'c', 'technical': {'team_experience_percent': 10}}
+
+
+def test_append_cuts_off_a_crashed_append(tmp_path):
+    store = new_store(tmp_path)
+    with open(store.path, 'ab') as crashed:
+        crashed.write(b'\x01\x02\x03')
+    size = os.path.getsize(store.path)
+
+    reopened = CriteriaStore.open(store.path)
+    assert os.path.getsize(store.path) == size
+    reopened.append({'id': 'd', 'resources': {'team_size': 4}})
+
+    assert (os.path.getsize(store.path) - store.data_offset) % store.dtype.itemsize == 0
+    assert [project['id'] for project in CriteriaStore.open(store.path).to_dicts()] == ['a', 'b', 'd']
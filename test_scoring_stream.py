@@ -0,0 +1,43 @@
+"""Regression tests for the streaming CSV/JSON Lines scoring pipeline."""
+
+import csv
+import io
+
+from scoring_calculator import ProjectEvaluator
+from scoring_stream import SCORE_COLUMNS, flatten, score_stream
+
+CSV_INPUT = (
+    "id,name,technical.integration_count,business.impact_scope\n"
+    "1,,3,department\n"
+    "2,Beta,,organization_wide\n"
+    "3,Gamma,12,\n"
+)
+
+
+def score_csv(text, chunk_size=1000):
+    sink = io.StringIO()
+    count = score_stream(ProjectEvaluator(), io.StringIO(text), sink, 'csv', chunk_size)
+    return count, list(csv.DictReader(io.StringIO(sink.getvalue())))
+
+
+def test_csv_passthrough_columns_come_from_the_header():
+    count, rows = score_csv(CSV_INPUT)
+    assert count == 3
+    assert list(rows[0]) == ['id', 'name', *SCORE_COLUMNS]
+    assert [row['id'] for row in rows] == ['1', '2', '3']
+    assert [row['name'] for row in rows] == ['', 'Beta', 'Gamma']
+
+
+def test_csv_scores_match_evaluate_project():
+    evaluator = ProjectEvaluator()
+    _, rows = score_csv(CSV_INPUT, chunk_size=1)
+    expected = evaluator.evaluate_project({'technical': {'integration_count': 12}})
+    assert rows[2]['final_score'] == str(expected['final_score'])
+    assert rows[2]['priority'] == expected['priority']
+    # An empty criteria cell takes the rubric default
+    default = evaluator.evaluate_project({'business': {'impact_scope': 'organization_wide'}})
+    assert rows[1]['final_score'] == str(default['final_score'])
+
+
+def test_score_columns_follow_evaluate_project():
+    assert tuple(flatten(ProjectEvaluator().evaluate_project({}))) == SCORE_COLUMNS
@@ -0,0 +1,129 @@
+"""Sampled scores must be the evaluate_project() scores of the sampled values."""
+
+import math
+
+import numpy as np
+import pytest
+
+from scoring_batch import ladder_points
+from scoring_calculator import ProjectEvaluator
+from scoring_uncertainty import sample_totals
+
+NAN = float('nan')
+DRAWS = 4000
+
+
+@pytest.fixture
+def evaluator():
+    return ProjectEvaluator()
+
+
+def outcomes(result):
+    """Distinct (risk, value, final, priority code) tuples across the draws."""
+    return set(zip(result.risk_score.tolist(), result.value_score.tolist(),
+                   result.final_score.tolist(), result.priority_codes.tolist()))
+
+
+def expected_outcomes(evaluator, section, name, values):
+    """The same tuples from evaluate_project() on each value the spec can draw."""
+    levels = list(evaluator.evaluate_uncertain({}, draws=1).priority_probabilities())
+    expected = set()
+    for value in values:
+        scores = evaluator.evaluate_project({section: {name: value}})
+        expected.add((scores['risk_score'], scores['value_score'], scores['final_score'],
+                      levels.index(scores['priority'])))
+    return expected
+
+
+@pytest.mark.parametrize('spec, values', [
+    ({'range': [0, 12]}, range(13)),
+    ({'triangular': [0, 6, 12]}, range(13)),
+    ({'normal': [6, 4], 'min': 0, 'max': 12}, range(13)),
+    ({'choices': {1: 1, 7: 2, 20: 1}}, [1, 7, 20]),
+    ({'choices': [[3, 0.5], [11, 0.5]]}, [3, 11]),
+])
+@pytest.mark.parametrize('section, name', [
+    ('technical', 'integration_count'),
+    ('technical', 'team_experience_percent'),
+    ('resources', 'team_size'),
+    ('risk', 'external_dependencies_count'),
+])
+def test_ladder_distributions(evaluator, section, name, spec, values):
+    result = evaluator.evaluate_uncertain({section: {name: spec}}, draws=DRAWS)
+    assert len(result) == DRAWS
+    assert outcomes(result) == expected_outcomes(evaluator, section, name, values)
+
+
+@pytest.mark.parametrize('section, name, choices', [
+    ('business', 'impact_scope', {'single_team': 1, 'organization_wide': 1, 'unknown': 1}),
+    ('risk', 'user_adoption', [['high_acceptance', 1], ['high_resistance', 3]]),
+    ('timeline', 'development_cycle', {'immediate': 1, 'extended': 1}),
+])
+def test_categorical_choices(evaluator, section, name, choices):
+    result = evaluator.evaluate_uncertain({section: {name: {'choices': choices}}}, draws=DRAWS)
+    values = choices if isinstance(choices, dict) else [value for value, _ in choices]
+    assert outcomes(result) == expected_outcomes(evaluator, section, name, values)
+
+
+@pytest.mark.parametrize('spec', [
+    {'range': [1, 3]},
+    {'triangular': [1, 2, 3]},
+    {'normal': [2, 1]},
+])
+def test_categorical_rejects_numeric_distributions(evaluator, spec):
+    with pytest.raises(ValueError, match="business.impact_scope: categorical fields take 'choices' only"):
+        evaluator.evaluate_uncertain({'business': {'impact_scope': spec}}, draws=10)
+
+
+@pytest.mark.parametrize('section, name', [
+    ('technical', 'integration_count'),
+    ('technical', 'team_experience_percent'),
+    ('resources', 'team_size'),
+    ('risk', 'external_dependencies_count'),
+])
+def test_nan_samples_score_unordered(evaluator, section, name):
+    spec = next(spec for spec in evaluator.rubric.values() if spec.section == section)
+    field = next(field for field in spec.ladders if field.name == name)
+    assert ladder_points(field, np.array([NAN, NAN])).tolist() == [field.unordered] * 2
+
+    for distribution in ({'choices': {NAN: 1}}, {'normal': [NAN, 1]}):
+        result = evaluator.evaluate_uncertain({section: {name: distribution}}, draws=50)
+        assert outcomes(result) == expected_outcomes(evaluator, section, name, [NAN])
+        assert not math.isnan(result.final_score[0])
+
+
+def test_same_seed_same_draws(evaluator):
+    criteria = {
+        'technical': {'integration_count': {'normal': [5, 3]}},
+        'business': {'impact_scope': {'choices': {'department': 1, 'organization_wide': 1}}},
+    }
+    first = evaluator.evaluate_uncertain(criteria, draws=500, seed=7)
+    again = evaluator.evaluate_uncertain(criteria, draws=500, seed=7)
+    other = evaluator.evaluate_uncertain(criteria, draws=500, seed=8)
+    assert np.array_equal(first.final_score, again.final_score)
+    assert np.array_equal(first.priority_codes, again.priority_codes)
+    assert first.summary() == again.summary()
+    assert not np.array_equal(first.final_score, other.final_score)
+
+    rng = np.random.default_rng(3)
+    totals = sample_totals(evaluator.rubric, criteria, 100, rng)
+    again = sample_totals(evaluator.rubric, criteria, 100, np.random.default_rng(3))
+    assert all(np.array_equal(totals[dimension], again[dimension]) for dimension in totals)
+
+
+@pytest.mark.parametrize('criteria', [
+    {},
+    {'technical': {'integration_count': 3, 'technology_type': 'cutting_edge'}},
+    {'business': {'impact_scope': 'industry_level', 'operational_improvement': 'revolutionary',
+                  'competitive_advantage': 'market_leadership'},
+     'scalability': {'reusability': 'platform_potential'},
+     'timeline': {'development_cycle': 'immediate'}},
+    {'risk': {'regulatory_level': 'heavy', 'external_dependencies_count': 12}},
+])
+def test_fixed_criteria_are_certain(evaluator, criteria):
+    expected = evaluator.evaluate_project(criteria)
+    result = evaluator.evaluate_uncertain(criteria, draws=200)
+    probabilities = result.priority_probabilities()
+    assert probabilities[expected['priority']] == 1.0
+    assert sum(probabilities.values()) == 1.0
+    assert set(result.final_score.tolist()) == {expected['final_score']}
@@ -6,6 +6,11 @@ export default defineConfig({
   server: {
     port: 3600,
     proxy: {
+      // Scoring is served by the Python service (scoring_service.py)
+      '^/api/(evaluate|projects/[^/]+/evaluate)': {
+        target: 'http://localhost:8101',
+        changeOrigin: true,
+      },
       '/api': {
         target: 'http://localhost:8100',
         changeOrigin: true,